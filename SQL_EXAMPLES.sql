@@ -92,13 +92,13 @@ ORDER BY release_year DESC
 LIMIT 20;
 
 
--- 3.2 Trend: Movies added per year (last 10 years)
+-- 3.2 Trend: Movies added per year (last 10 years, join dim_date)
 SELECT 
-    EXTRACT(YEAR FROM TO_DATE(date_added, 'YYYY-MM-DD'))::INT as year_added,
+    d.year as year_added,
     COUNT(*) as count
-FROM dim_movies
-WHERE date_added IS NOT NULL
-GROUP BY EXTRACT(YEAR FROM TO_DATE(date_added, 'YYYY-MM-DD'))
+FROM dim_movies m
+JOIN dim_date d ON m.date_added_key = d.date_key
+GROUP BY d.year
 ORDER BY year_added DESC
 LIMIT 10;
 
@@ -114,6 +114,32 @@ ORDER BY release_year DESC
 LIMIT 20;
 
 
+-- 3.4 Monthly additions (các tháng không có phim vẫn xuất hiện với count = 0)
+SELECT 
+    d.year,
+    d.month,
+    d.month_name,
+    COUNT(m.movie_id) as count
+FROM dim_date d
+LEFT JOIN dim_movies m ON m.date_added_key = d.date_key
+WHERE d.year >= 2019
+GROUP BY d.year, d.month, d.month_name
+ORDER BY d.year DESC, d.month DESC
+LIMIT 24;
+
+
+-- 3.5 Additions by day of week
+SELECT 
+    d.day_of_week,
+    d.day_name,
+    d.is_weekend,
+    COUNT(*) as count
+FROM dim_movies m
+JOIN dim_date d ON m.date_added_key = d.date_key
+GROUP BY d.day_of_week, d.day_name, d.is_weekend
+ORDER BY d.day_of_week;
+
+
 -- ============================================================================
 -- 4. RATING ANALYSIS
 -- ============================================================================
@@ -202,7 +228,7 @@ SELECT
     release_year,
     rating
 FROM dim_movies
-WHERE LOWER(title) LIKE '%christmas%'
+WHERE title ILIKE '%christmas%'  -- dùng trigram index idx_movies_title_trgm
 ORDER BY release_year DESC;
 
 
@@ -227,11 +253,24 @@ SELECT
     date_added,
     release_year
 FROM dim_movies
-WHERE date_added IS NOT NULL
-ORDER BY date_added DESC
+WHERE date_added_key IS NOT NULL
+ORDER BY date_added_key DESC
 LIMIT 30;
 
 
+-- 6.4 Full-text search trên title + description (GIN index trên search_vector)
+SELECT 
+    movie_id,
+    title,
+    type,
+    release_year,
+    ts_rank(search_vector, websearch_to_tsquery('english', 'love story')) as rank
+FROM dim_movies
+WHERE search_vector @@ websearch_to_tsquery('english', 'love story')
+ORDER BY rank DESC
+LIMIT 20;
+
+
 -- ============================================================================
 -- 7. ADVANCED ANALYTICS
 -- ============================================================================
@@ -286,11 +325,35 @@ SELECT
 FROM dim_movies dm
 LEFT JOIN movies_genres mg ON dm.movie_id = mg.movie_id
 LEFT JOIN dim_genres dg ON mg.genre_id = dg.genre_id
-WHERE LOWER(dm.title) LIKE '%stranger things%'
+WHERE dm.title ILIKE '%stranger things%'
 GROUP BY dm.movie_id, dm.title, dm.type, dm.director, 
          dm.country, dm.release_year, dm.rating, dm.duration, dm.description;
 
 
+-- 7.5 Movies by runtime range (numeric duration_minutes, indexed)
+SELECT 
+    movie_id,
+    title,
+    duration_minutes,
+    release_year
+FROM dim_movies
+WHERE duration_minutes BETWEEN 90 AND 120
+ORDER BY duration_minutes DESC
+LIMIT 20;
+
+
+-- 7.6 TV Shows with at least 3 seasons (numeric season_count, indexed)
+SELECT 
+    movie_id,
+    title,
+    season_count,
+    release_year
+FROM dim_movies
+WHERE season_count >= 3
+ORDER BY season_count DESC
+LIMIT 20;
+
+
 -- ============================================================================
 -- 8. DATA QUALITY CHECKS
 -- ============================================================================
@@ -434,8 +497,9 @@ GROUP BY dm.movie_id, dm.title, dm.type, dm.director, dm.country,
 -- - Use STRING_AGG() for joining multiple genres
 -- - Remember to handle NULL values in WHERE clauses
 -- - Use indexes for better query performance on large datasets
--- - LOWER() for case-insensitive searches
--- - LIKE for pattern matching (% = wildcard)
+-- - ILIKE for case-insensitive pattern matching (% = wildcard), served by
+--   the pg_trgm GIN indexes on title/description
+-- - search_vector @@ websearch_to_tsquery(...) for full-text search
 
 -- ============================================================================
 -- USEFUL TIPS
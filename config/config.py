@@ -3,10 +3,26 @@ Config Module - Cấu hình cho Netflix ETL Pipeline
 """
 
 import os
-from dotenv import load_dotenv
+from pathlib import Path
 
-# Load environment variables từ .env file
-load_dotenv()
+
+def _find_env_file():
+    """Tìm file .env từ thư mục config trở lên (giống dotenv.find_dotenv)"""
+    config_dir = Path(__file__).resolve().parent
+    for directory in (config_dir, *config_dir.parents):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+# Load environment variables từ .env file (chỉ import dotenv khi có file .env
+# để các lệnh CLI ngắn không phải trả chi phí import)
+_ENV_FILE = _find_env_file()
+if _ENV_FILE is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(_ENV_FILE)
 
 
 class Config:
@@ -24,6 +40,11 @@ class Config:
         f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
 
+    # Connection pool & query cache (src/queries.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+    QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))
+
     # Data Configuration
     DATA_PATH = os.getenv("DATA_PATH", "./data/netflix_titles.csv")
 
@@ -32,8 +53,63 @@ class Config:
     KAGGLE_KEY = os.getenv("KAGGLE_KEY", "")
 
     # ETL Configuration
-    BATCH_SIZE = 1000  # Kích thước batch cho tải dữ liệu
-    CHUNK_SIZE = 10000  # Kích thước chunk khi đọc CSV lớn
+    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))  # Batch khi tải dữ liệu
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "10000"))  # Chunk khi đọc CSV lớn
+    # Kích thước thích ứng (src/sizing.py): BATCH_SIZE/CHUNK_SIZE là điểm bắt
+    # đầu, được giới hạn theo bộ nhớ và điều chỉnh theo throughput/RSS
+    ADAPTIVE_SIZING = os.getenv("ADAPTIVE_SIZING", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # Ngân sách bộ nhớ cho dữ liệu đang xử lý (MB); 0 = 50% bộ nhớ còn trống
+    MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0"))
+
+    # Sampling Configuration (chế độ dev: chạy pipeline trên mẫu phân tầng)
+    # SAMPLE_SIZE hàng hoặc tỉ lệ SAMPLE_FRACTION; 0 = đọc toàn bộ dữ liệu
+    SAMPLE_SIZE = int(os.getenv("SAMPLE_SIZE", "0"))
+    SAMPLE_FRACTION = float(os.getenv("SAMPLE_FRACTION", "0"))
+    SAMPLE_SEED = int(os.getenv("SAMPLE_SEED", "42"))
+
+    # Sink Configuration: "postgres", "parquet" hoặc "duckdb"
+    SINK = os.getenv("SINK", "postgres")
+    WAREHOUSE_DIR = os.getenv("WAREHOUSE_DIR", "./data/warehouse")
+    PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+    DUCKDB_PATH = os.getenv("DUCKDB_PATH", "./data/netflix.duckdb")
+
+    # Staging Configuration (dữ liệu trung gian giữa các lệnh CLI)
+    STAGING_DIR = os.getenv("STAGING_DIR", "./data/staging")
+
+    # Checkpoint Configuration (resume sau khi pipeline lỗi)
+    CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "./data/checkpoints")
+    KEEP_CHECKPOINTS = os.getenv("KEEP_CHECKPOINTS", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+    # Out-of-core Configuration (spill-to-disk)
+    SPILL_DIR = os.getenv("SPILL_DIR", "./data/spill")
+    SPILL_PARTITIONS = int(os.getenv("SPILL_PARTITIONS", "16"))
+
+    # Key Registry Configuration (surrogate key ổn định)
+    KEY_REGISTRY_PATH = os.getenv("KEY_REGISTRY_PATH", "./data/key_registry.sqlite")
+
+    # Bitmap Index Configuration (src/bitmap_index.py, file memory-map được)
+    BITMAP_INDEX_PATH = os.getenv("BITMAP_INDEX_PATH", "./data/bitmap_index.bin")
+
+    # Benchmark Configuration (src/benchmark.py)
+    # Database riêng, có thể xóa (bị tạo lại schema và nạp dữ liệu tổng hợp)
+    BENCHMARK_DATABASE_URL = os.getenv("BENCHMARK_DATABASE_URL", "")
+    BENCHMARK_DIR = os.getenv("BENCHMARK_DIR", "./data/benchmarks")
+    BENCHMARK_REPEAT = int(os.getenv("BENCHMARK_REPEAT", "20"))
+    # Chậm hơn baseline quá ngưỡng này (tương đối, theo p50) là regression
+    BENCHMARK_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.2"))
+
+    # Logging Configuration
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # Chế độ quiet/production: bỏ qua các thống kê chỉ dùng để chẩn đoán
+    QUIET_MODE = os.getenv("QUIET_MODE", "false").lower() in ("1", "true", "yes")
 
     @staticmethod
     def get_database_url():
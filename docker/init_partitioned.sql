@@ -0,0 +1,81 @@
+-- Create Dimension Tables for Star Schema (dim_movies range-partitioned)
+--
+-- Thay thế cho init.sql khi muốn partition pruning theo release_year:
+-- mỗi năm phát hành một partition (dim_movies_y<year>), NetflixLoader tự
+-- tạo partition còn thiếu khi tải và có thể tải lại từng năm riêng lẻ.
+-- Hàng không có release_year nằm trong partition DEFAULT.
+
+-- Extension cho trigram index (tìm kiếm ILIKE '%...%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Bảng chiều: dim_genres
+CREATE TABLE IF NOT EXISTS dim_genres (
+    genre_id SERIAL PRIMARY KEY,
+    genre_name VARCHAR(100) NOT NULL UNIQUE
+);
+
+-- Bảng chiều: dim_date (lịch đầy đủ, date_key dạng YYYYMMDD)
+CREATE TABLE IF NOT EXISTS dim_date (
+    date_key INTEGER PRIMARY KEY,
+    full_date DATE NOT NULL UNIQUE,
+    year SMALLINT NOT NULL,
+    quarter SMALLINT NOT NULL,
+    month SMALLINT NOT NULL,
+    month_name VARCHAR(10) NOT NULL,
+    day SMALLINT NOT NULL,
+    day_of_week SMALLINT NOT NULL,
+    day_name VARCHAR(10) NOT NULL,
+    week_of_year SMALLINT NOT NULL,
+    is_weekend BOOLEAN NOT NULL
+);
+
+-- Bảng chiều: dim_movies (PRIMARY KEY phải chứa partition key)
+CREATE TABLE IF NOT EXISTS dim_movies (
+    movie_id SERIAL,
+    show_id VARCHAR(50),
+    title VARCHAR(255) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    director VARCHAR(500),
+    country VARCHAR(500),
+    date_added DATE,
+    date_added_key INTEGER REFERENCES dim_date(date_key),
+    release_year INTEGER,
+    rating VARCHAR(20),
+    duration VARCHAR(50),
+    duration_minutes INTEGER,
+    season_count INTEGER,
+    description TEXT,
+    -- Tính tự động khi INSERT/UPDATE (title trọng số A, description trọng số B)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (release_year);
+
+CREATE TABLE IF NOT EXISTS dim_movies_default PARTITION OF dim_movies DEFAULT;
+
+-- Bảng kết nối: movies_genres (Many-to-Many)
+-- Không có FOREIGN KEY tới dim_movies vì movie_id không unique một mình
+-- trên bảng partitioned; NetflixLoader đảm bảo tính toàn vẹn khi tải.
+CREATE TABLE IF NOT EXISTS movies_genres (
+    movie_id INTEGER NOT NULL,
+    genre_id INTEGER NOT NULL REFERENCES dim_genres(genre_id) ON DELETE CASCADE,
+    PRIMARY KEY (movie_id, genre_id)
+);
+
+-- Tạo index để cải thiện hiệu suất truy vấn (tự áp dụng cho mọi partition)
+CREATE INDEX IF NOT EXISTS idx_movies_movie_id ON dim_movies(movie_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_movies_show_id ON dim_movies(show_id, release_year);
+CREATE INDEX IF NOT EXISTS idx_movies_type ON dim_movies(type);
+CREATE INDEX IF NOT EXISTS idx_movies_release_year ON dim_movies(release_year);
+CREATE INDEX IF NOT EXISTS idx_movies_rating ON dim_movies(rating);
+CREATE INDEX IF NOT EXISTS idx_movies_duration_minutes ON dim_movies(duration_minutes);
+CREATE INDEX IF NOT EXISTS idx_movies_season_count ON dim_movies(season_count);
+CREATE INDEX IF NOT EXISTS idx_movies_date_added_key ON dim_movies(date_added_key);
+CREATE INDEX IF NOT EXISTS idx_genres_name ON dim_genres(genre_name);
+
+-- Index cho tìm kiếm title/description (trigram + full-text)
+CREATE INDEX IF NOT EXISTS idx_movies_title_trgm ON dim_movies USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_movies_description_trgm ON dim_movies USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_movies_search_vector ON dim_movies USING GIN (search_vector);
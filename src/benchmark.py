@@ -0,0 +1,566 @@
+"""
+Benchmark Module - Đo độ trễ truy vấn trên workload SQL_EXAMPLES.sql
+
+Chức năng:
+- Phân tích các truy vấn có tên (1.1, 2.3, ...) trong SQL_EXAMPLES.sql
+- Tạo database benchmark: áp dụng docker/init.sql (hoặc biến thể) và tải
+  dữ liệu tổng hợp theo hệ số scale qua NetflixLoader
+- Chạy mỗi truy vấn N lần, ghi p50/p95 và plan EXPLAIN (ANALYZE, BUFFERS)
+- So sánh kết quả với baseline đã lưu để phát hiện regression
+"""
+
+import os
+import re
+import json
+import math
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("benchmark")
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_SQL_FILE = PROJECT_ROOT / "SQL_EXAMPLES.sql"
+DEFAULT_INIT_SQL = PROJECT_ROOT / "docker" / "init.sql"
+BASELINE_FILE = "baseline.json"
+
+# Số title của tập dữ liệu Netflix gốc (scale=1.0)
+BASE_ROWS = 8807
+
+# "-- 2.3 Movies in specific genre" -> ("2.3", "Movies in specific genre")
+QUERY_HEADER = re.compile(r"^--\s*(\d+\.\d+)\s+(.*)$")
+
+SYNTHETIC_GENRES = (
+    "International Movies", "Dramas", "Comedies", "International TV Shows",
+    "Documentaries", "Action & Adventure", "TV Dramas", "Independent Movies",
+    "Children & Family Movies", "Romantic Movies", "TV Comedies", "Thrillers",
+    "Crime TV Shows", "Kids' TV", "Docuseries", "Music & Musicals",
+    "Romantic TV Shows", "Horror Movies", "Stand-Up Comedy", "Reality TV",
+    "British TV Shows", "Sci-Fi & Fantasy", "Sports Movies", "Anime Series",
+    "Spanish-Language TV Shows", "TV Action & Adventure", "Korean TV Shows",
+    "Classic Movies", "LGBTQ Movies", "TV Mysteries", "Science & Nature TV",
+    "TV Sci-Fi & Fantasy", "TV Horror", "Cult Movies", "Anime Features",
+    "Teen TV Shows", "Faith & Spirituality", "TV Thrillers", "Movies",
+    "Stand-Up Comedy & Talk Shows", "Classic & Cult TV", "TV Shows",
+)
+SYNTHETIC_COUNTRIES = (
+    "United States", "India", "United Kingdom", "Japan", "South Korea",
+    "Canada", "Spain", "France", "Mexico", "Egypt", "Turkey", "Nigeria",
+    "Australia", "Taiwan", "Indonesia", "Brazil", "Philippines", "Germany",
+)
+SYNTHETIC_RATINGS = (
+    "TV-MA", "TV-14", "TV-PG", "R", "PG-13", "TV-Y7", "TV-Y", "PG", "TV-G",
+    "NR", "G",
+)
+SYNTHETIC_WORDS = (
+    "love", "story", "night", "city", "war", "family", "dark", "secret",
+    "life", "house", "last", "christmas", "stranger", "things", "world",
+    "girl", "king", "road", "home", "time", "dream", "lost", "wild", "black",
+)
+
+
+# Chạy SQL nguyên văn, không truyền tham số: psycopg2 sẽ không coi '%' (ví dụ
+# ILIKE '%christmas%' hay ghi chú trong init.sql) là placeholder
+RAW_SQL = {"no_parameters": True}
+
+
+class BenchmarkQuery(NamedTuple):
+    name: str
+    title: str
+    sql: str
+
+
+def parse_sql_examples(path=None):
+    """
+    Phân tích các truy vấn có tên trong SQL_EXAMPLES.sql
+
+    Chỉ lấy câu lệnh SELECT/WITH đầu tiên sau mỗi tiêu đề "-- <n>.<m> ...";
+    các mục chỉ có ghi chú hoặc lệnh DDL (CREATE VIEW) bị bỏ qua.
+
+    Parameters
+    ----------
+    path : str, optional
+        Đường dẫn file SQL (mặc định SQL_EXAMPLES.sql của dự án)
+
+    Returns
+    -------
+    list of BenchmarkQuery
+        Các truy vấn theo thứ tự trong file
+    """
+    path = path or DEFAULT_SQL_FILE
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    queries = []
+    name, title, body = None, None, []
+
+    def flush():
+        sql = "\n".join(body).split(";", 1)[0].strip()
+        if name and sql and sql.split(None, 1)[0].upper() in ("SELECT", "WITH"):
+            queries.append(BenchmarkQuery(name, title, sql))
+
+    for line in lines:
+        header = QUERY_HEADER.match(line.strip())
+        if header:
+            if body:
+                flush()
+            name, title, body = header.group(1), header.group(2).strip(), []
+        elif name and not line.strip().startswith("--") and line.strip():
+            body.append(line.rstrip())
+            if ";" in line:
+                flush()
+                name, body = None, []
+
+    if body:
+        flush()
+    return queries
+
+
+def generate_synthetic_star_schema(scale=1.0, seed=42):
+    """
+    Tạo Star Schema tổng hợp có phân phối gần giống dữ liệu Netflix
+
+    Parameters
+    ----------
+    scale : float, optional
+        Hệ số kích thước so với tập dữ liệu gốc (mặc định 1.0 ~ 8.8k titles)
+    seed : int, optional
+        Seed của bộ sinh số ngẫu nhiên (kết quả tái lập được)
+
+    Returns
+    -------
+    dict
+        Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src.transformer import NetflixTransformer
+
+    rng = np.random.default_rng(seed)
+    n = max(int(BASE_ROWS * scale), 1)
+    movie_ids = np.arange(1, n + 1)
+
+    def skewed(values, p=0.3):
+        # Giá trị đầu danh sách phổ biến hơn (phân phối hình học)
+        index = np.minimum(rng.geometric(p, n) - 1, len(values) - 1)
+        return np.array(values, dtype=object)[index]
+
+    is_movie = rng.random(n) < 0.7
+    # Năm phát hành lệch về các năm gần đây như dữ liệu thật
+    release_year = np.clip(2022 - rng.geometric(0.12, n), 1925, 2021)
+    date_added = pd.Timestamp("2008-01-01") + pd.to_timedelta(
+        rng.integers(0, 14 * 365, n), unit="D"
+    )
+    minutes = pd.Series(rng.integers(60, 181, n))
+    seasons = pd.Series(np.minimum(rng.geometric(0.55, n), 17))
+
+    words = np.array(SYNTHETIC_WORDS, dtype=object)
+    title_words = words[rng.integers(0, len(words), (n, 2))]
+    description_words = words[rng.integers(0, len(words), (n, 12))]
+    directors = "Director " + pd.Series(rng.integers(1, n // 3 + 2, n)).astype(str)
+
+    dim_movies = pd.DataFrame(
+        {
+            "movie_id": movie_ids,
+            "show_id": [f"s{movie_id}" for movie_id in movie_ids],
+            "title": [
+                f"{first.title()} {second} {movie_id}"
+                for (first, second), movie_id in zip(title_words, movie_ids)
+            ],
+            "type": np.where(is_movie, "Movie", "TV Show"),
+            "director": directors.where(rng.random(n) >= 0.3, None),
+            "country": skewed(SYNTHETIC_COUNTRIES),
+            "date_added": date_added.strftime("%Y-%m-%d"),
+            "date_added_key": date_added.year * 10000
+            + date_added.month * 100
+            + date_added.day,
+            "release_year": release_year,
+            "rating": skewed(SYNTHETIC_RATINGS),
+            "duration": np.where(
+                is_movie,
+                minutes.astype(str) + " min",
+                seasons.astype(str) + np.where(seasons == 1, " Season", " Seasons"),
+            ),
+            "duration_minutes": minutes.where(is_movie).astype("Int64"),
+            "season_count": seasons.where(~is_movie).astype("Int64"),
+            "description": [" ".join(row) for row in description_words],
+        }
+    )
+
+    dim_date = NetflixTransformer.build_dim_date(dim_movies["date_added_key"])
+    dim_genres = pd.DataFrame(
+        {
+            "genre_id": np.arange(1, len(SYNTHETIC_GENRES) + 1),
+            "genre_name": SYNTHETIC_GENRES,
+        }
+    )
+
+    # 1-3 genre mỗi title, genre phổ biến được chọn nhiều hơn (phân phối Zipf)
+    genre_count = rng.integers(1, 4, n)
+    weights = 1.0 / np.arange(1, len(SYNTHETIC_GENRES) + 1)
+    movies_genres = pd.DataFrame(
+        {
+            "movie_id": np.repeat(movie_ids, genre_count),
+            "genre_id": rng.choice(
+                dim_genres["genre_id"].to_numpy(),
+                genre_count.sum(),
+                p=weights / weights.sum(),
+            ),
+        }
+    ).drop_duplicates(ignore_index=True)
+
+    log_event(
+        logger,
+        "Generated synthetic data",
+        scale=scale,
+        dim_movies=len(dim_movies),
+        dim_genres=len(dim_genres),
+        dim_date=len(dim_date),
+        movies_genres=len(movies_genres),
+    )
+    return {
+        "dim_movies": dim_movies,
+        "dim_genres": dim_genres,
+        "dim_date": dim_date,
+        "movies_genres": movies_genres,
+    }
+
+
+def _percentile(sorted_values, pct):
+    """Percentile theo nearest-rank trên danh sách đã sắp xếp"""
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+# Host trỏ về máy cục bộ (None: kết nối qua Unix socket)
+LOCAL_HOSTS = {None, "", "localhost", "127.0.0.1", "::1"}
+
+
+def _server_address(url):
+    """(host, port, database) đã chuẩn hóa của một database URL"""
+    import socket
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url)
+    host = (url.host or "").lower()
+    if host in LOCAL_HOSTS:
+        host = "localhost"
+    else:
+        try:
+            host = socket.gethostbyname(host)
+        except OSError:
+            pass
+    return host, url.port or 5432, url.database
+
+
+def same_database(url, other_url):
+    """
+    Kiểm tra hai URL có trỏ tới cùng một database hay không
+
+    So sánh host (localhost/127.0.0.1/::1 là một, tên miền được phân giải),
+    port (mặc định 5432) và tên database, bỏ qua driver, user và tham số.
+    """
+    return _server_address(url) == _server_address(other_url)
+
+
+def _plan_indexes(node):
+    """Liệt kê các index được dùng trong cây plan (JSON)"""
+    indexes = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        indexes |= _plan_indexes(child)
+    return indexes
+
+
+class QueryBenchmark:
+    """Lớp chạy benchmark độ trễ truy vấn trên PostgreSQL"""
+
+    def __init__(self, database_url=None, repeat=None, warmup=None):
+        """
+        Khởi tạo QueryBenchmark
+
+        Parameters
+        ----------
+        database_url : str, optional
+            URL database benchmark (mặc định Config.BENCHMARK_DATABASE_URL,
+            nếu trống thì dùng database chính - chỉ đọc)
+        repeat : int, optional
+            Số lần đo mỗi truy vấn (mặc định Config.BENCHMARK_REPEAT)
+        warmup : int, optional
+            Số lần chạy làm nóng cache trước khi đo (mặc định 2)
+        """
+        self.database_url = (
+            database_url or Config.BENCHMARK_DATABASE_URL or Config.get_database_url()
+        )
+        self.repeat = repeat or Config.BENCHMARK_REPEAT
+        self.warmup = 2 if warmup is None else warmup
+        self.engine = None
+
+    def connect(self):
+        """Kết nối đến database benchmark"""
+        from sqlalchemy import create_engine
+
+        self.engine = create_engine(self.database_url)
+        log_event(logger, "Benchmark database", url=self._safe_url())
+        return self.engine
+
+    def _safe_url(self):
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def prepare_database(self, init_sql=None, scale=1.0, seed=42):
+        """
+        Tạo lại schema và tải dữ liệu tổng hợp vào database benchmark
+
+        Xóa các bảng Star Schema, áp dụng init script, tải dữ liệu qua
+        NetflixLoader (cùng đường tải với pipeline) rồi chạy ANALYZE.
+
+        Parameters
+        ----------
+        init_sql : str, optional
+            Script tạo schema (mặc định docker/init.sql; có thể dùng
+            docker/init_partitioned.sql hoặc một biến thể cần so sánh)
+        scale : float, optional
+            Hệ số kích thước dữ liệu tổng hợp
+        seed : int, optional
+            Seed dữ liệu tổng hợp
+
+        Returns
+        -------
+        dict
+            Số hàng đã tải cho mỗi bảng
+        """
+        from src.loader import NetflixLoader
+
+        if same_database(self.database_url, Config.get_database_url()):
+            raise ValueError(
+                "Refusing to reset the main database; "
+                "set BENCHMARK_DATABASE_URL to a disposable database"
+            )
+
+        init_sql = init_sql or DEFAULT_INIT_SQL
+        with open(init_sql, encoding="utf-8") as f:
+            script = f.read()
+
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "DROP TABLE IF EXISTS movies_genres, dim_movies, dim_genres, dim_date "
+                "CASCADE"
+            )
+            connection.exec_driver_sql(script, execution_options=RAW_SQL)
+        log_event(logger, "Applied schema", script=str(init_sql))
+
+        loader = NetflixLoader(self.database_url)
+        loader.connect()
+        try:
+            results = loader.load_all(generate_synthetic_star_schema(scale, seed))
+        finally:
+            loader.disconnect()
+
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        return results
+
+    def explain(self, query):
+        """
+        Lấy plan EXPLAIN (ANALYZE, BUFFERS) dạng JSON của một truy vấn
+
+        Returns
+        -------
+        dict
+            Plan gốc của PostgreSQL (có Plan, Planning Time, Execution Time)
+        """
+        with self.engine.connect() as connection:
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}",
+                execution_options=RAW_SQL,
+            ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]
+
+    def measure(self, query):
+        """
+        Đo độ trễ một truy vấn (bao gồm thời gian đọc kết quả)
+
+        Returns
+        -------
+        dict
+            Thống kê độ trễ (ms), số hàng và tóm tắt plan
+        """
+        timings = []
+        with self.engine.connect() as connection:
+            for run in range(self.warmup + self.repeat):
+                start = time.perf_counter()
+                result = connection.exec_driver_sql(
+                    query.sql, execution_options=RAW_SQL
+                )
+                rows = len(result.fetchall())
+                elapsed = (time.perf_counter() - start) * 1000
+                if run >= self.warmup:
+                    timings.append(elapsed)
+
+        timings.sort()
+        plan = self.explain(query)
+        root = plan["Plan"]
+        return {
+            "title": query.title,
+            "rows": rows,
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p95_ms": round(_percentile(timings, 95), 3),
+            "mean_ms": round(sum(timings) / len(timings), 3),
+            "min_ms": round(timings[0], 3),
+            "max_ms": round(timings[-1], 3),
+            "planning_ms": plan.get("Planning Time"),
+            "execution_ms": plan.get("Execution Time"),
+            "shared_hit_blocks": root.get("Shared Hit Blocks"),
+            "shared_read_blocks": root.get("Shared Read Blocks"),
+            "node_type": root.get("Node Type"),
+            "indexes": sorted(_plan_indexes(root)),
+            "plan": plan,
+        }
+
+    def run(self, queries, scale=None, init_sql=None):
+        """
+        Chạy benchmark cho danh sách truy vấn
+
+        Parameters
+        ----------
+        queries : list of BenchmarkQuery
+            Các truy vấn cần đo
+        scale : float, optional
+            Hệ số dữ liệu tổng hợp đã tải (chỉ để ghi vào kết quả)
+        init_sql : str, optional
+            Script schema đã áp dụng (chỉ để ghi vào kết quả)
+
+        Returns
+        -------
+        dict
+            Kết quả benchmark (có thể lưu bằng save_results); truy vấn lỗi
+            nằm trong "failed" (tên -> thông báo lỗi)
+        """
+        results = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "database": self._safe_url(),
+            "scale": scale,
+            "schema": str(init_sql) if init_sql else None,
+            "repeat": self.repeat,
+            "queries": {},
+            "failed": {},
+        }
+
+        for query in queries:
+            try:
+                stats = self.measure(query)
+            except Exception as e:
+                error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                results["failed"][query.name] = error
+                log_event(
+                    logger, "Query failed", logging.ERROR, query=query.name, error=error
+                )
+                continue
+            results["queries"][query.name] = stats
+            log_event(
+                logger,
+                "Query latency",
+                query=query.name,
+                p50_ms=stats["p50_ms"],
+                p95_ms=stats["p95_ms"],
+                rows=stats["rows"],
+                node=stats["node_type"],
+            )
+
+        return results
+
+    def disconnect(self):
+        """Đóng kết nối"""
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
+
+def save_results(results, path):
+    """Lưu kết quả benchmark ra file JSON"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
+    log_event(logger, "Saved benchmark results", path=path)
+    return path
+
+
+def load_results(path):
+    """Đọc kết quả benchmark từ file JSON"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_results_path():
+    """Đường dẫn mặc định cho kết quả của lần chạy hiện tại"""
+    return os.path.join(Config.BENCHMARK_DIR, f"{datetime.now():%Y%m%dT%H%M%S}.json")
+
+
+def default_baseline_path():
+    """Đường dẫn mặc định của baseline"""
+    return os.path.join(Config.BENCHMARK_DIR, BASELINE_FILE)
+
+
+def compare_results(results, baseline, threshold=None):
+    """
+    So sánh kết quả benchmark với baseline
+
+    Parameters
+    ----------
+    results : dict
+        Kết quả lần chạy hiện tại
+    baseline : dict
+        Kết quả baseline
+    threshold : float, optional
+        Ngưỡng thay đổi p50 tương đối (mặc định Config.BENCHMARK_THRESHOLD,
+        0.2 = chậm hơn 20% được tính là regression)
+
+    Returns
+    -------
+    list of dict
+        Mỗi truy vấn có trong cả hai: p50 cũ/mới, tỉ lệ, trạng thái
+        ("regression", "improvement", "ok") và plan_changed
+    """
+    threshold = Config.BENCHMARK_THRESHOLD if threshold is None else threshold
+    comparisons = []
+
+    for name, current in results["queries"].items():
+        previous = baseline["queries"].get(name)
+        if previous is None:
+            continue
+
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else 1.0
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+
+        comparison = {
+            "query": name,
+            "baseline_p50_ms": previous["p50_ms"],
+            "p50_ms": current["p50_ms"],
+            "ratio": round(ratio, 3),
+            "status": status,
+            "plan_changed": (
+                previous.get("node_type") != current.get("node_type")
+                or previous.get("indexes") != current.get("indexes")
+            ),
+        }
+        comparisons.append(comparison)
+        log_event(
+            logger,
+            "Baseline comparison",
+            logging.WARNING if status == "regression" else logging.INFO,
+            **comparison,
+        )
+
+    return comparisons
@@ -0,0 +1,403 @@
+"""
+Bitmap Index Module - Index bitmap trong tiến trình cho lọc nhiều facet
+
+Chức năng:
+- Mỗi genre, rating và type một bitmap (bit-packed) trên movie_id
+- Mảng release_year đã sắp xếp để lọc theo khoảng năm bằng searchsorted
+- Kết hợp bộ lọc bằng AND/OR trên bitmap, không cần join movies_genres
+- Lưu ra một file có thể memory-map (mở nhanh, dùng chung giữa các tiến trình)
+"""
+
+import os
+import json
+import struct
+
+import numpy as np
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("bitmap_index")
+
+# Định dạng file: MAGIC | độ dài header (uint64) | header JSON | các mảng
+MAGIC = b"NFXBIDX1"
+# Căn lề offset của mỗi mảng để memory-map đúng kiểu dữ liệu
+ALIGNMENT = 64
+FACETS = ("genre", "rating", "type")
+
+# Số bit 1 của mỗi giá trị byte (đếm phần tử trong bitmap)
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint16)
+
+
+class BitmapIndex:
+    """
+    Lớp index bitmap trên dim_movies/movies_genres
+
+    Vị trí bit i tương ứng movie_ids[i] (movie_id đã sắp xếp tăng dần).
+    """
+
+    def __init__(self, movie_ids, keys, bitmaps, years, year_positions):
+        """
+        Khởi tạo BitmapIndex (dùng from_star_schema, from_database hoặc load)
+
+        Parameters
+        ----------
+        movie_ids : np.ndarray
+            movie_id đã sắp xếp, vị trí trong mảng là vị trí bit
+        keys : list of (str, str)
+            (facet, giá trị) của từng hàng trong bitmaps
+        bitmaps : np.ndarray
+            Ma trận uint8 (len(keys), ceil(len(movie_ids) / 8)), bit-packed
+        years : np.ndarray
+            release_year đã sắp xếp (bỏ qua title không có năm)
+        year_positions : np.ndarray
+            Vị trí bit tương ứng với từng phần tử của years
+        """
+        self.movie_ids = movie_ids
+        self.keys = [tuple(key) for key in keys]
+        self.bitmaps = bitmaps
+        self.years = years
+        self.year_positions = year_positions
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    @classmethod
+    def from_star_schema(cls, star_schema):
+        """
+        Tạo index từ Star Schema (NetflixTransformer.create_star_schema())
+
+        Parameters
+        ----------
+        star_schema : dict
+            Dictionary chứa dim_movies, dim_genres, movies_genres
+
+        Returns
+        -------
+        BitmapIndex
+        """
+        import pandas as pd
+
+        dim_movies = star_schema["dim_movies"].sort_values("movie_id")
+        movie_ids = dim_movies["movie_id"].to_numpy(dtype=np.int64)
+        num_movies = len(movie_ids)
+
+        movie_genres = star_schema["movies_genres"].merge(
+            star_schema["dim_genres"], on="genre_id"
+        )
+        movie_genres = movie_genres[movie_genres["movie_id"].isin(movie_ids)]
+        columns = {
+            "genre": (
+                movie_genres["genre_name"],
+                np.searchsorted(movie_ids, movie_genres["movie_id"].to_numpy()),
+            ),
+            "rating": (dim_movies["rating"], np.arange(num_movies)),
+            "type": (dim_movies["type"], np.arange(num_movies)),
+        }
+
+        keys = []
+        rows = []
+        for facet in FACETS:
+            values, positions = columns[facet]
+            values = pd.Series(values.to_numpy(), index=positions).dropna()
+            # Mỗi giá trị: đánh dấu vị trí bit rồi pack 8 bit/byte
+            for value, group in values.groupby(values, sort=True):
+                bits = np.zeros(num_movies, dtype=bool)
+                bits[group.index.to_numpy()] = True
+                keys.append((facet, str(value)))
+                rows.append(np.packbits(bits))
+
+        bitmaps = (
+            np.vstack(rows)
+            if rows
+            else np.zeros((0, (num_movies + 7) // 8), dtype=np.uint8)
+        )
+
+        release_year = pd.to_numeric(dim_movies["release_year"], errors="coerce")
+        release_year = release_year.to_numpy(dtype=float)
+        known = np.flatnonzero(~np.isnan(release_year))
+        order = known[np.argsort(release_year[known], kind="stable")]
+
+        index = cls(
+            movie_ids,
+            keys,
+            bitmaps,
+            release_year[order].astype(np.int32),
+            order.astype(np.int64),
+        )
+        log_event(
+            logger,
+            "Built bitmap index",
+            movies=num_movies,
+            bitmaps=len(keys),
+            size_kb=round(index.nbytes / 1024, 1),
+        )
+        return index
+
+    @classmethod
+    def from_database(cls, engine=None):
+        """
+        Tạo index từ các bảng đã tải trong PostgreSQL
+
+        Parameters
+        ----------
+        engine : sqlalchemy.engine.Engine, optional
+            Engine kết nối (mặc định queries.get_engine())
+
+        Returns
+        -------
+        BitmapIndex
+        """
+        import pandas as pd
+        from src.queries import get_engine
+
+        engine = engine or get_engine()
+        star_schema = {
+            "dim_movies": pd.read_sql(
+                "SELECT movie_id, type, rating, release_year FROM dim_movies", engine
+            ),
+            "dim_genres": pd.read_sql(
+                "SELECT genre_id, genre_name FROM dim_genres", engine
+            ),
+            "movies_genres": pd.read_sql(
+                "SELECT movie_id, genre_id FROM movies_genres", engine
+            ),
+        }
+        return cls.from_star_schema(star_schema)
+
+    @property
+    def nbytes(self):
+        """Kích thước dữ liệu của index (byte)"""
+        return sum(
+            array.nbytes
+            for array in (
+                self.movie_ids,
+                self.bitmaps,
+                self.years,
+                self.year_positions,
+            )
+        )
+
+    def values(self, facet):
+        """Các giá trị có bitmap của một facet ("genre", "rating", "type")"""
+        return [value for key_facet, value in self.keys if key_facet == facet]
+
+    def bitmap(self, facet, value):
+        """
+        Bitmap của một giá trị facet
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap uint8 (toàn 0 nếu giá trị không tồn tại)
+        """
+        row = self._rows.get((facet, str(value)))
+        if row is None:
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        return self.bitmaps[row]
+
+    def _any(self, facet, values):
+        values = [values] if isinstance(values, str) else list(values)
+        result = np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        for value in values:
+            result |= self.bitmap(facet, value)
+        return result
+
+    def year_bitmap(self, year_min=None, year_max=None):
+        """
+        Bitmap của các title có release_year trong [year_min, year_max]
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap uint8
+        """
+        start, end = 0, len(self.years)
+        if year_min is not None:
+            start = np.searchsorted(self.years, year_min, side="left")
+        if year_max is not None:
+            end = np.searchsorted(self.years, year_max, side="right")
+        bits = np.zeros(len(self.movie_ids), dtype=bool)
+        bits[self.year_positions[start:end]] = True
+        return np.packbits(bits)
+
+    def match(
+        self,
+        genres=None,
+        any_genres=None,
+        ratings=None,
+        types=None,
+        year_min=None,
+        year_max=None,
+    ):
+        """
+        Bitmap các title thỏa tất cả bộ lọc
+
+        Parameters
+        ----------
+        genres : str or list of str, optional
+            Title phải thuộc TẤT CẢ các genre này (AND)
+        any_genres : str or list of str, optional
+            Title thuộc ÍT NHẤT một genre (OR)
+        ratings : str or list of str, optional
+            Một trong các rating (OR)
+        types : str or list of str, optional
+            Một trong các type, "Movie" hoặc "TV Show" (OR)
+        year_min, year_max : int, optional
+            Khoảng release_year (bao gồm hai đầu)
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap uint8 kết quả
+        """
+        result = np.full(self.bitmaps.shape[1], 0xFF, dtype=np.uint8)
+        # Xóa các bit thừa ở byte cuối (vượt quá số title)
+        tail = len(self.movie_ids) % 8
+        if tail and len(result):
+            result[-1] = (0xFF << (8 - tail)) & 0xFF
+
+        if genres is not None:
+            for genre in [genres] if isinstance(genres, str) else genres:
+                result &= self.bitmap("genre", genre)
+        if any_genres is not None:
+            result &= self._any("genre", any_genres)
+        if ratings is not None:
+            result &= self._any("rating", ratings)
+        if types is not None:
+            result &= self._any("type", types)
+        if year_min is not None or year_max is not None:
+            result &= self.year_bitmap(year_min, year_max)
+        return result
+
+    def filter(self, **filters):
+        """
+        movie_id của các title thỏa bộ lọc (tham số giống match())
+
+        Ví dụ: index.filter(genres=["Dramas", "Romantic Movies"],
+        ratings="TV-MA", year_min=2015)
+
+        Returns
+        -------
+        np.ndarray
+            movie_id tăng dần
+        """
+        bits = np.unpackbits(self.match(**filters), count=len(self.movie_ids))
+        return self.movie_ids[np.flatnonzero(bits)]
+
+    def count(self, **filters):
+        """Số title thỏa bộ lọc (tham số giống match())"""
+        return int(_POPCOUNT[self.match(**filters)].sum())
+
+    def facet_counts(self, facet, **filters):
+        """
+        Số title theo từng giá trị của một facet trong tập đã lọc
+
+        Dùng cho faceted browsing, ví dụ số title mỗi genre của TV-MA sau 2018.
+
+        Returns
+        -------
+        dict
+            {giá trị: số title}, bỏ qua giá trị có 0 title
+        """
+        mask = self.match(**filters)
+        rows = [row for row, key in enumerate(self.keys) if key[0] == facet]
+        counts = _POPCOUNT[self.bitmaps[rows] & mask].sum(axis=1)
+        return {
+            self.keys[row][1]: int(count)
+            for row, count in zip(rows, counts)
+            if count
+        }
+
+    def save(self, path=None):
+        """
+        Lưu index ra một file có thể memory-map
+
+        Parameters
+        ----------
+        path : str, optional
+            Đường dẫn file (mặc định Config.BITMAP_INDEX_PATH)
+
+        Returns
+        -------
+        str
+            Đường dẫn đã lưu
+        """
+        path = path or Config.BITMAP_INDEX_PATH
+        arrays = {
+            "movie_ids": self.movie_ids,
+            "bitmaps": self.bitmaps,
+            "years": self.years,
+            "year_positions": self.year_positions,
+        }
+
+        # Tính offset của từng mảng (tính từ đầu vùng dữ liệu)
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout[name] = {
+                "offset": offset,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+            offset += array.nbytes
+
+        header = json.dumps({"keys": self.keys, "arrays": layout}).encode("utf-8")
+        data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+
+        log_event(logger, "Saved bitmap index", path=path, movies=len(self))
+        return path
+
+    @classmethod
+    def load(cls, path=None, mmap=True):
+        """
+        Mở index đã lưu
+
+        Parameters
+        ----------
+        path : str, optional
+            Đường dẫn file (mặc định Config.BITMAP_INDEX_PATH)
+        mmap : bool, optional
+            Memory-map file thay vì đọc vào bộ nhớ (mặc định True)
+
+        Returns
+        -------
+        BitmapIndex
+        """
+        path = path or Config.BITMAP_INDEX_PATH
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a bitmap index file: {path}")
+            (header_length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_length))
+        data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            offset = data_start + spec["offset"]
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=offset, shape=shape
+                )
+            else:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    arrays[name] = np.fromfile(
+                        f, dtype=dtype, count=int(np.prod(shape))
+                    ).reshape(shape)
+
+        log_event(logger, "Loaded bitmap index", path=path, mmap=mmap)
+        return cls(keys=header["keys"], **arrays)
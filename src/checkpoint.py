@@ -0,0 +1,207 @@
+"""
+Checkpoint Module - Lưu kết quả từng bước để chạy tiếp (resume) khi lỗi
+
+Chức năng:
+- Mỗi lần chạy có một run ID và thư mục riêng trong CHECKPOINT_DIR
+- Lưu dữ liệu thô (Extract) và Star Schema (Transform) dạng Parquet
+- Ghi lại các bước, các bảng đã tải xong và cấu hình chạy vào state.json
+- Chạy tiếp từ bước/bảng cuối cùng đã hoàn thành (chỉ khi cùng cấu hình)
+"""
+
+import os
+import json
+import shutil
+import uuid
+from datetime import datetime
+
+from config.config import Config
+from src.logger import get_logger, log_event
+from src import staging
+
+logger = get_logger("checkpoint")
+
+STATE_FILE = "state.json"
+STAGES = ("extract", "transform", "load")
+
+
+def new_run_id():
+    """Tạo run ID dạng <timestamp>-<hex> (sắp xếp được theo thời gian)"""
+    return f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def _config_diff(saved, current):
+    """Các khóa cấu hình khác nhau, dạng "khóa: cũ -> mới" """
+    saved = saved or {}
+    return [
+        f"{key}: {saved.get(key)!r} -> {current.get(key)!r}"
+        for key in sorted(set(saved) | set(current))
+        if saved.get(key) != current.get(key)
+    ]
+
+
+class CheckpointStore:
+    """Lớp quản lý checkpoint của một lần chạy pipeline"""
+
+    def __init__(self, run_id=None, base_dir=None, config=None):
+        """
+        Khởi tạo CheckpointStore
+
+        Parameters
+        ----------
+        run_id : str, optional
+            Run ID (mặc định tạo mới)
+        base_dir : str, optional
+            Thư mục gốc chứa checkpoint (mặc định Config.CHECKPOINT_DIR)
+        config : dict, optional
+            Cấu hình của lần chạy mới (sink, sample, key_registry), được
+            lưu vào state.json để kiểm tra khi resume
+        """
+        self.base_dir = base_dir or Config.CHECKPOINT_DIR
+        self.run_id = run_id or new_run_id()
+        self.run_dir = os.path.join(self.base_dir, self.run_id)
+        self.state = self._read_state() or {
+            "run_id": self.run_id,
+            "config": config,
+            "completed_stages": [],
+            "loaded_tables": [],
+            "completed": False,
+        }
+
+    @classmethod
+    def list_runs(cls, base_dir=None):
+        """
+        Liệt kê các lần chạy đã có checkpoint (mới nhất trước)
+
+        Returns
+        -------
+        list of dict
+            Nội dung state.json của từng lần chạy
+        """
+        base_dir = base_dir or Config.CHECKPOINT_DIR
+        if not os.path.isdir(base_dir):
+            return []
+
+        runs = []
+        for run_id in sorted(os.listdir(base_dir), reverse=True):
+            state = cls(run_id, base_dir).state
+            if os.path.exists(os.path.join(base_dir, run_id, STATE_FILE)):
+                runs.append(state)
+        return runs
+
+    @classmethod
+    def resume(cls, run_id=None, base_dir=None, config=None):
+        """
+        Mở lại checkpoint để chạy tiếp
+
+        Parameters
+        ----------
+        run_id : str, optional
+            Run ID cần chạy tiếp (mặc định lần chạy chưa hoàn thành gần nhất)
+        base_dir : str, optional
+            Thư mục gốc chứa checkpoint
+        config : dict, optional
+            Cấu hình hiện tại; phải trùng với cấu hình đã lưu của lần chạy cũ
+
+        Returns
+        -------
+        CheckpointStore
+            Checkpoint cũ, hoặc checkpoint mới nếu không có gì để chạy tiếp
+
+        Raises
+        ------
+        ValueError
+            Nếu lần chạy cũ dùng cấu hình khác (sink, sample, key_registry)
+        """
+        if run_id is None:
+            pending = [
+                run for run in cls.list_runs(base_dir) if not run["completed"]
+            ]
+            run_id = pending[0]["run_id"] if pending else None
+
+        checkpoint = cls(run_id, base_dir, config)
+        if config is not None and run_id is not None:
+            diff = _config_diff(checkpoint.state.get("config"), config)
+            if diff:
+                raise ValueError(
+                    f"Cannot resume run {run_id}: configuration differs "
+                    f"({'; '.join(diff)}). Run again without --resume, or pass "
+                    "--run-id of a run started with the same options"
+                )
+
+        log_event(
+            logger,
+            "Resuming run" if run_id else "No run to resume, starting new run",
+            run_id=checkpoint.run_id,
+            completed_stages=",".join(checkpoint.state["completed_stages"]) or "-",
+            loaded_tables=",".join(checkpoint.state["loaded_tables"]) or "-",
+        )
+        return checkpoint
+
+    def _path(self, *parts):
+        return os.path.join(self.run_dir, *parts)
+
+    def _read_state(self):
+        path = self._path(STATE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self):
+        os.makedirs(self.run_dir, exist_ok=True)
+        tmp_path = self._path(f"{STATE_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self._path(STATE_FILE))
+
+    def is_done(self, stage):
+        """Kiểm tra một bước đã hoàn thành trong lần chạy này chưa"""
+        return stage in self.state["completed_stages"]
+
+    def mark_done(self, stage):
+        """Đánh dấu một bước đã hoàn thành"""
+        if stage not in self.state["completed_stages"]:
+            self.state["completed_stages"].append(stage)
+        self.state["completed"] = all(self.is_done(name) for name in STAGES)
+        self._write_state()
+        log_event(logger, "Stage checkpointed", run_id=self.run_id, stage=stage)
+
+    @property
+    def loaded_tables(self):
+        """Các bảng đã được tải xong trong lần chạy này"""
+        return tuple(self.state["loaded_tables"])
+
+    def mark_table_loaded(self, table, rows=None):
+        """Đánh dấu một bảng đã tải xong (dùng làm callback của load_all)"""
+        if table not in self.state["loaded_tables"]:
+            self.state["loaded_tables"].append(table)
+        self._write_state()
+        log_event(logger, "Table checkpointed", run_id=self.run_id, table=table)
+
+    def save_raw(self, df):
+        """Lưu dữ liệu thô sau bước Extract và đánh dấu hoàn thành"""
+        staging.save_frame(df, self._path(staging.RAW_FILE))
+        self.mark_done("extract")
+
+    def load_raw(self):
+        """Đọc dữ liệu thô đã lưu"""
+        return staging.load_frame(self._path(staging.RAW_FILE))
+
+    def save_star_schema(self, star_schema):
+        """Lưu Star Schema sau bước Transform và đánh dấu hoàn thành"""
+        staging.save_star_schema(star_schema, self._path(staging.STAR_SCHEMA_DIR))
+        self.mark_done("transform")
+
+    def load_star_schema(self):
+        """Đọc Star Schema đã lưu"""
+        return staging.load_star_schema(self._path(staging.STAR_SCHEMA_DIR))
+
+    def cleanup(self):
+        """Xóa dữ liệu checkpoint của lần chạy, giữ lại state.json"""
+        for name in (staging.RAW_FILE, staging.STAR_SCHEMA_DIR):
+            path = self._path(name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+        log_event(logger, "Removed checkpoint data", run_id=self.run_id)
@@ -0,0 +1,358 @@
+"""
+CLI Module - Giao diện dòng lệnh của Netflix ETL Pipeline
+
+Lệnh:
+- extract   : Đọc CSV (hoặc tải từ Kaggle) và lưu dữ liệu thô vào staging
+- transform : Chuyển đổi dữ liệu thô thành Star Schema trong staging
+- load      : Tải Star Schema từ staging vào sink
+- run       : Chạy toàn bộ pipeline Extract -> Transform -> Load
+- validate  : Kiểm tra số hàng đã tải trong sink
+- status    : Trạng thái checkpoint của các lần chạy gần nhất
+- benchmark : Đo độ trễ các truy vấn SQL_EXAMPLES.sql, so sánh với baseline
+- index     : Tạo bitmap index (genre/rating/type/năm) cho lọc nhiều facet
+
+Mỗi lệnh chỉ import các thư viện nặng (pandas, SQLAlchemy, pyarrow, kaggle)
+mà nó thực sự cần, nên các lệnh ngắn như validate khởi động nhanh.
+"""
+
+import argparse
+import logging
+import sys
+
+from src.logger import configure_logging, get_logger, log_event
+
+logger = get_logger("cli")
+
+
+def cmd_extract(args):
+    """Trích xuất dữ liệu thô và lưu vào staging"""
+    from config.config import Config
+    from src.extractor import NetflixExtractor
+    from src import staging
+
+    extractor = NetflixExtractor(data_path=args.data_path)
+    sample = args.sample_size or args.sample_fraction
+    if args.kaggle:
+        df = extractor.extract_from_kaggle()
+    elif sample or Config.SAMPLE_SIZE or Config.SAMPLE_FRACTION:
+        df = extractor.extract_sample(
+            size=args.sample_size,
+            fraction=args.sample_fraction,
+            seed=args.sample_seed,
+        )
+    else:
+        df = extractor.extract_from_csv()
+    if not extractor.validate_data(df):
+        return 1
+
+    staging.save_frame(df, args.output or staging.default_raw_path())
+    return 0
+
+
+def cmd_transform(args):
+    """Chuyển đổi dữ liệu thô trong staging thành Star Schema"""
+    from src.transformer import NetflixTransformer
+    from src import staging
+
+    df = staging.load_frame(args.input or staging.default_raw_path())
+
+    key_registry = None
+    if args.key_registry:
+        from src.key_registry import KeyRegistry
+
+        key_registry = KeyRegistry()
+
+    star_schema = NetflixTransformer(df).transform(key_registry=key_registry)
+    staging.save_star_schema(
+        star_schema, args.output or staging.default_star_schema_dir()
+    )
+    return 0
+
+
+def cmd_load(args):
+    """Tải Star Schema trong staging vào sink"""
+    from src.sinks import get_sink
+    from src import staging
+
+    star_schema = staging.load_star_schema(
+        args.input or staging.default_star_schema_dir()
+    )
+
+    sink = get_sink(args.sink)
+    sink.connect()
+    try:
+        sink.load_all(star_schema)
+        sink.validate_load()
+    finally:
+        sink.disconnect()
+    return 0
+
+
+def cmd_run(args):
+    """Chạy toàn bộ pipeline"""
+    from src.etl_pipeline import main as run_pipeline
+
+    run_pipeline(
+        out_of_core=args.out_of_core,
+        use_key_registry=args.key_registry,
+        sink=args.sink,
+        resume=args.resume,
+        run_id=args.run_id,
+        sample_size=args.sample_size,
+        sample_fraction=args.sample_fraction,
+        sample_seed=args.sample_seed,
+    )
+    return 0
+
+
+def cmd_status(args):
+    """Hiển thị trạng thái checkpoint của các lần chạy gần nhất"""
+    from src.checkpoint import CheckpointStore
+
+    runs = CheckpointStore.list_runs()[: args.limit]
+    if not runs:
+        logger.info("No checkpointed runs")
+    for run in runs:
+        log_event(
+            logger,
+            "Run status",
+            run_id=run["run_id"],
+            completed=run["completed"],
+            stages=",".join(run["completed_stages"]) or "-",
+            loaded_tables=",".join(run["loaded_tables"]) or "-",
+        )
+    return 0
+
+
+def cmd_benchmark(args):
+    """Đo độ trễ truy vấn và so sánh với baseline"""
+    import os
+    from src import benchmark
+
+    queries = benchmark.parse_sql_examples(args.sql_file)
+    if args.queries:
+        queries = [query for query in queries if query.name in args.queries]
+
+    runner = benchmark.QueryBenchmark(
+        database_url=args.database_url, repeat=args.repeat, warmup=args.warmup
+    )
+    runner.connect()
+    try:
+        if not args.skip_load:
+            runner.prepare_database(
+                init_sql=args.init_sql, scale=args.scale, seed=args.seed
+            )
+        results = runner.run(
+            queries,
+            scale=None if args.skip_load else args.scale,
+            init_sql=None if args.skip_load else args.init_sql,
+        )
+    finally:
+        runner.disconnect()
+
+    benchmark.save_results(results, args.output or benchmark.default_results_path())
+
+    # Kết quả thiếu truy vấn không được dùng làm baseline
+    if results["failed"]:
+        log_event(
+            logger,
+            "Benchmark failed",
+            logging.ERROR,
+            failed=",".join(results["failed"]),
+        )
+        return 1
+
+    baseline_path = args.baseline or benchmark.default_baseline_path()
+    if args.save_baseline:
+        benchmark.save_results(results, baseline_path)
+        return 0
+    if not os.path.exists(baseline_path):
+        log_event(logger, "No baseline to compare", path=baseline_path)
+        return 0
+
+    comparisons = benchmark.compare_results(
+        results, benchmark.load_results(baseline_path), threshold=args.threshold
+    )
+    regressions = [c["query"] for c in comparisons if c["status"] == "regression"]
+    log_event(
+        logger,
+        "Benchmark summary",
+        compared=len(comparisons),
+        regressions=",".join(regressions) or "-",
+    )
+    return 1 if regressions else 0
+
+
+def cmd_index(args):
+    """Tạo bitmap index từ Star Schema trong staging hoặc từ PostgreSQL"""
+    from src.bitmap_index import BitmapIndex
+
+    if args.from_database:
+        index = BitmapIndex.from_database()
+    else:
+        from src import staging
+
+        index = BitmapIndex.from_star_schema(
+            staging.load_star_schema(args.input or staging.default_star_schema_dir())
+        )
+
+    index.save(args.output)
+    return 0
+
+
+def cmd_validate(args):
+    """Kiểm tra số hàng trong sink"""
+    from config.config import Config
+
+    sink_name = (args.sink or Config.SINK).lower()
+    if sink_name == "postgres":
+        # Chỉ cần SQLAlchemy, không import pandas/loader
+        from src.queries import table_counts
+
+        validation = table_counts()
+        log_event(logger, "Validation counts", sink=sink_name, **validation)
+    else:
+        from src.sinks import get_sink
+
+        sink = get_sink(sink_name)
+        sink.connect()
+        try:
+            validation = sink.validate_load()
+        finally:
+            sink.disconnect()
+
+    return 0 if validation.get("dim_movies_count") else 1
+
+
+def add_sample_arguments(parser):
+    """Thêm các tham số lấy mẫu phân tầng (chế độ dev)"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--sample-size", type=int, help="Chỉ đọc mẫu phân tầng gồm N hàng"
+    )
+    group.add_argument(
+        "--sample-fraction", type=float, help="Chỉ đọc mẫu phân tầng theo tỉ lệ"
+    )
+    parser.add_argument(
+        "--sample-seed", type=int, help="Seed của mẫu (mặc định SAMPLE_SEED)"
+    )
+
+
+def build_parser():
+    """Tạo argparse parser với các subcommand"""
+    parser = argparse.ArgumentParser(
+        prog="netflix-etl", description="Netflix ETL Pipeline"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Chế độ quiet/production"
+    )
+    parser.add_argument("--log-level", help="Mức log (DEBUG, INFO, WARNING, ERROR)")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser("extract", help="Trích xuất dữ liệu thô")
+    extract.add_argument("--data-path", help="Tệp CSV nguồn (mặc định DATA_PATH)")
+    extract.add_argument(
+        "--kaggle", action="store_true", help="Tải dữ liệu từ Kaggle API"
+    )
+    extract.add_argument("--output", help="File Parquet đầu ra trong staging")
+    add_sample_arguments(extract)
+    extract.set_defaults(func=cmd_extract)
+
+    transform = subparsers.add_parser("transform", help="Tạo Star Schema")
+    transform.add_argument("--input", help="File dữ liệu thô (Parquet hoặc CSV)")
+    transform.add_argument("--output", help="Thư mục Star Schema đầu ra")
+    transform.add_argument(
+        "--key-registry", action="store_true", help="Dùng key registry cục bộ"
+    )
+    transform.set_defaults(func=cmd_transform)
+
+    load = subparsers.add_parser("load", help="Tải Star Schema vào sink")
+    load.add_argument("--input", help="Thư mục Star Schema")
+    load.add_argument("--sink", help="postgres, parquet hoặc duckdb")
+    load.set_defaults(func=cmd_load)
+
+    run = subparsers.add_parser("run", help="Chạy toàn bộ pipeline")
+    run.add_argument("--sink", help="postgres, parquet hoặc duckdb")
+    # Chế độ out-of-core không ghi checkpoint nên không dùng được với --resume
+    mode = run.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--out-of-core", action="store_true", help="Chuyển đổi spill-to-disk"
+    )
+    mode.add_argument(
+        "--resume", action="store_true", help="Chạy tiếp từ checkpoint gần nhất"
+    )
+    run.add_argument(
+        "--key-registry", action="store_true", help="Dùng key registry cục bộ"
+    )
+    run.add_argument("--run-id", help="Run ID cần chạy tiếp (dùng với --resume)")
+    add_sample_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    status = subparsers.add_parser("status", help="Trạng thái checkpoint")
+    status.add_argument(
+        "--limit", type=int, default=5, help="Số lần chạy hiển thị (mặc định 5)"
+    )
+    status.set_defaults(func=cmd_status)
+
+    bench = subparsers.add_parser("benchmark", help="Đo độ trễ truy vấn")
+    bench.add_argument(
+        "--database-url", help="Database benchmark (mặc định BENCHMARK_DATABASE_URL)"
+    )
+    bench.add_argument(
+        "--scale", type=float, default=1.0, help="Hệ số dữ liệu tổng hợp (mặc định 1)"
+    )
+    bench.add_argument("--seed", type=int, default=42, help="Seed dữ liệu tổng hợp")
+    bench.add_argument(
+        "--init-sql", help="Script schema (mặc định docker/init.sql)"
+    )
+    bench.add_argument(
+        "--skip-load",
+        action="store_true",
+        help="Đo trên dữ liệu hiện có, không tạo lại schema",
+    )
+    bench.add_argument("--repeat", type=int, help="Số lần đo mỗi truy vấn")
+    bench.add_argument("--warmup", type=int, help="Số lần chạy làm nóng (mặc định 2)")
+    bench.add_argument(
+        "--queries", nargs="+", help="Chỉ chạy các truy vấn này, ví dụ 2.1 6.4"
+    )
+    bench.add_argument("--sql-file", help="File truy vấn (mặc định SQL_EXAMPLES.sql)")
+    bench.add_argument("--output", help="File JSON kết quả")
+    bench.add_argument("--baseline", help="File baseline để so sánh")
+    bench.add_argument(
+        "--save-baseline", action="store_true", help="Lưu kết quả làm baseline mới"
+    )
+    bench.add_argument(
+        "--threshold", type=float, help="Ngưỡng regression p50 (mặc định 0.2)"
+    )
+    bench.set_defaults(func=cmd_benchmark)
+
+    index = subparsers.add_parser("index", help="Tạo bitmap index")
+    index.add_argument("--input", help="Thư mục Star Schema (mặc định staging)")
+    index.add_argument(
+        "--from-database", action="store_true", help="Đọc các bảng từ PostgreSQL"
+    )
+    index.add_argument("--output", help="File index (mặc định BITMAP_INDEX_PATH)")
+    index.set_defaults(func=cmd_index)
+
+    validate = subparsers.add_parser("validate", help="Kiểm tra dữ liệu đã tải")
+    validate.add_argument("--sink", help="postgres, parquet hoặc duckdb")
+    validate.set_defaults(func=cmd_validate)
+
+    return parser
+
+
+def main(argv=None):
+    """Entry point của lệnh netflix-etl"""
+    args = build_parser().parse_args(argv)
+    configure_logging(level=args.log_level, quiet=args.quiet or None)
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        logger.error("Command %s failed: %s", args.command, e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
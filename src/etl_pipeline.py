@@ -5,67 +5,222 @@ Thực hiện toàn bộ quy trình Extract -> Transform -> Load
 """
 
 import sys
+import logging
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from src.extractor import NetflixExtractor
-from src.transformer import NetflixTransformer
-from src.loader import NetflixLoader
+from src.sinks import get_sink
+from config.config import Config
+from src.logger import configure_logging, get_logger, log_event
 
+# pandas/SQLAlchemy chỉ được import khi pipeline thực sự chạy (xem src/cli.py)
+logger = get_logger("pipeline")
 
-def main():
-    """Hàm main thực hiện ETL pipeline"""
 
-    print("\n" + "=" * 80)
-    print("NETFLIX ETL PIPELINE")
-    print("=" * 80)
+def open_key_registry(loader):
+    """Mở key registry cục bộ và seed từ database đã tải trước đó (nếu có)"""
+    from src.key_registry import KeyRegistry
 
+    key_registry = KeyRegistry()
+    if getattr(loader, "engine", None) is not None:
+        key_registry.seed_from_database(loader.engine)
+    return key_registry
+
+
+def extract_sample(sample):
+    """Đọc mẫu phân tầng (chế độ dev) với các tham số sample_size/fraction/seed"""
+    from src.extractor import NetflixExtractor
+
+    log_event(logger, "Sampling mode enabled", logging.WARNING, **sample)
+    extractor = NetflixExtractor()
+    df = extractor.extract_sample(
+        size=sample["size"], fraction=sample["fraction"], seed=sample["seed"]
+    )
+    extractor.validate_data(df)
+    return df
+
+
+def run_out_of_core(loader, key_registry=None, sample=None):
+    """Chạy ETL ở chế độ out-of-core cho dữ liệu lớn hơn bộ nhớ"""
+    from src.extractor import NetflixExtractor
+    from src.out_of_core import OutOfCoreTransformer
+
+    extractor = NetflixExtractor()
+
+    # Chunk khi đọc và batch khi tải dùng chung một ngân sách bộ nhớ
+    sizer = None
+    if Config.ADAPTIVE_SIZING:
+        from src.sizing import AdaptiveSizer
+
+        sizer = AdaptiveSizer()
+        if hasattr(loader, "sizer"):
+            loader.sizer = sizer
+
+    logger.info("[Step 1-2/3] EXTRACTING & TRANSFORMING DATA (OUT-OF-CORE)...")
+    if sample:
+        # Mẫu đủ nhỏ để đọc một lần, các bước sau vẫn chạy theo partition
+        chunks = [extract_sample(sample)]
+    else:
+        chunks = extractor.extract_chunks(sizer=sizer)
+    with OutOfCoreTransformer(chunks, key_registry=key_registry) as transformer:
+        dimensions, partitions = transformer.transform()
+
+        logger.info("[Step 3/3] LOADING DATA...")
+        loader.load_partitions(dimensions, partitions)
+        loader.validate_load()
+
+
+def main(
+    quiet=None,
+    out_of_core=False,
+    use_key_registry=False,
+    sink=None,
+    resume=False,
+    run_id=None,
+    sample_size=None,
+    sample_fraction=None,
+    sample_seed=None,
+):
+    """
+    Hàm main thực hiện ETL pipeline
+
+    Parameters
+    ----------
+    quiet : bool, optional
+        Chạy ở chế độ quiet/production (mặc định từ Config.QUIET_MODE)
+    out_of_core : bool, optional
+        Chuyển đổi theo partition trên đĩa thay vì toàn bộ trong bộ nhớ
+    use_key_registry : bool, optional
+        Cấp genre_id/movie_id ổn định từ key registry cục bộ
+    sink : str, optional
+        Đích tải: "postgres", "parquet" hoặc "duckdb" (mặc định Config.SINK)
+    resume : bool, optional
+        Chạy tiếp từ bước/bảng cuối cùng đã hoàn thành của lần chạy lỗi
+    run_id : str, optional
+        Run ID cần chạy tiếp (mặc định lần chạy chưa hoàn thành gần nhất)
+    sample_size : int, optional
+        Chỉ xử lý mẫu phân tầng gồm sample_size hàng (mặc định
+        Config.SAMPLE_SIZE, 0 = toàn bộ dữ liệu)
+    sample_fraction : float, optional
+        Chỉ xử lý mẫu phân tầng theo tỉ lệ (mặc định Config.SAMPLE_FRACTION)
+    sample_seed : int, optional
+        Seed của mẫu (mặc định Config.SAMPLE_SEED)
+    """
+    if quiet is not None:
+        configure_logging(quiet=quiet)
+
+    logger.info("NETFLIX ETL PIPELINE")
+
+    sample = None
+    if sample_size is None and sample_fraction is None:
+        sample_size, sample_fraction = Config.SAMPLE_SIZE, Config.SAMPLE_FRACTION
+    if sample_size or sample_fraction:
+        sample = {
+            "size": sample_size or 0,
+            "fraction": sample_fraction or 0,
+            "seed": Config.SAMPLE_SEED if sample_seed is None else sample_seed,
+        }
+
+    if out_of_core and resume:
+        # Chế độ out-of-core không ghi checkpoint nên không có gì để chạy tiếp
+        logger.warning("Resume is not supported in out-of-core mode; ignoring")
+
+    key_registry = None
     try:
+        loader = get_sink(sink)
+        loader.connect()
+        key_registry = open_key_registry(loader) if use_key_registry else None
+
+        if out_of_core:
+            run_out_of_core(loader, key_registry, sample)
+            loader.disconnect()
+            logger.info("ETL PIPELINE COMPLETED SUCCESSFULLY!")
+            return
+
+        from src.checkpoint import CheckpointStore
+        from src.extractor import NetflixExtractor
+        from src.transformer import NetflixTransformer
+
+        # Chỉ chạy tiếp checkpoint được tạo với cùng cấu hình
+        run_config = {
+            "sink": loader.name,
+            "sample": sample,
+            "key_registry": bool(use_key_registry),
+        }
+        if resume:
+            checkpoint = CheckpointStore.resume(run_id, config=run_config)
+        else:
+            checkpoint = CheckpointStore(run_id, config=run_config)
+        log_event(logger, "Pipeline run", run_id=checkpoint.run_id)
+
         # Step 1: Extract
-        print("\n[Step 1/3] EXTRACTING DATA...")
-        extractor = NetflixExtractor()
-        df = extractor.extract_from_csv()
-        extractor.validate_data(df)
+        logger.info("[Step 1/3] EXTRACTING DATA...")
+        if checkpoint.is_done("transform"):
+            logger.info("Skipped: transform checkpoint available")
+        elif checkpoint.is_done("extract"):
+            df = checkpoint.load_raw()
+        elif sample:
+            df = extract_sample(sample)
+            checkpoint.save_raw(df)
+        else:
+            extractor = NetflixExtractor()
+            df = extractor.extract_from_csv()
+            extractor.validate_data(df)
+            checkpoint.save_raw(df)
 
         # Step 2: Transform
-        print("\n[Step 2/3] TRANSFORMING DATA...")
-        transformer = NetflixTransformer(df)
-        star_schema = transformer.transform()
+        logger.info("[Step 2/3] TRANSFORMING DATA...")
+        if checkpoint.is_done("transform"):
+            star_schema = checkpoint.load_star_schema()
+        else:
+            transformer = NetflixTransformer(df)
+            star_schema = transformer.transform(key_registry=key_registry)
+            checkpoint.save_star_schema(star_schema)
 
         # Step 3: Load
-        print("\n[Step 3/3] LOADING DATA...")
-        loader = NetflixLoader()
-        loader.connect()
-        loader.load_all(star_schema)
+        logger.info("[Step 3/3] LOADING DATA...")
+        loader.load_all(
+            star_schema,
+            skip_tables=checkpoint.loaded_tables,
+            on_table_loaded=checkpoint.mark_table_loaded,
+        )
+        checkpoint.mark_done("load")
         loader.validate_load()
         loader.disconnect()
 
-        print("\n" + "=" * 80)
-        print("ETL PIPELINE COMPLETED SUCCESSFULLY!")
-        print("=" * 80)
-        print("\nYou can now query the data from PostgreSQL:")
-        print("  - Host: localhost")
-        print("  - Port: 5432")
-        print("  - Database: netflix_db")
-        print("  - User: netflix_user")
-        print("=" * 80 + "\n")
+        if not Config.KEEP_CHECKPOINTS:
+            checkpoint.cleanup()
+
+        logger.info("ETL PIPELINE COMPLETED SUCCESSFULLY!")
+        if loader.name == "postgres":
+            logger.info(
+                "You can now query the data from PostgreSQL: "
+                "localhost:5432 | netflix_db | netflix_user"
+            )
 
     except Exception as e:
-        print("\n" + "=" * 80)
-        print("ETL PIPELINE FAILED!")
-        print("=" * 80)
-        print(f"\nError: {str(e)}")
-        print("\nTroubleshooting:")
-        print("1. Ensure Docker PostgreSQL is running: docker-compose up -d")
-        print("2. Ensure data file exists: data/netflix_titles.csv")
-        print("3. Check .env configuration")
-        print("=" * 80 + "\n")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("ETL PIPELINE FAILED! Error: %s", e)
+        logger.error(
+            "Troubleshooting: "
+            "1. Ensure Docker PostgreSQL is running: docker-compose up -d; "
+            "2. Ensure data file exists: data/netflix_titles.csv; "
+            "3. Check .env configuration; "
+            "4. Re-run with --resume to continue from the last checkpoint"
+        )
         sys.exit(1)
 
+    finally:
+        if key_registry is not None:
+            key_registry.close()
+
 
 if __name__ == "__main__":
-    main()
+    from src.cli import main as cli_main
+
+    # Cùng tham số với "netflix-etl run"; --quiet là tùy chọn chung của CLI
+    args = sys.argv[1:]
+    options = [arg for arg in args if arg == "--quiet"]
+    sys.exit(cli_main([*options, "run", *[arg for arg in args if arg != "--quiet"]]))
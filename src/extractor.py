@@ -3,18 +3,27 @@ Extractor Module - Trích xuất dữ liệu Netflix
 
 Chức năng:
 - Đọc dữ liệu từ CSV
+- Lấy mẫu phân tầng tái lập được (chế độ dev) trong một lần đọc
 - Tải dữ liệu từ Kaggle (tuỳ chọn)
 """
 
 import os
 import sys
+import time
+import logging
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from config.config import Config
+from src.logger import get_logger, log_event, diagnostics_enabled
+
+logger = get_logger("extractor")
 
 
 class NetflixExtractor:
@@ -49,15 +58,228 @@ class NetflixExtractor:
             raise FileNotFoundError(f"File not found: {self.data_path}")
 
         try:
-            print(f"Reading data from {self.data_path}...")
+            log_event(logger, "Reading data", path=self.data_path)
             df = pd.read_csv(self.data_path)
-            print(f"Extracted {len(df)} rows and {len(df.columns)} columns")
-            print(f"Columns: {df.columns.tolist()}")
+            log_event(
+                logger, "Extracted data", rows=len(df), columns=len(df.columns)
+            )
+            logger.debug("Columns: %s", df.columns.tolist())
             return df
         except Exception as e:
-            print(f"Error reading CSV: {str(e)}")
+            log_event(logger, "Error reading CSV", logging.ERROR, error=str(e))
             raise
 
+    def extract_chunks(self, chunksize=None, sizer=None):
+        """
+        Trích xuất dữ liệu từ tệp CSV theo từng chunk
+
+        Khi bật Config.ADAPTIVE_SIZING và không truyền chunksize, kích thước
+        chunk được chọn theo ngân sách bộ nhớ và điều chỉnh sau mỗi chunk theo
+        thời gian xử lý (đọc + xử lý phía sau) và RSS.
+
+        Parameters
+        ----------
+        chunksize : int, optional
+            Số hàng cố định mỗi chunk (mặc định Config.CHUNK_SIZE)
+        sizer : AdaptiveSizer, optional
+            Bộ điều chỉnh kích thước dùng chung (mặc định tạo mới)
+
+        Yields
+        ------
+        pd.DataFrame
+            Từng chunk dữ liệu Netflix
+
+        Raises
+        ------
+        FileNotFoundError
+            Nếu tệp CSV không tìm thấy
+        """
+        if not os.path.exists(self.data_path):
+            raise FileNotFoundError(f"File not found: {self.data_path}")
+
+        if chunksize or not Config.ADAPTIVE_SIZING:
+            sizer = None
+            chunksize = chunksize or Config.CHUNK_SIZE
+        else:
+            from src.sizing import AdaptiveSizer, SAMPLE_ROWS
+
+            sizer = sizer or AdaptiveSizer()
+            chunksize = sizer.calibrate(
+                "chunk", pd.read_csv(self.data_path, nrows=SAMPLE_ROWS)
+            )
+
+        log_event(
+            logger,
+            "Reading data in chunks",
+            path=self.data_path,
+            chunksize=chunksize,
+            adaptive=sizer is not None,
+        )
+
+        total_rows = 0
+        with pd.read_csv(self.data_path, chunksize=chunksize) as reader:
+            while True:
+                started = time.perf_counter()
+                try:
+                    chunk = reader.get_chunk(chunksize)
+                except StopIteration:
+                    break
+                total_rows += len(chunk)
+                yield chunk
+                if sizer is not None:
+                    # Thời gian gồm cả xử lý phía sau (transform, spill)
+                    chunksize = sizer.observe(
+                        "chunk", len(chunk), time.perf_counter() - started
+                    )
+
+        log_event(logger, "Extracted data", rows=total_rows)
+
+    @staticmethod
+    def sample_strata(df):
+        """
+        Tầng lấy mẫu của từng hàng: type và genre đầu tiên trong listed_in
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dữ liệu thô
+
+        Returns
+        -------
+        pd.Series
+            Nhãn tầng dạng "<type>|<genre>"
+        """
+        genre = df["listed_in"].fillna("").str.split(",").str[0].str.strip()
+        return df["type"].fillna("").astype(str) + "|" + genre
+
+    def extract_sample(self, size=None, fraction=None, seed=None, chunksize=None):
+        """
+        Trích xuất mẫu phân tầng theo type và genre trong một lần đọc theo chunk
+
+        Mỗi hàng nhận một khóa ngẫu nhiên sinh từ seed theo thứ tự trong file,
+        nên cùng file và seed luôn cho cùng mẫu, không phụ thuộc chunk size.
+        Với size, mỗi tầng giữ tối đa size hàng có khóa nhỏ nhất (reservoir)
+        và size được chia cho các tầng theo tỉ lệ kích thước (mỗi tầng ít nhất
+        một hàng nếu đủ chỗ). Với fraction, hàng có khóa < fraction được giữ;
+        tầng không có hàng nào được chọn vẫn giữ hàng có khóa nhỏ nhất.
+
+        Parameters
+        ----------
+        size : int, optional
+            Số hàng của mẫu
+        fraction : float, optional
+            Tỉ lệ mẫu trong (0, 1]; nếu không truyền cả size lẫn fraction thì
+            dùng Config.SAMPLE_SIZE và Config.SAMPLE_FRACTION
+        seed : int, optional
+            Seed ngẫu nhiên (mặc định Config.SAMPLE_SEED)
+        chunksize : int, optional
+            Số hàng mỗi chunk khi đọc (mặc định như extract_chunks())
+
+        Returns
+        -------
+        pd.DataFrame
+            Mẫu dữ liệu thô theo thứ tự trong file, cùng các cột với
+            extract_from_csv()
+
+        Raises
+        ------
+        ValueError
+            Nếu không có (hoặc có cả) size và fraction, hoặc giá trị không hợp lệ
+        """
+        if size is None and fraction is None:
+            size, fraction = Config.SAMPLE_SIZE, Config.SAMPLE_FRACTION
+        seed = Config.SAMPLE_SEED if seed is None else seed
+        if bool(size) == bool(fraction):
+            raise ValueError("Specify exactly one of sample size or fraction")
+        if size and size < 0:
+            raise ValueError(f"Sample size must be positive: {size}")
+        if fraction and not 0 < fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1]: {fraction}")
+
+        rng = np.random.default_rng(seed)
+        total_rows = 0
+        counts = pd.Series(dtype="int64")
+        # size: các hàng có khóa nhỏ nhất mỗi tầng; fraction: hàng được chọn
+        kept = []
+        # fraction: hàng có khóa nhỏ nhất mỗi tầng (dự phòng cho tầng nhỏ)
+        smallest = None
+
+        for chunk in self.extract_chunks(chunksize=chunksize):
+            chunk = chunk.assign(
+                _row=np.arange(total_rows, total_rows + len(chunk)),
+                _key=rng.random(len(chunk)),
+                _stratum=self.sample_strata(chunk),
+            )
+            total_rows += len(chunk)
+            counts = counts.add(chunk["_stratum"].value_counts(), fill_value=0)
+
+            if fraction:
+                kept.append(chunk[chunk["_key"] < fraction])
+                frames = [chunk] if smallest is None else [smallest, chunk]
+                smallest = (
+                    pd.concat(frames).sort_values("_key").drop_duplicates("_stratum")
+                )
+            else:
+                # Gộp ngay để bộ nhớ không vượt quá size hàng mỗi tầng
+                kept = [
+                    pd.concat(kept + [chunk])
+                    .sort_values("_key")
+                    .groupby("_stratum", sort=False)
+                    .head(size)
+                ]
+
+        if total_rows == 0:
+            raise ValueError(f"No rows to sample in {self.data_path}")
+
+        kept = pd.concat(kept)
+        if fraction:
+            missing = smallest[~smallest["_stratum"].isin(kept["_stratum"])]
+            sample = pd.concat([kept, missing])
+        else:
+            allocation = self._allocate_sample(counts.astype("int64"), size)
+            kept = kept.sort_values("_key")
+            rank = kept.groupby("_stratum", sort=False).cumcount()
+            sample = kept[rank < kept["_stratum"].map(allocation)]
+
+        sample = (
+            sample.sort_values("_row")
+            .drop(columns=["_row", "_key", "_stratum"])
+            .reset_index(drop=True)
+        )
+        log_event(
+            logger,
+            "Sampled data",
+            rows=len(sample),
+            source_rows=total_rows,
+            strata=len(counts),
+            seed=seed,
+        )
+        return sample
+
+    @staticmethod
+    def _allocate_sample(counts, size):
+        """
+        Chia size hàng cho các tầng theo tỉ lệ kích thước (largest remainder)
+
+        Mỗi tầng nhận ít nhất một hàng nếu size đủ cho mọi tầng và không
+        nhận nhiều hơn số hàng nó có.
+        """
+        if size >= counts.sum():
+            return counts
+        base = pd.Series(0, index=counts.index)
+        if size >= len(counts):
+            base += 1
+        remaining = size - base.sum()
+        quota = remaining * (counts - base) / (counts - base).sum()
+        allocation = base + np.floor(quota).astype("int64")
+        leftover = int(size - allocation.sum())
+        if leftover:
+            remainder = (quota - np.floor(quota)).sort_values(
+                ascending=False, kind="stable"
+            )
+            allocation[remainder.index[:leftover]] += 1
+        return allocation
+
     def extract_from_kaggle(self):
         """
         Tải dữ liệu từ Kaggle API
@@ -76,26 +298,30 @@ class NetflixExtractor:
         try:
             from kaggle.api.kaggle_api_extended import KaggleApi
 
-            print("Authenticating with Kaggle API...")
+            logger.info("Authenticating with Kaggle API...")
             api = KaggleApi()
             api.authenticate()
 
             dataset_name = "shivamb/netflix-shows"
             download_path = "./data"
 
-            print(f"Downloading dataset from Kaggle: {dataset_name}...")
+            log_event(logger, "Downloading dataset from Kaggle", dataset=dataset_name)
             api.dataset_download_files(dataset_name, path=download_path, unzip=True)
 
-            print(f"Dataset downloaded to {download_path}")
+            log_event(logger, "Dataset downloaded", path=download_path)
 
             # Read the CSV file
             csv_file = os.path.join(download_path, "netflix_titles.csv")
             return self.extract_from_csv_with_path(csv_file)
 
         except Exception as e:
-            print(f"Error downloading from Kaggle: {str(e)}")
-            print("Please download manually from:")
-            print("https://www.kaggle.com/datasets/shivamb/netflix-shows")
+            log_event(
+                logger, "Error downloading from Kaggle", logging.ERROR, error=str(e)
+            )
+            logger.error(
+                "Please download manually from: "
+                "https://www.kaggle.com/datasets/shivamb/netflix-shows"
+            )
             raise
 
     def extract_from_csv_with_path(self, path):
@@ -115,31 +341,30 @@ class NetflixExtractor:
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
 
-        print(f"Reading data from {path}...")
+        log_event(logger, "Reading data", path=path)
         df = pd.read_csv(path)
-        print(f"Extracted {len(df)} rows and {len(df.columns)} columns")
+        log_event(logger, "Extracted data", rows=len(df), columns=len(df.columns))
         return df
 
     def get_data_info(self, df):
         """
-        In thông tin về DataFrame
+        Ghi log thông tin về DataFrame
+
+        Ở chế độ quiet chỉ ghi kích thước, không tính dtypes, missing
+        values hay head() vì các thống kê này cần quét toàn bộ DataFrame.
 
         Parameters
         ----------
         df : pd.DataFrame
             DataFrame cần kiểm tra
         """
-        print("\n" + "=" * 50)
-        print("DATA INFORMATION")
-        print("=" * 50)
-        print(f"Shape: {df.shape}")
-        print(f"\nColumn Names and Types:")
-        print(df.dtypes)
-        print(f"\nMissing Values:")
-        print(df.isnull().sum())
-        print(f"\nFirst few rows:")
-        print(df.head())
-        print("=" * 50 + "\n")
+        log_event(logger, "Data information", rows=df.shape[0], columns=df.shape[1])
+        if not diagnostics_enabled(logger):
+            return
+
+        logger.info("Column names and types:\n%s", df.dtypes)
+        logger.info("Missing values:\n%s", df.isnull().sum())
+        logger.info("First few rows:\n%s", df.head())
 
     def validate_data(self, df):
         """
@@ -172,10 +397,10 @@ class NetflixExtractor:
         missing_cols = [col for col in required_columns if col not in df.columns]
 
         if missing_cols:
-            print(f"✗ Missing columns: {missing_cols}")
+            log_event(logger, "Missing columns", logging.ERROR, columns=missing_cols)
             return False
 
-        print("All required columns present")
+        logger.info("All required columns present")
         return True
 
 
@@ -190,14 +415,14 @@ def main():
         extractor.get_data_info(df)
 
     except FileNotFoundError as e:
-        print(f"✗ {str(e)}")
-        print("\nTry downloading from Kaggle...")
+        logger.error(str(e))
+        logger.info("Try downloading from Kaggle...")
         try:
             df = extractor.extract_from_kaggle()
             extractor.validate_data(df)
             extractor.get_data_info(df)
         except Exception as kaggle_error:
-            print(f"✗ Kaggle download failed: {str(kaggle_error)}")
+            logger.error("Kaggle download failed: %s", kaggle_error)
             sys.exit(1)
 
 
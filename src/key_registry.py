@@ -0,0 +1,183 @@
+"""
+Key Registry Module - Quản lý surrogate key ổn định cho genres và movies
+
+Chức năng:
+- Ánh xạ genre_name -> genre_id và show_id -> movie_id
+- Lưu trữ cục bộ bằng SQLite, khởi tạo (seed) từ PostgreSQL
+- Tra cứu/cấp ID theo batch bằng vectorization (O(1) mỗi khóa)
+"""
+
+import os
+import sqlite3
+import pandas as pd
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("key_registry")
+
+# kind -> (bảng SQLite, cột khóa, cột ID, câu truy vấn seed từ PostgreSQL)
+KEY_SPACES = {
+    "genre": (
+        "genre_keys",
+        "genre_name",
+        "genre_id",
+        "SELECT genre_name, genre_id FROM dim_genres",
+    ),
+    "movie": (
+        "movie_keys",
+        "show_id",
+        "movie_id",
+        "SELECT show_id, movie_id FROM dim_movies WHERE show_id IS NOT NULL",
+    ),
+}
+
+
+class KeyRegistry:
+    """Lớp lưu trữ surrogate key bền vững cho Star Schema"""
+
+    def __init__(self, path=None):
+        """
+        Khởi tạo KeyRegistry
+
+        Parameters
+        ----------
+        path : str, optional
+            Đường dẫn file SQLite (mặc định Config.KEY_REGISTRY_PATH)
+        """
+        self.path = path or Config.KEY_REGISTRY_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path)
+        for table, key_col, id_col, _ in KEY_SPACES.values():
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"{key_col} TEXT PRIMARY KEY, {id_col} INTEGER NOT NULL UNIQUE)"
+            )
+        self.connection.commit()
+
+        # Bộ nhớ đệm key -> id để tra cứu O(1)
+        self._keys = {kind: self._read_keys(kind) for kind in KEY_SPACES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _read_keys(self, kind):
+        table, key_col, id_col, _ = KEY_SPACES[kind]
+        rows = self.connection.execute(f"SELECT {key_col}, {id_col} FROM {table}")
+        keys = pd.DataFrame(rows.fetchall(), columns=[key_col, id_col])
+        return pd.Series(
+            keys[id_col].to_numpy(dtype="int64"), index=keys[key_col].astype(str)
+        )
+
+    def _insert(self, kind, keys):
+        """Ghi các cặp key/id mới vào SQLite (bỏ qua key đã tồn tại)"""
+        table, key_col, id_col, _ = KEY_SPACES[kind]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO {table} ({key_col}, {id_col}) VALUES (?, ?)",
+                zip(keys.index.tolist(), keys.tolist()),
+            )
+
+    def seed_from_database(self, engine):
+        """
+        Khởi tạo registry từ các bảng chiều đã có trong PostgreSQL
+
+        Parameters
+        ----------
+        engine : sqlalchemy.engine.Engine
+            Engine kết nối PostgreSQL
+
+        Returns
+        -------
+        dict
+            Số khóa trong registry cho mỗi loại
+        """
+        for kind, (_, key_col, id_col, query) in KEY_SPACES.items():
+            existing = pd.read_sql(query, engine)
+            seeded = pd.Series(
+                existing[id_col].to_numpy(dtype="int64"),
+                index=existing[key_col].astype(str),
+            )
+            self._insert(kind, seeded)
+            self._keys[kind] = self._read_keys(kind)
+
+        counts = {kind: len(keys) for kind, keys in self._keys.items()}
+        log_event(logger, "Seeded key registry", **counts)
+        return counts
+
+    def lookup(self, kind, keys):
+        """
+        Tra cứu ID cho một batch khóa (không cấp ID mới)
+
+        Parameters
+        ----------
+        kind : str
+            "genre" hoặc "movie"
+        keys : pd.Series
+            Các khóa cần tra cứu
+
+        Returns
+        -------
+        pd.Series
+            ID tương ứng (NaN nếu khóa chưa có), cùng index với keys
+        """
+        known = self._keys[kind]
+        positions = known.index.get_indexer(keys.astype(str))
+        ids = pd.Series(pd.NA, index=keys.index, dtype="Int64")
+        found = positions >= 0
+        ids[found] = known.to_numpy()[positions[found]]
+        return ids
+
+    def assign(self, kind, keys):
+        """
+        Tra cứu ID cho một batch khóa, cấp ID mới cho khóa chưa có
+
+        ID mới được cấp tăng dần từ ID lớn nhất hiện có và được ghi
+        ngay vào SQLite trong một transaction.
+
+        Parameters
+        ----------
+        kind : str
+            "genre" hoặc "movie"
+        keys : pd.Series
+            Các khóa cần cấp ID
+
+        Returns
+        -------
+        pd.Series
+            ID tương ứng (int64), cùng index với keys
+        """
+        keys = keys.astype(str)
+        known = self._keys[kind]
+
+        new_keys = pd.Index(keys.unique()).difference(known.index, sort=False)
+        if len(new_keys):
+            start = int(known.max()) + 1 if len(known) else 1
+            assigned = pd.Series(
+                range(start, start + len(new_keys)), index=new_keys, dtype="int64"
+            )
+            self._insert(kind, assigned)
+            self._keys[kind] = known = pd.concat([known, assigned])
+            log_event(logger, "Assigned new keys", kind=kind, count=len(new_keys))
+
+        positions = known.index.get_indexer(keys)
+        return pd.Series(known.to_numpy()[positions], index=keys.index)
+
+    def assign_genre_ids(self, genre_names):
+        """Cấp genre_id cho một batch genre_name"""
+        return self.assign("genre", genre_names)
+
+    def assign_movie_ids(self, show_ids):
+        """Cấp movie_id cho một batch show_id"""
+        return self.assign("movie", show_ids)
+
+    def close(self):
+        """Đóng kết nối SQLite"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
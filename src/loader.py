@@ -9,19 +9,148 @@ Chức năng:
 """
 
 import sys
+import time
+import logging
 import pandas as pd
 from pathlib import Path
 from sqlalchemy import create_engine, text, inspect
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from config.config import Config
+from src.logger import get_logger, log_event, diagnostics_enabled
+from src.queries import invalidate_cache
+from src.sinks import BaseSink
+
+logger = get_logger("loader")
+
+# tsvector của title (trọng số A) và description (trọng số B), giống init.sql
+SEARCH_VECTOR = (
+    "TSVECTOR GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+)
+SEARCH_VECTOR_MIGRATION = """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'dim_movies'
+              AND column_name = 'search_vector'
+              AND is_generated = 'NEVER'
+        ) THEN
+            ALTER TABLE dim_movies DROP COLUMN search_vector;
+        END IF;
+    END
+    $$
+"""
 
+# Các câu lệnh DDL đảm bảo schema của database đã tồn tại được cập nhật
+# theo docker/init.sql (idempotent, chỉ chạy khi SCHEMA_CHECK báo thiếu)
+SCHEMA_STATEMENTS = [
+    "ALTER TABLE dim_movies ADD COLUMN IF NOT EXISTS show_id VARCHAR(50)",
+    # Ràng buộc UNIQUE cũ của init.sql trùng với idx_movies_show_id
+    "ALTER TABLE dim_movies DROP CONSTRAINT IF EXISTS dim_movies_show_id_key",
+    # duration dạng số để lọc theo thời lượng bằng index
+    "ALTER TABLE dim_movies ADD COLUMN IF NOT EXISTS duration_minutes INTEGER",
+    "ALTER TABLE dim_movies ADD COLUMN IF NOT EXISTS season_count INTEGER",
+    "CREATE INDEX IF NOT EXISTS idx_movies_duration_minutes "
+    "ON dim_movies(duration_minutes)",
+    "CREATE INDEX IF NOT EXISTS idx_movies_season_count ON dim_movies(season_count)",
+    # Date dimension: date_added_key (YYYYMMDD) nối với dim_date.date_key
+    "CREATE TABLE IF NOT EXISTS dim_date ("
+    "date_key INTEGER PRIMARY KEY, full_date DATE NOT NULL UNIQUE, "
+    "year SMALLINT NOT NULL, quarter SMALLINT NOT NULL, month SMALLINT NOT NULL, "
+    "month_name VARCHAR(10) NOT NULL, day SMALLINT NOT NULL, "
+    "day_of_week SMALLINT NOT NULL, day_name VARCHAR(10) NOT NULL, "
+    "week_of_year SMALLINT NOT NULL, is_weekend BOOLEAN NOT NULL)",
+    "ALTER TABLE dim_movies ADD COLUMN IF NOT EXISTS date_added_key INTEGER",
+    "CREATE INDEX IF NOT EXISTS idx_movies_date_added_key "
+    "ON dim_movies(date_added_key)",
+    # Tìm kiếm title/description: trigram (ILIKE '%...%') và full-text
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # search_vector là cột generated: PostgreSQL tính khi INSERT, không cần
+    # UPDATE lại; cột TSVECTOR thường của schema cũ được thay thế
+    SEARCH_VECTOR_MIGRATION,
+    f"ALTER TABLE dim_movies ADD COLUMN IF NOT EXISTS search_vector {SEARCH_VECTOR}",
+    "CREATE INDEX IF NOT EXISTS idx_movies_title_trgm "
+    "ON dim_movies USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_movies_description_trgm "
+    "ON dim_movies USING GIN (description gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_movies_search_vector "
+    "ON dim_movies USING GIN (search_vector)",
+]
+
+# Kiểm tra catalog: schema đã đủ thì bỏ qua SCHEMA_STATEMENTS, vì ALTER TABLE
+# (kể cả khi IF [NOT] EXISTS không làm gì) vẫn giữ ACCESS EXCLUSIVE lock
+SCHEMA_COLUMNS = [
+    "show_id",
+    "duration_minutes",
+    "season_count",
+    "date_added_key",
+    "search_vector",
+]
+SCHEMA_INDEXES = [
+    "idx_movies_show_id",
+    "idx_movies_duration_minutes",
+    "idx_movies_season_count",
+    "idx_movies_date_added_key",
+    "idx_movies_title_trgm",
+    "idx_movies_description_trgm",
+    "idx_movies_search_vector",
+]
+SCHEMA_CHECK = """
+    SELECT
+        (SELECT relkind = 'p' FROM pg_class
+         WHERE relname = 'dim_movies' AND pg_table_is_visible(oid)) AS partitioned,
+        (SELECT count(*) FROM information_schema.columns
+         WHERE table_name = 'dim_movies'
+           AND column_name = ANY(:columns)) = :column_count
+        AND EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'dim_movies'
+              AND column_name = 'search_vector'
+              AND is_generated = 'ALWAYS'
+        )
+        AND to_regclass('dim_date') IS NOT NULL
+        AND (SELECT count(*) FROM pg_indexes
+             WHERE tablename = 'dim_movies'
+               AND indexname = ANY(:indexes)) = :index_count
+        AND NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'dim_movies_show_id_key'
+        ) AS up_to_date,
+        to_regclass(:default_partition) IS NOT NULL AS has_default_partition
+"""
 
-class NetflixLoader:
+# show_id chỉ có một unique index (idx_movies_show_id); unique index trên
+# bảng partitioned phải chứa partition key (release_year)
+SHOW_ID_INDEX = {
+    False: "CREATE UNIQUE INDEX IF NOT EXISTS idx_movies_show_id "
+    "ON dim_movies(show_id)",
+    True: "CREATE UNIQUE INDEX IF NOT EXISTS idx_movies_show_id "
+    "ON dim_movies(show_id, release_year)",
+}
+
+# dim_movies partitioned (docker/init_partitioned.sql): mỗi release_year một
+# partition, hàng không có release_year nằm trong partition DEFAULT
+PARTITION_DDL = (
+    "CREATE TABLE IF NOT EXISTS {name} PARTITION OF dim_movies "
+    "FOR VALUES FROM ({start}) TO ({end})"
+)
+DEFAULT_PARTITION = "dim_movies_default"
+DEFAULT_PARTITION_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF dim_movies DEFAULT"
+)
+
+
+class NetflixLoader(BaseSink):
     """Lớp tải dữ liệu vào PostgreSQL"""
 
-    def __init__(self, database_url=None):
+    name = "postgres"
+
+    def __init__(self, database_url=None, sizer=None):
         """
         Khởi tạo Loader
 
@@ -29,9 +158,15 @@ class NetflixLoader:
         ----------
         database_url : str, optional
             URL kết nối PostgreSQL (mặc định từ Config)
+        sizer : AdaptiveSizer, optional
+            Bộ điều chỉnh batch size (mặc định tạo mới khi bật
+            Config.ADAPTIVE_SIZING, nếu tắt thì dùng Config.BATCH_SIZE)
         """
         self.database_url = database_url or Config.get_database_url()
         self.engine = None
+        self.partitioned = False
+        self.schema_ready = False
+        self.sizer = sizer
 
     def connect(self):
         """
@@ -43,24 +178,133 @@ class NetflixLoader:
             Engine kết nối
         """
         try:
-            print("Connecting to PostgreSQL...")
+            logger.info("Connecting to PostgreSQL...")
             self.engine = create_engine(self.database_url, echo=False)
 
             # Test connection
             with self.engine.connect() as connection:
                 connection.execute(text("SELECT 1"))
 
-            print(f"Connected to {Config.DB_NAME} @ {Config.DB_HOST}:{Config.DB_PORT}")
+            log_event(
+                logger,
+                "Connected",
+                database=Config.DB_NAME,
+                host=Config.DB_HOST,
+                port=Config.DB_PORT,
+            )
             return self.engine
 
         except Exception as e:
-            print(f"Connection failed: {str(e)}")
-            print(f"\nDatabase URL: {self.database_url}")
-            print("\nMake sure PostgreSQL is running:")
-            print("  docker-compose up -d")
+            log_event(
+                logger,
+                "Connection failed",
+                logging.ERROR,
+                error=str(e),
+                url=self.database_url,
+            )
+            logger.error("Make sure PostgreSQL is running: docker-compose up -d")
+            raise
+
+    def ensure_schema(self):
+        """
+        Áp dụng SCHEMA_STATEMENTS lên database hiện tại nếu schema còn thiếu
+
+        Chỉ chạy một lần cho mỗi loader; DDL được bỏ qua khi catalog cho thấy
+        schema đã đầy đủ (SCHEMA_CHECK). Đồng thời phát hiện dim_movies có được
+        range-partition theo release_year hay không (docker/init_partitioned.sql).
+        """
+        if self.schema_ready:
+            return
+
+        try:
+            with self.engine.connect() as connection:
+                check = connection.execute(
+                    text(SCHEMA_CHECK),
+                    {
+                        "columns": SCHEMA_COLUMNS,
+                        "column_count": len(SCHEMA_COLUMNS),
+                        "indexes": SCHEMA_INDEXES,
+                        "index_count": len(SCHEMA_INDEXES),
+                        "default_partition": DEFAULT_PARTITION,
+                    },
+                ).one()
+                self.partitioned = bool(check.partitioned)
+                migrate = not check.up_to_date or (
+                    self.partitioned and not check.has_default_partition
+                )
+                if migrate:
+                    for statement in SCHEMA_STATEMENTS:
+                        connection.execute(text(statement))
+                    connection.execute(text(SHOW_ID_INDEX[self.partitioned]))
+                    if self.partitioned:
+                        connection.execute(text(DEFAULT_PARTITION_DDL))
+                connection.commit()
+            self.schema_ready = True
+            log_event(
+                logger,
+                "Schema ensured",
+                statements=len(SCHEMA_STATEMENTS) + 1 if migrate else 0,
+                partitioned=self.partitioned,
+            )
+
+        except Exception as e:
+            log_event(logger, "Error ensuring schema", logging.ERROR, error=str(e))
             raise
 
-    def load_dim_genres(self, df_genres):
+    def _insert(self, df, table, stream=None, connection=None):
+        """
+        Ghi (append) DataFrame vào bảng theo từng batch
+
+        Batch size bắt đầu từ Config.BATCH_SIZE, được giới hạn theo ngân sách
+        bộ nhớ và điều chỉnh sau mỗi batch theo throughput và RSS.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dữ liệu cần ghi
+        table : str
+            Tên bảng (hoặc partition)
+        stream : str, optional
+            Tên luồng của AdaptiveSizer (mặc định tên bảng)
+        connection : sqlalchemy.engine.Connection, optional
+            Ghi trong transaction của connection này thay vì tự commit
+
+        Returns
+        -------
+        int
+            Số hàng được ghi
+        """
+        con = self.engine if connection is None else connection
+        if not Config.ADAPTIVE_SIZING:
+            df.to_sql(
+                table,
+                con,
+                if_exists="append",
+                index=False,
+                chunksize=Config.BATCH_SIZE,
+            )
+            return len(df)
+
+        if self.sizer is None:
+            from src.sizing import AdaptiveSizer
+
+            self.sizer = AdaptiveSizer()
+
+        stream = f"batch:{stream or table}"
+        if not self.sizer.is_calibrated(stream):
+            self.sizer.calibrate(stream, df)
+
+        rows_inserted = 0
+        while rows_inserted < len(df):
+            batch = df.iloc[rows_inserted : rows_inserted + self.sizer.size(stream)]
+            started = time.perf_counter()
+            batch.to_sql(table, con, if_exists="append", index=False)
+            self.sizer.observe(stream, len(batch), time.perf_counter() - started)
+            rows_inserted += len(batch)
+
+        return rows_inserted
+
+    def load_dim_genres(self, df_genres, truncate=True):
         """
         Tải dim_genres table
 
@@ -68,38 +312,81 @@ class NetflixLoader:
         ----------
         df_genres : pd.DataFrame
             DataFrame chứa genre data
+        truncate : bool, optional
+            Xóa dữ liệu cũ trước khi tải (mặc định True)
 
         Returns
         -------
         int
             Số hàng được tải
         """
-        print("\n" + "-" * 50)
-        print("Loading dim_genres...")
-        print("-" * 50)
+        log_event(logger, "Loading table", table="dim_genres")
 
         try:
             # Xóa dữ liệu cũ (nếu tồn tại)
-            with self.engine.connect() as connection:
-                connection.execute(text("TRUNCATE TABLE dim_genres CASCADE"))
-                connection.commit()
+            if truncate:
+                with self.engine.connect() as connection:
+                    connection.execute(text("TRUNCATE TABLE dim_genres CASCADE"))
+                    connection.commit()
 
             # Tải dữ liệu mới
-            rows_inserted = df_genres.to_sql(
-                "dim_genres",
-                self.engine,
-                if_exists="append",
-                index=False,
+            rows_inserted = self._insert(df_genres, "dim_genres")
+
+            log_event(logger, "Loaded table", table="dim_genres", rows=rows_inserted)
+            return rows_inserted
+
+        except Exception as e:
+            log_event(
+                logger,
+                "Error loading table",
+                logging.ERROR,
+                table="dim_genres",
+                error=str(e),
             )
+            raise
+
+    def load_dim_date(self, df_date, truncate=True):
+        """
+        Tải dim_date table
+
+        Parameters
+        ----------
+        df_date : pd.DataFrame
+            DataFrame chứa lịch (NetflixTransformer.build_dim_date)
+        truncate : bool, optional
+            Xóa dữ liệu cũ trước khi tải (mặc định True)
+
+        Returns
+        -------
+        int
+            Số hàng được tải
+        """
+        log_event(logger, "Loading table", table="dim_date")
 
-            print(f"Loaded {rows_inserted} genres")
+        try:
+            # Xóa dữ liệu cũ (nếu tồn tại)
+            if truncate:
+                with self.engine.connect() as connection:
+                    connection.execute(text("TRUNCATE TABLE dim_date CASCADE"))
+                    connection.commit()
+
+            # Tải dữ liệu mới
+            rows_inserted = self._insert(df_date, "dim_date")
+
+            log_event(logger, "Loaded table", table="dim_date", rows=rows_inserted)
             return rows_inserted
 
         except Exception as e:
-            print(f"Error loading dim_genres: {str(e)}")
+            log_event(
+                logger,
+                "Error loading table",
+                logging.ERROR,
+                table="dim_date",
+                error=str(e),
+            )
             raise
 
-    def load_dim_movies(self, df_movies):
+    def load_dim_movies(self, df_movies, truncate=True):
         """
         Tải dim_movies table
 
@@ -107,38 +394,194 @@ class NetflixLoader:
         ----------
         df_movies : pd.DataFrame
             DataFrame chứa movie data
+        truncate : bool, optional
+            Xóa dữ liệu cũ trước khi tải (mặc định True)
 
         Returns
         -------
         int
             Số hàng được tải
         """
-        print("\n" + "-" * 50)
-        print("Loading dim_movies...")
-        print("-" * 50)
+        log_event(logger, "Loading table", table="dim_movies")
 
         try:
             # Xóa dữ liệu cũ (nếu tồn tại)
-            with self.engine.connect() as connection:
-                connection.execute(text("TRUNCATE TABLE dim_movies CASCADE"))
-                connection.commit()
+            if truncate:
+                with self.engine.connect() as connection:
+                    connection.execute(text("TRUNCATE TABLE dim_movies CASCADE"))
+                    connection.commit()
 
             # Tải dữ liệu mới
-            rows_inserted = df_movies.to_sql(
-                "dim_movies",
-                self.engine,
-                if_exists="append",
-                index=False,
-            )
+            if self.partitioned:
+                rows_inserted = self._load_movie_partitions(df_movies)
+            else:
+                rows_inserted = self._insert(df_movies, "dim_movies")
 
-            print(f"Loaded {rows_inserted} movies")
+            log_event(logger, "Loaded table", table="dim_movies", rows=rows_inserted)
             return rows_inserted
 
         except Exception as e:
-            print(f"Error loading dim_movies: {str(e)}")
+            log_event(
+                logger,
+                "Error loading table",
+                logging.ERROR,
+                table="dim_movies",
+                error=str(e),
+            )
+            raise
+
+    @staticmethod
+    def partition_name(release_year):
+        """Tên partition của dim_movies chứa release_year"""
+        if pd.isna(release_year):
+            return DEFAULT_PARTITION
+        return f"dim_movies_y{int(release_year)}"
+
+    def _load_movie_partitions(self, df_movies):
+        """
+        Tải dim_movies trực tiếp vào từng partition theo release_year
+
+        Partition còn thiếu được tạo tự động trước khi tải.
+
+        Returns
+        -------
+        int
+            Số hàng được tải
+        """
+        rows_inserted = 0
+        groups = df_movies.groupby("release_year", dropna=False, sort=True)
+        for release_year, df_part in groups:
+            name = self.partition_name(release_year)
+            if name != DEFAULT_PARTITION:
+                year = int(release_year)
+                with self.engine.connect() as connection:
+                    connection.execute(
+                        text(PARTITION_DDL.format(name=name, start=year, end=year + 1))
+                    )
+                    connection.commit()
+
+            rows_inserted += self._insert(df_part, name, stream="dim_movies")
+            log_event(logger, "Loaded partition", partition=name, rows=len(df_part))
+
+        return rows_inserted
+
+    def reload_partition(self, release_year, star_schema):
+        """
+        Thay thế dữ liệu của một partition release_year mà không động đến
+        các partition khác
+
+        movie_id/genre_id phải ổn định giữa các lần chạy (dùng KeyRegistry),
+        genre và ngày mới chưa có trong dim_genres/dim_date được thêm vào.
+        Việc thay thế chạy trong một transaction: người đọc vẫn thấy dữ liệu
+        cũ cho đến khi commit, lỗi giữa chừng không để lại partition rỗng.
+        Hàng cũ của các movie_id được tải lại cũng bị xóa ở partition khác
+        (khi release_year đã thay đổi).
+
+        Parameters
+        ----------
+        release_year : int or None
+            Năm phát hành cần tải lại (None cho partition DEFAULT)
+        star_schema : dict
+            Star Schema chứa dữ liệu mới (có thể chứa nhiều năm)
+
+        Returns
+        -------
+        dict
+            Dictionary chứa số lượng hàng được tải cho mỗi bảng
+        """
+        if self.engine is None:
+            raise RuntimeError("Not connected. Call connect() first")
+        self.ensure_schema()
+        if not self.partitioned:
+            raise RuntimeError("dim_movies is not partitioned by release_year")
+
+        name = self.partition_name(release_year)
+        log_event(logger, "Reloading partition", partition=name)
+
+        df_movies = star_schema["dim_movies"]
+        if release_year is None:
+            df_movies = df_movies[df_movies["release_year"].isna()]
+        else:
+            df_movies = df_movies[df_movies["release_year"] == release_year]
+        df_movies_genres = star_schema["movies_genres"]
+        df_movies_genres = df_movies_genres[
+            df_movies_genres["movie_id"].isin(df_movies["movie_id"])
+        ]
+
+        movie_ids = [int(movie_id) for movie_id in df_movies["movie_id"]]
+
+        try:
+            # Partition mới được tạo riêng: DDL trên bảng cha giữ khóa
+            # ACCESS EXCLUSIVE đến hết transaction
+            if name != DEFAULT_PARTITION:
+                year = int(release_year)
+                with self.engine.begin() as connection:
+                    connection.execute(
+                        text(PARTITION_DDL.format(name=name, start=year, end=year + 1))
+                    )
+
+            with self.engine.begin() as connection:
+                existing = pd.read_sql(
+                    text("SELECT genre_id FROM dim_genres"), connection
+                )
+                existing_dates = pd.read_sql(
+                    text("SELECT date_key FROM dim_date"), connection
+                )
+
+                # DELETE thay cho TRUNCATE để người đọc không bị chặn
+                connection.execute(
+                    text(
+                        f"DELETE FROM movies_genres WHERE movie_id IN "
+                        f"(SELECT movie_id FROM {name}) "
+                        f"OR movie_id = ANY(:movie_ids)"
+                    ),
+                    {"movie_ids": movie_ids},
+                )
+                connection.execute(text(f"DELETE FROM {name}"))
+                connection.execute(
+                    text("DELETE FROM dim_movies WHERE movie_id = ANY(:movie_ids)"),
+                    {"movie_ids": movie_ids},
+                )
+
+                dim_genres = star_schema["dim_genres"]
+                new_genres = dim_genres[
+                    ~dim_genres["genre_id"].isin(existing["genre_id"])
+                ]
+                dim_date = star_schema["dim_date"]
+                new_dates = dim_date[
+                    ~dim_date["date_key"].isin(existing_dates["date_key"])
+                ]
+                results = {
+                    "dim_genres": self._insert(
+                        new_genres, "dim_genres", connection=connection
+                    ),
+                    "dim_date": self._insert(
+                        new_dates, "dim_date", connection=connection
+                    ),
+                    "dim_movies": self._insert(
+                        df_movies, name, stream="dim_movies", connection=connection
+                    ),
+                    "movies_genres": self._insert(
+                        df_movies_genres, "movies_genres", connection=connection
+                    ),
+                }
+            log_event(logger, "Partition reloaded", partition=name, **results)
+
+            invalidate_cache()
+
+        except Exception as e:
+            log_event(
+                logger,
+                "Error reloading partition",
+                logging.ERROR,
+                partition=name,
+                error=str(e),
+            )
             raise
 
-    def load_movies_genres(self, df_movies_genres):
+        return results
+
+    def load_movies_genres(self, df_movies_genres, truncate=True):
         """
         Tải movies_genres junction table
 
@@ -146,73 +589,132 @@ class NetflixLoader:
         ----------
         df_movies_genres : pd.DataFrame
             DataFrame chứa movie-genre relationships
+        truncate : bool, optional
+            Xóa dữ liệu cũ trước khi tải (mặc định True)
 
         Returns
         -------
         int
             Số hàng được tải
         """
-        print("\n" + "-" * 50)
-        print("Loading movies_genres...")
-        print("-" * 50)
+        log_event(logger, "Loading table", table="movies_genres")
 
         try:
             # Xóa dữ liệu cũ (nếu tồn tại)
-            with self.engine.connect() as connection:
-                connection.execute(text("TRUNCATE TABLE movies_genres"))
-                connection.commit()
+            if truncate:
+                with self.engine.connect() as connection:
+                    connection.execute(text("TRUNCATE TABLE movies_genres"))
+                    connection.commit()
 
             # Tải dữ liệu mới
-            rows_inserted = df_movies_genres.to_sql(
-                "movies_genres",
-                self.engine,
-                if_exists="append",
-                index=False,
-            )
+            rows_inserted = self._insert(df_movies_genres, "movies_genres")
 
-            print(f"Loaded {rows_inserted} movie-genre relationships")
+            log_event(logger, "Loaded table", table="movies_genres", rows=rows_inserted)
             return rows_inserted
 
         except Exception as e:
-            print(f"Error loading movies_genres: {str(e)}")
+            log_event(
+                logger,
+                "Error loading table",
+                logging.ERROR,
+                table="movies_genres",
+                error=str(e),
+            )
             raise
 
-    def load_all(self, star_schema):
+    def load_all(self, star_schema, skip_tables=(), on_table_loaded=None):
         """
         Tải tất cả bảng từ Star Schema
 
         Parameters
         ----------
         star_schema : dict
-            Dictionary chứa dim_movies, dim_genres, movies_genres
+            Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+        skip_tables : iterable of str, optional
+            Các bảng đã tải xong ở lần chạy trước (khi resume)
+        on_table_loaded : callable, optional
+            Hàm gọi sau mỗi bảng tải xong: on_table_loaded(table, rows)
 
         Returns
         -------
         dict
             Dictionary chứa số lượng hàng được tải cho mỗi bảng
         """
-        print("\n" + "=" * 50)
-        print("LOADING DATA TO POSTGRESQL")
-        print("=" * 50)
+        logger.info("LOADING DATA TO POSTGRESQL")
 
         results = {}
+        table_loaders = {
+            "dim_genres": self.load_dim_genres,
+            "dim_date": self.load_dim_date,
+            "dim_movies": self.load_dim_movies,
+            "movies_genres": self.load_movies_genres,
+        }
 
         try:
-            # Tải theo thứ tự (genre trước, vì là FK reference)
-            results["dim_genres"] = self.load_dim_genres(star_schema["dim_genres"])
-            results["dim_movies"] = self.load_dim_movies(star_schema["dim_movies"])
-            results["movies_genres"] = self.load_movies_genres(
-                star_schema["movies_genres"]
-            )
+            self.ensure_schema()
+
+            # Tải theo thứ tự (genre và date trước, vì là FK reference)
+            for table, load_table in table_loaders.items():
+                if table in skip_tables:
+                    log_event(logger, "Skipping loaded table", table=table)
+                    continue
+                results[table] = load_table(star_schema[table])
+                if on_table_loaded is not None:
+                    on_table_loaded(table, results[table])
+
+            log_event(logger, "Load summary", **results)
+
+            # Dữ liệu đã thay đổi: kết quả truy vấn cũ không còn hợp lệ
+            invalidate_cache()
+
+        except Exception as e:
+            log_event(logger, "Error loading data", logging.ERROR, error=str(e))
+            raise
+
+        return results
+
+    def load_partitions(self, dimensions, partitions):
+        """
+        Tải Star Schema theo từng partition (chế độ out-of-core)
+
+        Parameters
+        ----------
+        dimensions : dict
+            Các bảng dimension toàn cục: dim_genres, dim_date
+        partitions : iterable of dict
+            Các star schema theo partition (OutOfCoreTransformer.iter_star_schema())
+
+        Returns
+        -------
+        dict
+            Dictionary chứa số lượng hàng được tải cho mỗi bảng
+        """
+        logger.info("LOADING PARTITIONED DATA TO POSTGRESQL")
+
+        results = {"dim_genres": 0, "dim_date": 0, "dim_movies": 0, "movies_genres": 0}
+
+        try:
+            self.ensure_schema()
+            results["dim_genres"] = self.load_dim_genres(dimensions["dim_genres"])
+            results["dim_date"] = self.load_dim_date(dimensions["dim_date"])
+
+            truncate = True
+            for star_schema in partitions:
+                results["dim_movies"] += self.load_dim_movies(
+                    star_schema["dim_movies"], truncate=truncate
+                )
+                results["movies_genres"] += self.load_movies_genres(
+                    star_schema["movies_genres"], truncate=truncate
+                )
+                truncate = False
+
+            log_event(logger, "Load summary", **results)
 
-            print("\n" + "-" * 50)
-            print("LOAD SUMMARY:")
-            for table, count in results.items():
-                print(f"  {table}: {count} rows")
-            print("-" * 50)
+            # Dữ liệu đã thay đổi: kết quả truy vấn cũ không còn hợp lệ
+            invalidate_cache()
 
         except Exception as e:
-            print(f"Error loading data: {str(e)}")
+            log_event(logger, "Error loading data", logging.ERROR, error=str(e))
             raise
 
         return results
@@ -226,9 +728,7 @@ class NetflixLoader:
         dict
             Thông tin kiểm tra
         """
-        print("\n" + "=" * 50)
-        print("VALIDATING LOADED DATA")
-        print("=" * 50)
+        logger.info("VALIDATING LOADED DATA")
 
         validation = {}
 
@@ -239,39 +739,43 @@ class NetflixLoader:
                     text("SELECT COUNT(*) FROM dim_movies")
                 ).scalar()
                 validation["dim_movies_count"] = movies_count
-                print(f"dim_movies: {movies_count} rows")
 
                 # Check dim_genres
                 genres_count = connection.execute(
                     text("SELECT COUNT(*) FROM dim_genres")
                 ).scalar()
                 validation["dim_genres_count"] = genres_count
-                print(f"dim_genres: {genres_count} rows")
+
+                # Check dim_date
+                dates_count = connection.execute(
+                    text("SELECT COUNT(*) FROM dim_date")
+                ).scalar()
+                validation["dim_date_count"] = dates_count
 
                 # Check movies_genres
                 relationships_count = connection.execute(
                     text("SELECT COUNT(*) FROM movies_genres")
                 ).scalar()
                 validation["movies_genres_count"] = relationships_count
-                print(f"movies_genres: {relationships_count} rows")
-
-                # Sample data
-                print("\nSample movies:")
-                sample_movies = pd.read_sql(
-                    "SELECT movie_id, title, type, release_year FROM dim_movies LIMIT 5",
-                    connection,
-                )
-                print(sample_movies.to_string())
-
-                print("\nSample genres:")
-                sample_genres = pd.read_sql(
-                    "SELECT genre_id, genre_name FROM dim_genres LIMIT 10",
-                    connection,
-                )
-                print(sample_genres.to_string())
+                log_event(logger, "Validation counts", **validation)
+
+                # Sample data chỉ phục vụ chẩn đoán, bỏ qua ở chế độ quiet
+                if diagnostics_enabled(logger):
+                    sample_movies = pd.read_sql(
+                        "SELECT movie_id, title, type, release_year "
+                        "FROM dim_movies LIMIT 5",
+                        connection,
+                    )
+                    logger.info("Sample movies:\n%s", sample_movies.to_string())
+
+                    sample_genres = pd.read_sql(
+                        "SELECT genre_id, genre_name FROM dim_genres LIMIT 10",
+                        connection,
+                    )
+                    logger.info("Sample genres:\n%s", sample_genres.to_string())
 
         except Exception as e:
-            print(f"Validation error: {str(e)}")
+            log_event(logger, "Validation error", logging.ERROR, error=str(e))
             raise
 
         return validation
@@ -280,7 +784,7 @@ class NetflixLoader:
         """Đóng kết nối"""
         if self.engine:
             self.engine.dispose()
-            print("Disconnected from database")
+            logger.info("Disconnected from database")
 
 
 def main():
@@ -304,15 +808,10 @@ def main():
         loader.validate_load()
         loader.disconnect()
 
-        print("\n" + "=" * 50)
-        print("✓ ETL PIPELINE COMPLETED SUCCESSFULLY")
-        print("=" * 50)
+        logger.info("ETL PIPELINE COMPLETED SUCCESSFULLY")
 
     except Exception as e:
-        print(f"\n✗ ETL Pipeline failed: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("ETL Pipeline failed: %s", e)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""
+Logger Module - Ghi log có cấu trúc cho Netflix ETL Pipeline
+
+Chức năng:
+- Logger dùng chung với các mức log (DEBUG, INFO, WARNING, ERROR)
+- Gắn trường có cấu trúc (key=value) vào từng bản ghi log
+- Chế độ quiet/production: bỏ qua các thống kê chỉ dùng để chẩn đoán
+"""
+
+import logging
+import sys
+
+from config.config import Config
+
+ROOT_LOGGER_NAME = "netflix_etl"
+LOG_FORMAT = "%(asctime)s | %(levelname)-7s | %(name)s | %(message)s"
+
+_state = {"configured": False, "quiet": False}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formatter nối các trường có cấu trúc vào cuối message"""
+
+    def format(self, record):
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            rendered = " ".join(f"{key}={value}" for key, value in fields.items())
+            message = f"{message} | {rendered}"
+        return message
+
+
+def configure_logging(level=None, quiet=None):
+    """
+    Cấu hình logger gốc của pipeline
+
+    Parameters
+    ----------
+    level : str or int, optional
+        Mức log (mặc định từ Config.LOG_LEVEL)
+    quiet : bool, optional
+        Bật chế độ quiet (mặc định từ Config.QUIET_MODE). Ở chế độ này
+        mức log tối thiểu là WARNING và các thống kê chẩn đoán bị bỏ qua.
+
+    Returns
+    -------
+    logging.Logger
+        Logger gốc của pipeline
+    """
+    quiet = Config.QUIET_MODE if quiet is None else quiet
+    level = level or Config.LOG_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if quiet:
+        level = max(level, logging.WARNING)
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+        root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+
+    _state["configured"] = True
+    _state["quiet"] = quiet
+    return root
+
+
+def get_logger(name):
+    """
+    Lấy logger con của pipeline
+
+    Parameters
+    ----------
+    name : str
+        Tên module (ví dụ: "extractor")
+
+    Returns
+    -------
+    logging.Logger
+        Logger đã được cấu hình
+    """
+    if not _state["configured"]:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def log_event(logger, message, level=logging.INFO, **fields):
+    """
+    Ghi một bản ghi log kèm các trường có cấu trúc
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger dùng để ghi
+    message : str
+        Nội dung log
+    level : int, optional
+        Mức log (mặc định INFO)
+    **fields
+        Các trường key=value gắn vào bản ghi
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+def is_quiet():
+    """Kiểm tra pipeline có đang chạy ở chế độ quiet hay không"""
+    if not _state["configured"]:
+        configure_logging()
+    return _state["quiet"]
+
+
+def diagnostics_enabled(logger):
+    """
+    Kiểm tra có nên tính các thống kê chỉ dùng để chẩn đoán
+
+    Các thống kê như isnull().sum(), head(), nunique() hay dtypes cần
+    quét toàn bộ DataFrame, nên chỉ được tính khi không ở chế độ quiet
+    và logger đang bật mức INFO.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger sẽ ghi kết quả chẩn đoán
+
+    Returns
+    -------
+    bool
+        True nếu cần tính thống kê chẩn đoán
+    """
+    return not is_quiet() and logger.isEnabledFor(logging.INFO)
@@ -0,0 +1,260 @@
+"""
+Out-of-Core Module - Chuyển đổi dữ liệu lớn hơn bộ nhớ (spill-to-disk)
+
+Chức năng:
+- Đọc CSV theo chunk và làm sạch từng chunk
+- Hash-partition các hàng theo show_id xuống file Parquet trên đĩa
+- Loại bỏ duplicate trên từng partition một cách độc lập
+- Cấp genre_id/movie_id từ tập khóa của từng partition
+- Tạo dim_date toàn cục từ khoảng date_added_key của mọi partition
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from config.config import Config
+from src.logger import get_logger, log_event
+from src.transformer import NetflixTransformer
+
+logger = get_logger("out_of_core")
+
+# Các cột số nguyên (nullable) trong spill files, còn lại lưu dạng string
+INTEGER_COLUMNS = (
+    "release_year",
+    "duration_minutes",
+    "season_count",
+    "date_added_key",
+)
+
+
+class OutOfCoreTransformer:
+    """
+    Lớp chuyển đổi dữ liệu Netflix theo kiểu out-of-core
+
+    Mọi duplicate (toàn hàng, show_id, show_id + genre) đều có cùng show_id,
+    nên khi hash-partition theo show_id thì mỗi partition có thể được
+    deduplicate độc lập mà vẫn cho kết quả như deduplicate toàn cục.
+    """
+
+    def __init__(
+        self, chunks, num_partitions=None, spill_dir=None, key_registry=None
+    ):
+        """
+        Khởi tạo OutOfCoreTransformer
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Các chunk dữ liệu thô (ví dụ: NetflixExtractor.extract_chunks())
+        num_partitions : int, optional
+            Số partition trên đĩa (mặc định Config.SPILL_PARTITIONS)
+        spill_dir : str, optional
+            Thư mục chứa spill files (mặc định Config.SPILL_DIR)
+        key_registry : KeyRegistry, optional
+            Registry cấp genre_id/movie_id ổn định thay cho ID theo vị trí
+        """
+        self.chunks = chunks
+        self.num_partitions = num_partitions or Config.SPILL_PARTITIONS
+        self.spill_dir = spill_dir or Config.SPILL_DIR
+        self.key_registry = key_registry
+        self.work_dir = None
+        self.dim_genres = None
+        self.dim_date = None
+        self.partition_sizes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def _partition_dir(self, stage, partition):
+        return os.path.join(self.work_dir, stage, f"part-{partition:05d}")
+
+    @staticmethod
+    def _normalize_schema(df):
+        """Ép kiểu cố định để mọi spill file có cùng schema Parquet"""
+        df = df.copy()
+        for col in df.columns:
+            if col in INTEGER_COLUMNS:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+            else:
+                df[col] = df[col].astype("string")
+        return df
+
+    def _read_partition(self, stage, partition):
+        """Đọc lại toàn bộ file của một partition theo thứ tự ghi"""
+        path = self._partition_dir(stage, partition)
+        if not os.path.isdir(path):
+            return None
+        files = sorted(os.listdir(path))
+        if not files:
+            return None
+        return pd.concat(
+            [pd.read_parquet(os.path.join(path, name)) for name in files],
+            ignore_index=True,
+        )
+
+    def spill(self):
+        """
+        Bước 1: Làm sạch từng chunk và spill xuống đĩa theo show_id
+
+        Các bước chỉ phụ thuộc từng hàng (xóa NA, chuẩn hóa ngày tháng,
+        chuẩn hóa văn bản, tách duration) được áp dụng ngay trên chunk.
+
+        Returns
+        -------
+        int
+            Số hàng đã được spill
+        """
+        logger.info("OUT-OF-CORE STEP 1: SPILLING PARTITIONS")
+
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.work_dir = tempfile.mkdtemp(prefix="netflix_spill_", dir=self.spill_dir)
+
+        spilled_rows = 0
+        for chunk_index, chunk in enumerate(self.chunks):
+            transformer = NetflixTransformer(chunk)
+            transformer.clean_data()
+            transformer.normalize_dates()
+            transformer.normalize_text()
+            df = self._normalize_schema(transformer.parse_duration())
+
+            buckets = (
+                pd.util.hash_pandas_object(df["show_id"], index=False)
+                % self.num_partitions
+            )
+            for partition, part_df in df.groupby(buckets.values, sort=False):
+                path = self._partition_dir("raw", partition)
+                os.makedirs(path, exist_ok=True)
+                part_df.to_parquet(
+                    os.path.join(path, f"chunk-{chunk_index:08d}.parquet"),
+                    index=False,
+                )
+            spilled_rows += len(df)
+
+        log_event(
+            logger,
+            "Spill completed",
+            rows=spilled_rows,
+            partitions=self.num_partitions,
+            work_dir=self.work_dir,
+        )
+        return spilled_rows
+
+    def deduplicate_partitions(self):
+        """
+        Bước 2: Deduplicate và explode genres trên từng partition
+
+        Ghi partition đã xử lý trở lại đĩa, đồng thời thu thập tập genre,
+        khoảng date_added_key và số show_id duy nhất của mỗi partition để
+        cấp ID và tạo dim_date.
+
+        Returns
+        -------
+        pd.DataFrame
+            dim_genres toàn cục (genre_id, genre_name)
+        """
+        logger.info("OUT-OF-CORE STEP 2: DEDUPLICATING PARTITIONS")
+
+        genre_names = set()
+        date_keys = []
+        for partition in range(self.num_partitions):
+            df = self._read_partition("raw", partition)
+            if df is None:
+                continue
+
+            transformer = NetflixTransformer(df.drop_duplicates())
+            exploded = transformer.explode_genres()
+
+            genre_names.update(exploded["listed_in"].dropna().unique())
+            date_keys.extend(
+                [exploded["date_added_key"].min(), exploded["date_added_key"].max()]
+            )
+            self.partition_sizes[partition] = exploded["show_id"].nunique()
+
+            path = self._partition_dir("dedup", partition)
+            os.makedirs(path, exist_ok=True)
+            exploded.to_parquet(os.path.join(path, "data.parquet"), index=False)
+
+        # Sắp xếp để genre_id không phụ thuộc thứ tự partition
+        names = pd.Series(sorted(genre_names), dtype="string")
+        if self.key_registry is not None:
+            genre_ids = self.key_registry.assign_genre_ids(names)
+        else:
+            genre_ids = range(1, len(names) + 1)
+        self.dim_genres = pd.DataFrame({"genre_id": genre_ids, "genre_name": names})
+        self.dim_date = NetflixTransformer.build_dim_date(date_keys)
+
+        log_event(
+            logger,
+            "Deduplication completed",
+            movies=sum(self.partition_sizes.values()),
+            genres=len(self.dim_genres),
+            dates=len(self.dim_date),
+        )
+        return self.dim_genres
+
+    def iter_star_schema(self):
+        """
+        Bước 3: Tạo Star Schema theo từng partition
+
+        movie_id được cấp liên tục giữa các partition dựa trên số show_id
+        duy nhất của các partition trước đó, hoặc lấy từ key registry.
+
+        Yields
+        ------
+        dict
+            Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+            của một partition (dim_genres và dim_date là bảng toàn cục)
+        """
+        if self.dim_genres is None:
+            self.deduplicate_partitions()
+
+        logger.info("OUT-OF-CORE STEP 3: CREATING STAR SCHEMA PARTITIONS")
+
+        movie_id_start = 1
+        for partition in sorted(self.partition_sizes):
+            df = self._read_partition("dedup", partition)
+            transformer = NetflixTransformer(df)
+            star_schema = transformer.create_star_schema(
+                dim_genres=self.dim_genres,
+                movie_id_start=movie_id_start,
+                key_registry=self.key_registry,
+                dim_date=self.dim_date,
+            )
+            movie_id_start += self.partition_sizes[partition]
+            yield star_schema
+
+    def transform(self):
+        """
+        Thực hiện spill và deduplicate, trả về các bảng dimension toàn cục
+        và các partition
+
+        Returns
+        -------
+        tuple
+            ({"dim_genres": ..., "dim_date": ...},
+            generator các star schema theo partition)
+        """
+        logger.info("NETFLIX OUT-OF-CORE TRANSFORMATION PIPELINE")
+
+        self.spill()
+        self.deduplicate_partitions()
+        dimensions = {"dim_genres": self.dim_genres, "dim_date": self.dim_date}
+        return dimensions, self.iter_star_schema()
+
+    def cleanup(self):
+        """Xóa các spill files"""
+        if self.work_dir and os.path.isdir(self.work_dir):
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            log_event(logger, "Removed spill files", work_dir=self.work_dir)
+        self.work_dir = None
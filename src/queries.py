@@ -0,0 +1,407 @@
+"""
+Queries Module - API truy vấn Star Schema có cache kết quả
+
+Chức năng:
+- Các hàm truy vấn phân tích thường dùng (top genres, titles theo genre,
+  năm, rating, quốc gia) với tham số bind (parameterized statements)
+- Engine dùng connection pool chung cho cả tiến trình
+- Cache LRU/TTL trong tiến trình, tự động xóa khi NetflixLoader tải xong
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, create_engine, text
+
+from config.config import Config
+
+
+class GenreCount(NamedTuple):
+    genre_id: int
+    genre_name: str
+    movie_count: int
+
+
+class Title(NamedTuple):
+    movie_id: int
+    title: str
+    type: str
+    release_year: Optional[int]
+    rating: Optional[str]
+
+
+class QueryCache:
+    """Cache LRU có thời hạn (TTL) cho kết quả truy vấn, an toàn đa luồng"""
+
+    def __init__(self, maxsize=None, ttl=None, clock=time.monotonic):
+        """
+        Khởi tạo QueryCache
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Số kết quả tối đa (mặc định Config.QUERY_CACHE_SIZE, 0 để tắt cache)
+        ttl : float, optional
+            Thời gian sống của mỗi kết quả, giây (mặc định Config.QUERY_CACHE_TTL,
+            0 để tắt cache)
+        clock : callable, optional
+            Hàm trả về thời gian hiện tại, giây (mặc định time.monotonic)
+        """
+        self.maxsize = Config.QUERY_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = Config.QUERY_CACHE_TTL if ttl is None else ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Lấy kết quả đã cache, trả về (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key, value):
+        """Lưu kết quả, loại bỏ phần tử ít dùng nhất khi đầy"""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Xóa toàn bộ cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = QueryCache()
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(database_url=None):
+    """
+    Lấy engine có connection pool dùng chung (mỗi URL một engine)
+
+    Parameters
+    ----------
+    database_url : str, optional
+        URL kết nối PostgreSQL (mặc định từ Config)
+
+    Returns
+    -------
+    sqlalchemy.engine.Engine
+        Engine kết nối
+    """
+    database_url = database_url or Config.get_database_url()
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = create_engine(
+                database_url,
+                pool_size=Config.DB_POOL_SIZE,
+                pool_pre_ping=True,
+            )
+            _engines[database_url] = engine
+    return engine
+
+
+def get_cache():
+    """Lấy cache kết quả truy vấn của tiến trình"""
+    return _cache
+
+
+def invalidate_cache():
+    """Xóa cache kết quả truy vấn (gọi sau mỗi lần tải dữ liệu)"""
+    _cache.clear()
+
+
+def _freeze(value):
+    """Chuyển list/set thành tuple để dùng làm khóa cache"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return value
+
+
+def cached_query(func):
+    """
+    Decorator cache kết quả theo (tên hàm, database URL, tham số)
+
+    Hàm được bọc nhận thêm hai keyword: engine (mặc định get_engine())
+    và use_cache (mặc định True).
+    """
+
+    @wraps(func)
+    def wrapper(*args, engine=None, use_cache=True, **kwargs):
+        engine = engine or get_engine()
+        if not use_cache:
+            return func(engine, *args, **kwargs)
+
+        key = (
+            func.__name__,
+            str(engine.url),
+            tuple(_freeze(arg) for arg in args),
+            tuple(sorted((name, _freeze(arg)) for name, arg in kwargs.items())),
+        )
+        found, result = _cache.get(key)
+        if not found:
+            result = func(engine, *args, **kwargs)
+            _cache.put(key, result)
+        return result
+
+    return wrapper
+
+
+# Câu truy vấn được biên dịch một lần, tham số luôn truyền qua bind params
+_TOP_GENRES = text(
+    """
+    SELECT dg.genre_id, dg.genre_name, COUNT(mg.movie_id) AS movie_count
+    FROM dim_genres dg
+    LEFT JOIN movies_genres mg ON dg.genre_id = mg.genre_id
+    GROUP BY dg.genre_id, dg.genre_name
+    ORDER BY movie_count DESC, dg.genre_name
+    LIMIT :limit
+    """
+)
+
+_TITLES_BY_GENRE = text(
+    """
+    SELECT dm.movie_id, dm.title, dm.type, dm.release_year, dm.rating
+    FROM dim_movies dm
+    JOIN movies_genres mg ON dm.movie_id = mg.movie_id
+    JOIN dim_genres dg ON mg.genre_id = dg.genre_id
+    WHERE dg.genre_name = :genre_name
+    ORDER BY dm.release_year DESC, dm.movie_id
+    LIMIT :limit
+    """
+)
+
+_TITLES_BY_YEAR = text(
+    """
+    SELECT movie_id, title, type, release_year, rating
+    FROM dim_movies
+    WHERE release_year BETWEEN :start_year AND :end_year
+    ORDER BY release_year DESC, movie_id
+    LIMIT :limit
+    """
+)
+
+_TITLES_BY_RATING = text(
+    """
+    SELECT movie_id, title, type, release_year, rating
+    FROM dim_movies
+    WHERE rating IN :ratings
+    ORDER BY release_year DESC, movie_id
+    LIMIT :limit
+    """
+).bindparams(bindparam("ratings", expanding=True))
+
+_TITLES_BY_COUNTRY = text(
+    """
+    SELECT movie_id, title, type, release_year, rating
+    FROM dim_movies
+    WHERE country = :country
+    ORDER BY release_year DESC, movie_id
+    LIMIT :limit
+    """
+)
+
+_SEARCH_TITLES = text(
+    """
+    SELECT movie_id, title, type, release_year, rating
+    FROM dim_movies
+    WHERE search_vector @@ websearch_to_tsquery('english', :query)
+       OR title ILIKE :pattern
+    ORDER BY
+        ts_rank(search_vector, websearch_to_tsquery('english', :query)) DESC,
+        similarity(title, :query) DESC,
+        movie_id
+    LIMIT :limit
+    """
+)
+
+
+def _fetch(engine, statement, row_type, **params):
+    with engine.connect() as connection:
+        rows = connection.execute(statement, params)
+        return tuple(row_type(*row) for row in rows)
+
+
+@cached_query
+def top_genres(engine, limit: int = 15) -> Tuple[GenreCount, ...]:
+    """
+    Top genres theo số lượng phim (SQL_EXAMPLES 2.1)
+
+    Parameters
+    ----------
+    limit : int, optional
+        Số genre trả về (mặc định 15)
+
+    Returns
+    -------
+    tuple of GenreCount
+    """
+    return _fetch(engine, _TOP_GENRES, GenreCount, limit=limit)
+
+
+@cached_query
+def titles_by_genre(engine, genre_name: str, limit: int = 20) -> Tuple[Title, ...]:
+    """
+    Titles thuộc một genre (SQL_EXAMPLES 2.3)
+
+    Parameters
+    ----------
+    genre_name : str
+        Tên genre, ví dụ "Action & Adventure"
+    limit : int, optional
+        Số title trả về (mặc định 20)
+
+    Returns
+    -------
+    tuple of Title
+    """
+    return _fetch(
+        engine, _TITLES_BY_GENRE, Title, genre_name=genre_name, limit=limit
+    )
+
+
+@cached_query
+def titles_by_year(
+    engine, start_year: int, end_year: Optional[int] = None, limit: int = 100
+) -> Tuple[Title, ...]:
+    """
+    Titles theo năm phát hành hoặc khoảng năm
+
+    Parameters
+    ----------
+    start_year : int
+        Năm bắt đầu
+    end_year : int, optional
+        Năm kết thúc (mặc định bằng start_year)
+    limit : int, optional
+        Số title trả về (mặc định 100)
+
+    Returns
+    -------
+    tuple of Title
+    """
+    end_year = start_year if end_year is None else end_year
+    return _fetch(
+        engine,
+        _TITLES_BY_YEAR,
+        Title,
+        start_year=start_year,
+        end_year=end_year,
+        limit=limit,
+    )
+
+
+@cached_query
+def titles_by_rating(
+    engine, ratings: Sequence[str], limit: int = 30
+) -> Tuple[Title, ...]:
+    """
+    Titles theo một hoặc nhiều rating (SQL_EXAMPLES 4.2, 4.3)
+
+    Parameters
+    ----------
+    ratings : str or sequence of str
+        Rating cần lọc, ví dụ "TV-MA" hoặc ("G", "PG")
+    limit : int, optional
+        Số title trả về (mặc định 30)
+
+    Returns
+    -------
+    tuple of Title
+    """
+    ratings = [ratings] if isinstance(ratings, str) else list(ratings)
+    return _fetch(engine, _TITLES_BY_RATING, Title, ratings=ratings, limit=limit)
+
+
+@cached_query
+def titles_by_country(engine, country: str, limit: int = 20) -> Tuple[Title, ...]:
+    """
+    Titles theo quốc gia (SQL_EXAMPLES 5.2)
+
+    Parameters
+    ----------
+    country : str
+        Tên quốc gia, ví dụ "United States"
+    limit : int, optional
+        Số title trả về (mặc định 20)
+
+    Returns
+    -------
+    tuple of Title
+    """
+    return _fetch(engine, _TITLES_BY_COUNTRY, Title, country=country, limit=limit)
+
+
+@cached_query
+def search_titles(engine, query: str, limit: int = 20) -> Tuple[Title, ...]:
+    """
+    Tìm kiếm titles theo từ khóa (thay cho SQL_EXAMPLES 6.1, 7.4)
+
+    Kết hợp full-text search trên search_vector (title + description) và
+    so khớp chuỗi con trên title, cả hai đều dùng GIN index.
+
+    Parameters
+    ----------
+    query : str
+        Từ khóa tìm kiếm, ví dụ "christmas" hoặc "stranger things"
+    limit : int, optional
+        Số title trả về (mặc định 20)
+
+    Returns
+    -------
+    tuple of Title
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return _fetch(
+        engine,
+        _SEARCH_TITLES,
+        Title,
+        query=query,
+        pattern=f"%{escaped}%",
+        limit=limit,
+    )
+
+
+def table_counts(engine=None):
+    """
+    Đếm số hàng của các bảng Star Schema (không cache, không cần pandas)
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine, optional
+        Engine kết nối (mặc định get_engine())
+
+    Returns
+    -------
+    dict
+        Số hàng theo khóa "<table>_count" (cùng dạng NetflixLoader.validate_load)
+    """
+    engine = engine or get_engine()
+    with engine.connect() as connection:
+        return {
+            f"{table}_count": connection.execute(
+                text(f"SELECT COUNT(*) FROM {table}")
+            ).scalar()
+            for table in ("dim_movies", "dim_genres", "dim_date", "movies_genres")
+        }
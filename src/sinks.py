@@ -0,0 +1,317 @@
+"""
+Sinks Module - Đích tải dữ liệu có thể thay thế (pluggable)
+
+Chức năng:
+- Giao diện chung BaseSink: connect / load_all / load_partitions /
+  validate_load / disconnect (cùng dạng với NetflixLoader)
+- ParquetSink: Parquet dataset nén, có statistics, dim_movies partition
+  theo release_year (hive-style)
+- DuckDBSink: file DuckDB cục bộ (duckdb là dependency tuỳ chọn)
+- Không cần database server
+"""
+
+import os
+import shutil
+import logging
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("sinks")
+
+# Thứ tự tải (dimension trước, movies_genres sau cùng)
+TABLES = ("dim_genres", "dim_date", "dim_movies", "movies_genres")
+# Bảng dimension toàn cục khi tải theo partition (out-of-core)
+DIMENSION_TABLES = ("dim_genres", "dim_date")
+
+
+class BaseSink:
+    """
+    Lớp cơ sở cho các đích tải Star Schema
+
+    Lớp con chỉ cần cài đặt clear_table(), write_table() và count_rows();
+    load_all(), load_partitions() và validate_load() dùng chung.
+    """
+
+    name = "base"
+
+    def connect(self):
+        """Mở kết nối / chuẩn bị đích tải"""
+
+    def disconnect(self):
+        """Đóng kết nối"""
+
+    def clear_table(self, table):
+        """Xóa dữ liệu cũ của một bảng"""
+        raise NotImplementedError
+
+    def write_table(self, table, df, part=0):
+        """
+        Ghi (append) một DataFrame vào bảng
+
+        Parameters
+        ----------
+        table : str
+            Tên bảng
+        df : pd.DataFrame
+            Dữ liệu cần ghi
+        part : int, optional
+            Số thứ tự phần dữ liệu (khi tải theo partition)
+
+        Returns
+        -------
+        int
+            Số hàng được ghi
+        """
+        raise NotImplementedError
+
+    def count_rows(self, table):
+        """Đếm số hàng của một bảng"""
+        raise NotImplementedError
+
+    def load_all(self, star_schema, skip_tables=(), on_table_loaded=None):
+        """
+        Tải tất cả bảng từ Star Schema
+
+        Parameters
+        ----------
+        star_schema : dict
+            Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+        skip_tables : iterable of str, optional
+            Các bảng đã tải xong ở lần chạy trước (khi resume)
+        on_table_loaded : callable, optional
+            Hàm gọi sau mỗi bảng tải xong: on_table_loaded(table, rows)
+
+        Returns
+        -------
+        dict
+            Dictionary chứa số lượng hàng được tải cho mỗi bảng
+        """
+        log_event(logger, "Loading data", sink=self.name)
+
+        results = {}
+
+        try:
+            for table in TABLES:
+                if table in skip_tables:
+                    log_event(logger, "Skipping loaded table", table=table)
+                    continue
+                self.clear_table(table)
+                results[table] = self.write_table(table, star_schema[table])
+                if on_table_loaded is not None:
+                    on_table_loaded(table, results[table])
+
+            log_event(logger, "Load summary", sink=self.name, **results)
+
+        except Exception as e:
+            log_event(
+                logger,
+                "Error loading data",
+                logging.ERROR,
+                sink=self.name,
+                error=str(e),
+            )
+            raise
+
+        return results
+
+    def load_partitions(self, dimensions, partitions):
+        """
+        Tải Star Schema theo từng partition (chế độ out-of-core)
+
+        Parameters
+        ----------
+        dimensions : dict
+            Các bảng dimension toàn cục: dim_genres, dim_date
+        partitions : iterable of dict
+            Các star schema theo partition
+
+        Returns
+        -------
+        dict
+            Dictionary chứa số lượng hàng được tải cho mỗi bảng
+        """
+        log_event(logger, "Loading data", sink=self.name)
+
+        results = {table: 0 for table in TABLES}
+
+        try:
+            for table in TABLES:
+                self.clear_table(table)
+
+            for table in DIMENSION_TABLES:
+                results[table] = self.write_table(table, dimensions[table])
+            for part, star_schema in enumerate(partitions):
+                for table in ("dim_movies", "movies_genres"):
+                    results[table] += self.write_table(table, star_schema[table], part)
+
+            log_event(logger, "Load summary", sink=self.name, **results)
+
+        except Exception as e:
+            log_event(
+                logger,
+                "Error loading data",
+                logging.ERROR,
+                sink=self.name,
+                error=str(e),
+            )
+            raise
+
+        return results
+
+    def validate_load(self):
+        """
+        Kiểm tra dữ liệu đã tải
+
+        Returns
+        -------
+        dict
+            Thông tin kiểm tra (cùng khóa với NetflixLoader.validate_load)
+        """
+        validation = {f"{table}_count": self.count_rows(table) for table in TABLES}
+        log_event(logger, "Validation counts", sink=self.name, **validation)
+        return validation
+
+
+class ParquetSink(BaseSink):
+    """Đích tải Parquet dataset (mỗi bảng một thư mục)"""
+
+    name = "parquet"
+
+    # Cột partition (hive-style) của từng bảng
+    PARTITION_COLUMNS = {"dim_movies": ["release_year"]}
+
+    def __init__(self, output_dir=None, compression=None):
+        """
+        Khởi tạo ParquetSink
+
+        Parameters
+        ----------
+        output_dir : str, optional
+            Thư mục warehouse (mặc định Config.WAREHOUSE_DIR)
+        compression : str, optional
+            Codec nén Parquet (mặc định Config.PARQUET_COMPRESSION)
+        """
+        self.output_dir = output_dir or Config.WAREHOUSE_DIR
+        self.compression = compression or Config.PARQUET_COMPRESSION
+
+    def _table_dir(self, table):
+        return os.path.join(self.output_dir, table)
+
+    def connect(self):
+        # Thư mục chỉ được tạo khi ghi (write_table): validate trên
+        # warehouse chưa tồn tại phải báo lỗi thay vì trả về bảng rỗng
+        log_event(logger, "Parquet warehouse ready", path=self.output_dir)
+
+    def clear_table(self, table):
+        shutil.rmtree(self._table_dir(table), ignore_errors=True)
+
+    def write_table(self, table, df, part=0):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        # Bảng rỗng vẫn có thư mục để count_rows trả về 0
+        os.makedirs(self._table_dir(table), exist_ok=True)
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            self._table_dir(table),
+            format=file_format,
+            file_options=file_format.make_write_options(
+                compression=self.compression, write_statistics=True
+            ),
+            partitioning=self.PARTITION_COLUMNS.get(table),
+            partitioning_flavor="hive" if table in self.PARTITION_COLUMNS else None,
+            basename_template=f"part-{part:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        return len(df)
+
+    def count_rows(self, table):
+        import pyarrow.dataset as ds
+
+        path = self._table_dir(table)
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Parquet table not found: {path}")
+        partitioning = "hive" if table in self.PARTITION_COLUMNS else None
+        dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+        return dataset.count_rows()
+
+
+class DuckDBSink(BaseSink):
+    """Đích tải file DuckDB (columnar, nén và zone-map tự động)"""
+
+    name = "duckdb"
+
+    def __init__(self, path=None):
+        """
+        Khởi tạo DuckDBSink
+
+        Parameters
+        ----------
+        path : str, optional
+            Đường dẫn file DuckDB (mặc định Config.DUCKDB_PATH)
+        """
+        self.path = path or Config.DUCKDB_PATH
+        self.connection = None
+
+    def connect(self):
+        try:
+            import duckdb
+        except ImportError:
+            logger.error("DuckDB sink requires the duckdb package: pip install duckdb")
+            raise
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = duckdb.connect(self.path)
+        log_event(logger, "Connected to DuckDB", path=self.path)
+
+    def clear_table(self, table):
+        self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def write_table(self, table, df, part=0):
+        self.connection.register("incoming", df)
+        try:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} AS "
+                f"SELECT * FROM incoming LIMIT 0"
+            )
+            self.connection.execute(f"INSERT INTO {table} SELECT * FROM incoming")
+        finally:
+            self.connection.unregister("incoming")
+        return len(df)
+
+    def count_rows(self, table):
+        return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            logger.info("Disconnected from DuckDB")
+
+
+def get_sink(name=None):
+    """
+    Tạo đích tải theo tên
+
+    Parameters
+    ----------
+    name : str, optional
+        "postgres", "parquet" hoặc "duckdb" (mặc định Config.SINK)
+
+    Returns
+    -------
+    BaseSink
+        Đối tượng sink (NetflixLoader cho "postgres")
+    """
+    name = (name or Config.SINK).lower()
+    if name == "postgres":
+        from src.loader import NetflixLoader
+
+        return NetflixLoader()
+    if name == "parquet":
+        return ParquetSink()
+    if name == "duckdb":
+        return DuckDBSink()
+    raise ValueError(f"Unknown sink: {name}")
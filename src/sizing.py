@@ -0,0 +1,306 @@
+"""
+Sizing Module - Kích thước chunk/batch thích ứng theo bộ nhớ
+
+Chức năng:
+- Ước lượng số byte mỗi hàng từ một mẫu dữ liệu
+- Đọc bộ nhớ còn trống (psutil nếu có, nếu không /proc và cgroup) và
+  ngân sách bộ nhớ cấu hình để chọn chunk size khi đọc và batch size khi tải
+- Điều chỉnh kích thước trong lúc chạy theo throughput và RSS quan sát được
+"""
+
+import os
+import sys
+import logging
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("sizing")
+
+MB = 1024 * 1024
+
+# Hàng tối thiểu mỗi chunk/batch
+MIN_ROWS = 100
+# Số hàng mẫu dùng để ước lượng byte/hàng
+SAMPLE_ROWS = 1000
+# Bộ nhớ làm việc so với kích thước dữ liệu của một chunk/batch: chunk đi qua
+# nhiều bản sao khi transform (clean, explode genres), batch được chuyển
+# thành tuple Python khi gửi qua driver
+WORKING_SET_FACTOR = {"chunk": 4.0, "batch": 3.0}
+# Hệ số tăng kích thước khi throughput còn cải thiện
+GROWTH_FACTOR = 1.5
+# Throughput phải tăng ít nhất tỉ lệ này mới được xem là cải thiện
+THROUGHPUT_TOLERANCE = 0.1
+# Số lần đo liên tiếp không cải thiện trước khi dừng tăng (chống nhiễu)
+PATIENCE = 2
+# Thu nhỏ khi RSS vượt tỉ lệ này của ngân sách bộ nhớ
+HIGH_WATER = 0.9
+
+CGROUP_LIMIT_FILES = (
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+    (
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+    ),
+)
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def available_memory():
+    """
+    Bộ nhớ còn trống (byte), tính cả giới hạn cgroup của container
+
+    Returns
+    -------
+    int or None
+        None nếu không xác định được
+    """
+    try:
+        import psutil
+
+        available = psutil.virtual_memory().available
+    except ImportError:
+        available = None
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        available = int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+
+    # Worker chạy trong container: giới hạn cgroup thường nhỏ hơn RAM máy
+    for limit_file, usage_file in CGROUP_LIMIT_FILES:
+        limit, usage = _read_int(limit_file), _read_int(usage_file)
+        if limit is not None and usage is not None and limit < 1 << 60:
+            cgroup_available = max(limit - usage, 0)
+            available = min(available or cgroup_available, cgroup_available)
+            break
+
+    return available
+
+
+def current_rss():
+    """
+    RSS hiện tại của tiến trình (byte)
+
+    Returns
+    -------
+    int or None
+        None nếu không xác định được
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+
+        # ru_maxrss là RSS đỉnh: KB trên Linux, byte trên macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def estimate_row_bytes(df):
+    """
+    Ước lượng số byte bộ nhớ mỗi hàng từ một mẫu DataFrame
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dữ liệu mẫu (chỉ SAMPLE_ROWS hàng đầu được dùng)
+
+    Returns
+    -------
+    float
+        Số byte trung bình mỗi hàng (tối thiểu 1)
+    """
+    sample = df.head(SAMPLE_ROWS)
+    if sample.empty:
+        return 1.0
+    return max(sample.memory_usage(index=False, deep=True).sum() / len(sample), 1.0)
+
+
+class AdaptiveSizer:
+    """
+    Lớp chọn và điều chỉnh kích thước chunk/batch
+
+    Mỗi luồng dữ liệu (ví dụ "chunk" khi đọc CSV, "batch:dim_movies" khi tải)
+    được theo dõi riêng: bắt đầu từ Config.CHUNK_SIZE/BATCH_SIZE (giới hạn bởi
+    ngân sách bộ nhớ), tăng dần khi throughput còn cải thiện, quay lại kích
+    thước tốt nhất khi throughput giảm và giảm một nửa khi RSS vượt ngân sách.
+    """
+
+    def __init__(self, memory_budget=None):
+        """
+        Khởi tạo AdaptiveSizer
+
+        Parameters
+        ----------
+        memory_budget : int, optional
+            Ngân sách bộ nhớ cho dữ liệu đang xử lý, byte (mặc định
+            Config.MEMORY_BUDGET_MB, hoặc 50% bộ nhớ còn trống nếu bằng 0)
+        """
+        if memory_budget is None and Config.MEMORY_BUDGET_MB > 0:
+            memory_budget = Config.MEMORY_BUDGET_MB * MB
+        if memory_budget is None:
+            available = available_memory()
+            memory_budget = available // 2 if available else None
+
+        self.memory_budget = memory_budget
+        self._streams = {}
+
+        log_event(
+            logger,
+            "Memory budget",
+            budget_mb=round(memory_budget / MB) if memory_budget else "unknown",
+        )
+
+    @staticmethod
+    def _category(stream):
+        return stream.split(":", 1)[0]
+
+    def calibrate(self, stream, sample):
+        """
+        Chọn kích thước ban đầu của một luồng từ dữ liệu mẫu
+
+        Parameters
+        ----------
+        stream : str
+            Tên luồng: "chunk" hoặc "batch:<table>"
+        sample : pd.DataFrame
+            Dữ liệu mẫu để ước lượng byte/hàng
+
+        Returns
+        -------
+        int
+            Số hàng mỗi chunk/batch
+        """
+        category = self._category(stream)
+        configured = Config.CHUNK_SIZE if category == "chunk" else Config.BATCH_SIZE
+        row_bytes = estimate_row_bytes(sample)
+
+        if self.memory_budget:
+            max_rows = int(
+                self.memory_budget / (row_bytes * WORKING_SET_FACTOR[category])
+            )
+            max_rows = max(max_rows, MIN_ROWS)
+        else:
+            # Không biết bộ nhớ: giữ kích thước cấu hình
+            max_rows = configured
+
+        size = max(min(configured, max_rows), MIN_ROWS)
+        self._streams[stream] = {
+            "size": size,
+            "max_rows": max_rows,
+            "best_size": size,
+            "best_throughput": None,
+            "growing": True,
+            "misses": 0,
+            # RSS trước luồng: chỉ phần tăng thêm được tính vào ngân sách
+            "baseline_rss": current_rss(),
+        }
+        log_event(
+            logger,
+            "Calibrated size",
+            stream=stream,
+            rows=size,
+            max_rows=max_rows,
+            row_bytes=round(row_bytes),
+        )
+        return size
+
+    def is_calibrated(self, stream):
+        """Kiểm tra luồng đã được calibrate chưa"""
+        return stream in self._streams
+
+    def size(self, stream):
+        """Kích thước hiện tại (số hàng) của một luồng"""
+        return self._streams[stream]["size"]
+
+    def observe(self, stream, rows, seconds):
+        """
+        Ghi nhận một chunk/batch đã xử lý và điều chỉnh kích thước
+
+        Parameters
+        ----------
+        stream : str
+            Tên luồng
+        rows : int
+            Số hàng đã xử lý
+        seconds : float
+            Thời gian xử lý (giây)
+
+        Returns
+        -------
+        int
+            Kích thước mới (số hàng)
+        """
+        state = self._streams[stream]
+        size = state["size"]
+        new_size = size
+        reason = None
+
+        rss = current_rss()
+        baseline = state["baseline_rss"]
+        used = rss - baseline if rss and baseline else None
+
+        if self.memory_budget and used and used > self.memory_budget * HIGH_WATER:
+            # Vượt ngân sách: giảm một nửa và không tăng vượt mức này nữa
+            new_size = max(size // 2, MIN_ROWS)
+            state["max_rows"] = new_size
+            state["best_size"] = min(state["best_size"], new_size)
+            state["growing"] = False
+            reason = "memory"
+        elif rows >= size and seconds > 0:
+            # Chỉ so sánh chunk/batch đầy đủ (chunk cuối thường nhỏ hơn)
+            throughput = rows / seconds
+            best = state["best_throughput"]
+            if best is None or throughput >= best * (1 + THROUGHPUT_TOLERANCE):
+                state["best_throughput"] = throughput
+                state["best_size"] = size
+                state["misses"] = 0
+                if state["growing"]:
+                    new_size = min(int(size * GROWTH_FACTOR), state["max_rows"])
+                    reason = "throughput"
+            elif state["growing"]:
+                state["misses"] += 1
+                if state["misses"] >= PATIENCE:
+                    # Lớn hơn không nhanh hơn: quay lại kích thước tốt nhất
+                    new_size = state["best_size"]
+                    state["growing"] = False
+                    reason = "settled"
+
+        if new_size != size:
+            state["size"] = new_size
+            log_event(
+                logger,
+                "Adjusted size",
+                logging.WARNING if reason == "memory" else logging.DEBUG,
+                stream=stream,
+                rows=new_size,
+                previous=size,
+                reason=reason,
+                rss_mb=round(rss / MB) if rss else "unknown",
+            )
+        return new_size
@@ -0,0 +1,121 @@
+"""
+Staging Module - Lưu dữ liệu trung gian giữa các bước ETL
+
+Chức năng:
+- Lưu/đọc DataFrame thô sau bước Extract (Parquet)
+- Lưu/đọc Star Schema sau bước Transform (mỗi bảng một file Parquet)
+"""
+
+import os
+
+from config.config import Config
+from src.logger import get_logger, log_event
+
+logger = get_logger("staging")
+
+RAW_FILE = "raw.parquet"
+STAR_SCHEMA_DIR = "star_schema"
+STAR_SCHEMA_TABLES = ("dim_movies", "dim_genres", "dim_date", "movies_genres")
+
+
+def default_raw_path():
+    """Đường dẫn mặc định của dữ liệu thô đã trích xuất"""
+    return os.path.join(Config.STAGING_DIR, RAW_FILE)
+
+
+def default_star_schema_dir():
+    """Thư mục mặc định của Star Schema đã chuyển đổi"""
+    return os.path.join(Config.STAGING_DIR, STAR_SCHEMA_DIR)
+
+
+def save_frame(df, path):
+    """
+    Lưu DataFrame ra file Parquet
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame cần lưu
+    path : str
+        Đường dẫn file Parquet
+
+    Returns
+    -------
+    str
+        Đường dẫn đã lưu
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    # Ghi file tạm rồi đổi tên để không để lại file dở dang khi lỗi
+    os.replace(tmp_path, path)
+    log_event(logger, "Saved frame", path=path, rows=len(df))
+    return path
+
+
+def load_frame(path):
+    """
+    Đọc DataFrame từ file Parquet (hoặc CSV)
+
+    Parameters
+    ----------
+    path : str
+        Đường dẫn file
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame đã đọc
+    """
+    import pandas as pd
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    if path.endswith(".csv"):
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_parquet(path)
+    log_event(logger, "Loaded frame", path=path, rows=len(df))
+    return df
+
+
+def save_star_schema(star_schema, directory):
+    """
+    Lưu Star Schema ra thư mục (mỗi bảng một file Parquet)
+
+    Parameters
+    ----------
+    star_schema : dict
+        Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+    directory : str
+        Thư mục đích
+
+    Returns
+    -------
+    str
+        Thư mục đã lưu
+    """
+    for table in STAR_SCHEMA_TABLES:
+        save_frame(star_schema[table], os.path.join(directory, f"{table}.parquet"))
+    return directory
+
+
+def load_star_schema(directory):
+    """
+    Đọc Star Schema từ thư mục
+
+    Parameters
+    ----------
+    directory : str
+        Thư mục chứa các file Parquet
+
+    Returns
+    -------
+    dict
+        Dictionary chứa dim_movies, dim_genres, dim_date, movies_genres
+    """
+    return {
+        table: load_frame(os.path.join(directory, f"{table}.parquet"))
+        for table in STAR_SCHEMA_TABLES
+    }
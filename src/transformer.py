@@ -4,16 +4,40 @@ Transformer Module - Chuyển đổi và làm sạch dữ liệu Netflix
 Chức năng:
 - Xóa giá trị NA
 - Tách thể loại (explode)
-- Chuẩn hóa ngày tháng
-- Tạo Star Schema (Dimension tables)
+- Chuẩn hóa ngày tháng, tạo khóa ngày dạng số nguyên (YYYYMMDD)
+- Tách duration thành số phút / số season
+- Tạo Star Schema (Dimension tables, gồm dim_date)
 """
 
+import re
 import sys
+import logging
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from src.logger import get_logger, log_event, diagnostics_enabled
+
+logger = get_logger("transformer")
+
+# Cột của dim_date (theo thứ tự trong docker/init.sql)
+DIM_DATE_COLUMNS = [
+    "date_key",
+    "full_date",
+    "year",
+    "quarter",
+    "month",
+    "month_name",
+    "day",
+    "day_of_week",
+    "day_name",
+    "week_of_year",
+    "is_weekend",
+]
 
 
 class NetflixTransformer:
@@ -44,21 +68,24 @@ class NetflixTransformer:
         pd.DataFrame
             DataFrame đã làm sạch
         """
-        print("\n" + "=" * 50)
-        print("STEP 1: CLEANING DATA")
-        print("=" * 50)
+        logger.info("STEP 1: CLEANING DATA")
 
         initial_rows = len(self.df)
 
         # Định nghĩa các cột bắt buộc (không được NA)
         required_columns = ["director", "country", "date_added", "rating"]
 
-        # Kiểm tra và in thông tin NA
-        print(f"\nMissing values before cleaning:")
-        for col in required_columns:
-            na_count = self.df[col].isna().sum()
-            na_percent = (na_count / len(self.df)) * 100
-            print(f"  {col}: {na_count} ({na_percent:.2f}%)")
+        # Thống kê NA chỉ phục vụ chẩn đoán, bỏ qua ở chế độ quiet
+        if diagnostics_enabled(logger) and initial_rows:
+            na_counts = self.df[required_columns].isna().sum()
+            for col, na_count in na_counts.items():
+                log_event(
+                    logger,
+                    "Missing values before cleaning",
+                    column=col,
+                    count=int(na_count),
+                    percent=f"{na_count / initial_rows * 100:.2f}",
+                )
 
         # Xóa NA trong các cột bắt buộc
         self.df = self.df.dropna(subset=required_columns)
@@ -72,9 +99,12 @@ class NetflixTransformer:
         final_rows = len(self.df)
         removed_rows = initial_rows - final_rows
 
-        print(f"\nRows removed: {removed_rows}")
-        print(f"Rows remaining: {final_rows}")
-        print("Data cleaning completed")
+        log_event(
+            logger,
+            "Data cleaning completed",
+            removed=removed_rows,
+            remaining=final_rows,
+        )
 
         return self.df
 
@@ -83,6 +113,7 @@ class NetflixTransformer:
         Bước 2: Chuẩn hóa ngày tháng
 
         - Chuyển date_added thành datetime
+        - Tạo date_added_key = YYYYMMDD (số nguyên, khóa của dim_date)
         - Format thành YYYY-MM-DD
         - Strip whitespace
 
@@ -91,13 +122,19 @@ class NetflixTransformer:
         pd.DataFrame
             DataFrame với ngày đã chuẩn hóa
         """
-        print("\n" + "=" * 50)
-        print("STEP 2: NORMALIZING DATES")
-        print("=" * 50)
+        logger.info("STEP 2: NORMALIZING DATES")
 
         try:
-            # Convert to datetime
-            self.df["date_added"] = pd.to_datetime(self.df["date_added"], errors="coerce")
+            # Convert to datetime; dữ liệu gốc có ngày bắt đầu bằng khoảng trắng
+            # (" March 3, 2016"), strip trước để không bị coerce thành NaT
+            date_added = self.df["date_added"].astype("string").str.strip()
+            self.df["date_added"] = pd.to_datetime(date_added, errors="coerce")
+
+            # Khóa ngày dạng số nguyên, tính vector hóa trên toàn cột
+            dates = self.df["date_added"].dt
+            self.df["date_added_key"] = (
+                dates.year * 10000 + dates.month * 100 + dates.day
+            ).astype("Int64")
 
             # Format as YYYY-MM-DD
             self.df["date_added"] = self.df["date_added"].dt.strftime("%Y-%m-%d")
@@ -105,13 +142,16 @@ class NetflixTransformer:
             # Check for any remaining NaT
             na_dates = self.df["date_added"].isna().sum()
             if na_dates > 0:
-                print(f"⚠ Warning: {na_dates} invalid dates found")
+                log_event(
+                    logger, "Invalid dates found", logging.WARNING, count=int(na_dates)
+                )
 
-            print("Date normalization completed")
-            print(f"Sample dates: {self.df['date_added'].head(3).values}")
+            logger.info("Date normalization completed")
+            if diagnostics_enabled(logger):
+                logger.info("Sample dates: %s", self.df["date_added"].head(3).tolist())
 
         except Exception as e:
-            print(f"Error normalizing dates: {str(e)}")
+            log_event(logger, "Error normalizing dates", logging.ERROR, error=str(e))
             raise
 
         return self.df
@@ -128,16 +168,50 @@ class NetflixTransformer:
         pd.DataFrame
             DataFrame với văn bản đã chuẩn hóa
         """
-        print("\n" + "=" * 50)
-        print("STEP 3: NORMALIZING TEXT")
-        print("=" * 50)
+        logger.info("STEP 3: NORMALIZING TEXT")
 
         text_columns = ["director", "country", "listed_in", "title"]
 
         for col in text_columns:
             if col in self.df.columns:
                 self.df[col] = self.df[col].str.strip()
-                print(f"Normalized text in column: {col}")
+                logger.debug("Normalized text in column: %s", col)
+
+        return self.df
+
+    def parse_duration(self):
+        """
+        Bước 3b: Tách duration thành cột số
+
+        - "90 min" -> duration_minutes = 90
+        - "3 Seasons" / "1 Season" -> season_count = 3 / 1
+        - Trích xuất bằng regex vectorized (str.extract), không lặp từng hàng
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame với duration_minutes và season_count (Int64)
+        """
+        logger.info("STEP 3b: PARSING DURATION")
+
+        # astype("string"): cột toàn NaN (vd. một chunk nhỏ) vẫn dùng được .str
+        parts = self.df["duration"].astype("string").str.extract(
+            r"^\s*(?P<value>\d+)\s*(?P<unit>min|season)", flags=re.IGNORECASE
+        )
+        value = pd.to_numeric(parts["value"], errors="coerce").astype("Int64")
+        unit = parts["unit"].str.lower()
+
+        self.df["duration_minutes"] = value.where(unit == "min")
+        self.df["season_count"] = value.where(unit == "season")
+
+        if diagnostics_enabled(logger):
+            log_event(
+                logger,
+                "Duration parsing completed",
+                minutes=int(self.df["duration_minutes"].notna().sum()),
+                seasons=int(self.df["season_count"].notna().sum()),
+                unparsed=int(value.isna().sum()),
+            )
 
         return self.df
 
@@ -154,9 +228,7 @@ class NetflixTransformer:
         pd.DataFrame
             DataFrame với genres đã tách
         """
-        print("\n" + "=" * 50)
-        print("STEP 4: EXPLODING GENRES")
-        print("=" * 50)
+        logger.info("STEP 4: EXPLODING GENRES")
 
         initial_rows = len(self.df)
 
@@ -175,46 +247,115 @@ class NetflixTransformer:
 
         final_rows = len(self.df)
 
-        print(f"Rows before explode: {initial_rows}")
-        print(f"Rows after explode: {final_rows}")
-        print(f"Unique genres: {self.df['listed_in'].nunique()}")
-        print("Genre explosion completed")
+        fields = {"rows_before": initial_rows, "rows_after": final_rows}
+        if diagnostics_enabled(logger):
+            fields["unique_genres"] = self.df["listed_in"].nunique()
+        log_event(logger, "Genre explosion completed", **fields)
 
         return self.df
 
-    def create_star_schema(self):
+    @staticmethod
+    def build_dim_date(date_keys):
+        """
+        Tạo bảng dim_date phủ trọn các năm của date_keys
+
+        Lịch liên tục từ 01/01 của năm nhỏ nhất đến 31/12 của năm lớn nhất,
+        nên rollup theo tháng/quý vẫn có các kỳ không có title nào.
+
+        Parameters
+        ----------
+        date_keys : iterable of int
+            Các khóa ngày YYYYMMDD (giá trị NA được bỏ qua)
+
+        Returns
+        -------
+        pd.DataFrame
+            dim_date với các cột DIM_DATE_COLUMNS
+        """
+        keys = pd.Series(date_keys, dtype="Int64").dropna()
+        if keys.empty:
+            return pd.DataFrame(columns=DIM_DATE_COLUMNS)
+
+        first_year, last_year = int(keys.min()) // 10000, int(keys.max()) // 10000
+        dates = pd.Series(
+            pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+        )
+        parts = dates.dt
+        iso = parts.isocalendar()
+
+        dim_date = pd.DataFrame(
+            {
+                "date_key": parts.year * 10000 + parts.month * 100 + parts.day,
+                "full_date": parts.strftime("%Y-%m-%d"),
+                "year": parts.year,
+                "quarter": parts.quarter,
+                "month": parts.month,
+                "month_name": parts.month_name(),
+                "day": parts.day,
+                # ISO: 1 = Thứ Hai ... 7 = Chủ Nhật
+                "day_of_week": iso["day"].astype(int),
+                "day_name": parts.day_name(),
+                "week_of_year": iso["week"].astype(int),
+                "is_weekend": parts.dayofweek >= 5,
+            }
+        )
+        return dim_date[DIM_DATE_COLUMNS]
+
+    def create_star_schema(
+        self, dim_genres=None, movie_id_start=1, key_registry=None, dim_date=None
+    ):
         """
         Bước 5: Tạo Star Schema
 
-        Tạo 3 bảng:
+        Tạo 4 bảng:
         1. dim_movies: Thông tin phim
         2. dim_genres: Danh sách thể loại
-        3. movies_genres: Kết nối N-N
+        3. dim_date: Lịch theo ngày (khóa date_key = YYYYMMDD)
+        4. movies_genres: Kết nối N-N
+
+        Parameters
+        ----------
+        dim_genres : pd.DataFrame, optional
+            Bảng genre_id/genre_name dựng sẵn (ví dụ: từ chế độ out-of-core).
+            Mặc định được tạo từ dữ liệu hiện tại.
+        movie_id_start : int, optional
+            movie_id đầu tiên được cấp (mặc định 1)
+        key_registry : KeyRegistry, optional
+            Registry cấp genre_id/movie_id ổn định theo genre_name/show_id.
+            Khi có registry, ID không phụ thuộc thứ tự dữ liệu đầu vào.
+        dim_date : pd.DataFrame, optional
+            Bảng dim_date dựng sẵn (ví dụ: từ chế độ out-of-core).
+            Mặc định được tạo từ date_added_key của dữ liệu hiện tại.
 
         Returns
         -------
         dict
-            Dictionary chứa 3 DataFrames: dim_movies, dim_genres, movies_genres
+            Dictionary chứa 4 DataFrames: dim_movies, dim_genres, dim_date,
+            movies_genres
         """
-        print("\n" + "=" * 50)
-        print("STEP 5: CREATING STAR SCHEMA")
-        print("=" * 50)
+        logger.info("STEP 5: CREATING STAR SCHEMA")
 
         # 1. Tạo dim_genres
-        print("\n1. Creating dim_genres...")
-        dim_genres = (
-            self.df[["listed_in"]]
-            .drop_duplicates()
-            .reset_index(drop=True)
-            .rename(columns={"listed_in": "genre_name"})
-        )
-        dim_genres["genre_id"] = range(1, len(dim_genres) + 1)
+        logger.debug("Creating dim_genres...")
+        if dim_genres is None:
+            dim_genres = (
+                self.df[["listed_in"]]
+                .drop_duplicates()
+                .reset_index(drop=True)
+                .rename(columns={"listed_in": "genre_name"})
+            )
+            if key_registry is not None:
+                dim_genres["genre_id"] = key_registry.assign_genre_ids(
+                    dim_genres["genre_name"]
+                )
+            else:
+                dim_genres["genre_id"] = range(1, len(dim_genres) + 1)
         dim_genres = dim_genres[["genre_id", "genre_name"]]
 
-        print(f"   Created {len(dim_genres)} unique genres")
+        log_event(logger, "Created dim_genres", rows=len(dim_genres))
 
         # 2. Tạo dim_movies
-        print("\n2. Creating dim_movies...")
+        logger.debug("Creating dim_movies...")
         dim_movies_temp = (
             self.df[
                 [
@@ -224,9 +365,12 @@ class NetflixTransformer:
                     "director",
                     "country",
                     "date_added",
+                    "date_added_key",
                     "release_year",
                     "rating",
                     "duration",
+                    "duration_minutes",
+                    "season_count",
                     "description",
                 ]
             ]
@@ -234,36 +378,50 @@ class NetflixTransformer:
             .reset_index(drop=True)
         )
 
-        # Create mapping of show_id to movie_id before dropping show_id
+        # Create mapping of show_id to movie_id
+        if key_registry is not None:
+            movie_ids = key_registry.assign_movie_ids(dim_movies_temp["show_id"])
+        else:
+            movie_ids = range(movie_id_start, movie_id_start + len(dim_movies_temp))
         show_id_to_movie_id = pd.DataFrame({
             "show_id": dim_movies_temp["show_id"],
-            "movie_id": range(1, len(dim_movies_temp) + 1)
+            "movie_id": movie_ids
         })
 
-        # Create final dim_movies without show_id
+        # Create final dim_movies (show_id giữ lại làm natural key)
         dim_movies = dim_movies_temp.copy()
-        dim_movies["movie_id"] = range(1, len(dim_movies) + 1)
+        dim_movies["movie_id"] = movie_ids
 
-        # Reorder columns (without show_id)
+        # Reorder columns
         dim_movies = dim_movies[
             [
                 "movie_id",
+                "show_id",
                 "title",
                 "type",
                 "director",
                 "country",
                 "date_added",
+                "date_added_key",
                 "release_year",
                 "rating",
                 "duration",
+                "duration_minutes",
+                "season_count",
                 "description",
             ]
         ]
 
-        print(f"   Created {len(dim_movies)} unique movies")
+        log_event(logger, "Created dim_movies", rows=len(dim_movies))
+
+        # 3. Tạo dim_date
+        if dim_date is None:
+            dim_date = self.build_dim_date(dim_movies["date_added_key"])
+
+        log_event(logger, "Created dim_date", rows=len(dim_date))
 
-        # 3. Tạo mapping show_id -> movie_id
-        print("\n3. Creating movies_genres junction table...")
+        # 4. Tạo mapping show_id -> movie_id
+        logger.debug("Creating movies_genres junction table...")
 
         # Tạo movies_genres table
         movies_genres = self.df[["show_id", "listed_in"]].drop_duplicates()
@@ -280,45 +438,50 @@ class NetflixTransformer:
         movies_genres["movie_id"] = movies_genres["movie_id"].astype(int)
         movies_genres["genre_id"] = movies_genres["genre_id"].astype(int)
 
-        print(f"   Created {len(movies_genres)} movie-genre relationships")
+        log_event(logger, "Created movies_genres", rows=len(movies_genres))
 
         # Summary
-        print("\n" + "-" * 50)
-        print("STAR SCHEMA SUMMARY:")
-        print(f"  dim_movies: {len(dim_movies)} rows")
-        print(f"  dim_genres: {len(dim_genres)} rows")
-        print(f"  movies_genres: {len(movies_genres)} rows")
-        print("-" * 50)
+        log_event(
+            logger,
+            "Star schema summary",
+            dim_movies=len(dim_movies),
+            dim_genres=len(dim_genres),
+            dim_date=len(dim_date),
+            movies_genres=len(movies_genres),
+        )
 
         return {
             "dim_movies": dim_movies,
             "dim_genres": dim_genres,
+            "dim_date": dim_date,
             "movies_genres": movies_genres,
         }
 
-    def transform(self):
+    def transform(self, key_registry=None):
         """
         Thực hiện tất cả bước chuyển đổi
 
+        Parameters
+        ----------
+        key_registry : KeyRegistry, optional
+            Registry cấp surrogate key ổn định (xem create_star_schema)
+
         Returns
         -------
         dict
-            Dictionary chứa 3 DataFrames của Star Schema
+            Dictionary chứa 4 DataFrames của Star Schema
         """
-        print("\n" + "=" * 80)
-        print("NETFLIX DATA TRANSFORMATION PIPELINE")
-        print("=" * 80)
+        logger.info("NETFLIX DATA TRANSFORMATION PIPELINE")
 
         # Execute transformation steps
         self.clean_data()
         self.normalize_dates()
         self.normalize_text()
+        self.parse_duration()
         self.explode_genres()
-        star_schema = self.create_star_schema()
+        star_schema = self.create_star_schema(key_registry=key_registry)
 
-        print("\n" + "=" * 80)
-        print("TRANSFORMATION COMPLETED SUCCESSFULLY")
-        print("=" * 80 + "\n")
+        logger.info("TRANSFORMATION COMPLETED SUCCESSFULLY")
 
         return star_schema
 
@@ -336,22 +499,18 @@ def main():
         transformer = NetflixTransformer(df)
         star_schema = transformer.transform()
 
-        # Print sample data
-        print("\n" + "=" * 50)
-        print("SAMPLE DATA")
-        print("=" * 50)
-        print("\ndim_movies (first 5):")
-        print(star_schema["dim_movies"].head())
-        print("\ndim_genres (first 10):")
-        print(star_schema["dim_genres"].head(10))
-        print("\nmovies_genres (first 10):")
-        print(star_schema["movies_genres"].head(10))
+        # Log sample data
+        if diagnostics_enabled(logger):
+            logger.info("dim_movies (first 5):\n%s", star_schema["dim_movies"].head())
+            logger.info(
+                "dim_genres (first 10):\n%s", star_schema["dim_genres"].head(10)
+            )
+            logger.info(
+                "movies_genres (first 10):\n%s", star_schema["movies_genres"].head(10)
+            )
 
     except Exception as e:
-        print(f"Error in transformation: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Error in transformation: %s", e)
 
 
 if __name__ == "__main__":
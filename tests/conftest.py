@@ -0,0 +1,71 @@
+"""
+Fixtures dùng chung: tệp CSV Netflix tổng hợp ghi vào thư mục tạm
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+TYPES = ["Movie", "TV Show"]
+GENRES = [
+    "Dramas",
+    "Comedies",
+    "Documentaries",
+    "Kids' TV",
+    "Action & Adventure",
+    "Horror Movies",
+]
+RATINGS = ["TV-MA", "TV-14", "PG-13", "R"]
+DATES = ["September 20, 2021", "January 1, 2019", " March 3, 2016", "June 30, 2020"]
+
+
+def make_titles(rows=3000, duplicates=50, seed=0):
+    """
+    Tạo dữ liệu thô cùng dạng netflix_titles.csv
+
+    Gồm hàng thiếu giá trị bắt buộc, hàng trùng lặp hoàn toàn và các hàng
+    cùng show_id nhưng khác listed_in (như dữ liệu thật).
+    """
+    rng = np.random.default_rng(seed)
+    is_movie = rng.random(rows) < 0.7
+    genres = [
+        ", ".join(rng.choice(GENRES, rng.integers(1, 4), replace=False))
+        for _ in range(rows)
+    ]
+    df = pd.DataFrame(
+        {
+            "show_id": [f"s{i}" for i in range(rows)],
+            "type": np.where(is_movie, "Movie", "TV Show"),
+            "title": [f" Title {i} " for i in range(rows)],
+            "director": np.where(rng.random(rows) < 0.1, None, "Director A"),
+            "cast": "x",
+            "country": rng.choice(["India", "United States", "Japan"], rows),
+            "date_added": np.where(
+                rng.random(rows) < 0.1, None, rng.choice(DATES, rows)
+            ),
+            "release_year": rng.integers(1990, 2022, rows),
+            "rating": rng.choice(RATINGS, rows),
+            "duration": np.where(
+                is_movie,
+                [f"{m} min" for m in rng.integers(60, 181, rows)],
+                [f"{s} Seasons" for s in rng.integers(1, 6, rows)],
+            ),
+            "listed_in": genres,
+            "description": [f"desc {i}" for i in range(rows)],
+        }
+    )
+
+    # Trùng lặp hoàn toàn và cùng show_id với genre khác
+    repeated = df.sample(duplicates, random_state=seed)
+    regenred = df.sample(duplicates, random_state=seed + 1).assign(
+        listed_in="Dramas, Comedies"
+    )
+    return pd.concat([df, repeated, regenred], ignore_index=True)
+
+
+@pytest.fixture
+def titles_csv(tmp_path):
+    """Đường dẫn tệp CSV tổng hợp (3.100 hàng, có duplicate)"""
+    path = tmp_path / "netflix_titles.csv"
+    make_titles().to_csv(path, index=False)
+    return str(path)
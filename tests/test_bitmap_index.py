@@ -0,0 +1,181 @@
+"""
+BitmapIndex: kết quả phải giống lọc vét cạn trên dim_movies/movies_genres
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bitmap_index import BitmapIndex
+
+# 11 title (không chia hết cho 8: kiểm tra các bit thừa ở byte cuối),
+# movie_id không liên tục và không theo thứ tự
+MOVIES = pd.DataFrame(
+    [
+        (40, "Movie", "TV-MA", 2019),
+        (3, "TV Show", "TV-14", 2015),
+        (17, "Movie", "R", None),
+        (8, "Movie", "TV-MA", 2020),
+        (25, "TV Show", None, 2018),
+        (1, "Movie", "PG-13", 2015),
+        (12, "Movie", "TV-MA", 2021),
+        (30, "TV Show", "TV-14", 2019),
+        (5, "Movie", "R", 2010),
+        (21, "Movie", "TV-MA", 2018),
+        (9, "TV Show", "TV-MA", None),
+    ],
+    columns=["movie_id", "type", "rating", "release_year"],
+)
+GENRES = pd.DataFrame(
+    {"genre_id": [1, 2, 3, 4], "genre_name": ["Dramas", "Comedies", "Horror", "Kids"]}
+)
+MOVIE_GENRES = {
+    40: ["Dramas", "Comedies"],
+    3: ["Comedies"],
+    17: ["Dramas", "Horror"],
+    8: ["Dramas"],
+    25: ["Kids", "Comedies"],
+    1: [],
+    12: ["Dramas", "Comedies", "Horror"],
+    30: ["Kids"],
+    5: ["Horror"],
+    21: ["Dramas", "Comedies"],
+    9: ["Comedies"],
+}
+
+
+@pytest.fixture(scope="module")
+def star_schema():
+    genre_ids = dict(zip(GENRES["genre_name"], GENRES["genre_id"]))
+    movies_genres = pd.DataFrame(
+        [
+            (movie_id, genre_ids[genre])
+            for movie_id, genres in MOVIE_GENRES.items()
+            for genre in genres
+        ],
+        columns=["movie_id", "genre_id"],
+    )
+    return {
+        "dim_movies": MOVIES,
+        "dim_genres": GENRES,
+        "movies_genres": movies_genres,
+    }
+
+
+@pytest.fixture(scope="module")
+def index(star_schema):
+    return BitmapIndex.from_star_schema(star_schema)
+
+
+def _as_list(values):
+    return [values] if isinstance(values, str) else list(values)
+
+
+def brute_force(
+    genres=None,
+    any_genres=None,
+    ratings=None,
+    types=None,
+    year_min=None,
+    year_max=None,
+):
+    """movie_id thỏa bộ lọc, tính trực tiếp trên từng hàng"""
+    matched = []
+    for movie in MOVIES.itertuples():
+        movie_genres = set(MOVIE_GENRES[movie.movie_id])
+        year = movie.release_year
+        if genres is not None and not set(_as_list(genres)) <= movie_genres:
+            continue
+        if any_genres is not None and not movie_genres & set(_as_list(any_genres)):
+            continue
+        if ratings is not None and movie.rating not in _as_list(ratings):
+            continue
+        if types is not None and movie.type not in _as_list(types):
+            continue
+        if year_min is not None and not (pd.notna(year) and year >= year_min):
+            continue
+        if year_max is not None and not (pd.notna(year) and year <= year_max):
+            continue
+        matched.append(movie.movie_id)
+    return sorted(matched)
+
+
+FILTERS = [
+    {},
+    {"genres": "Dramas"},
+    {"genres": ["Dramas", "Comedies"]},
+    {"genres": ["Dramas", "Comedies", "Horror"]},
+    {"any_genres": ["Horror", "Kids"]},
+    {"any_genres": "Comedies", "genres": "Dramas"},
+    {"ratings": "TV-MA"},
+    {"ratings": ["R", "PG-13"], "types": "Movie"},
+    {"types": "TV Show"},
+    {"year_min": 2018},
+    {"year_max": 2015},
+    {"year_min": 2015, "year_max": 2019},
+    {"year_min": 2019, "year_max": 2019},
+    {"year_min": 2022},
+    {"genres": "Dramas", "ratings": "TV-MA", "year_min": 2019},
+    {"genres": "Unknown"},
+    {"any_genres": ["Unknown", "Kids"]},
+    {"any_genres": []},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS, ids=str)
+def test_filter_and_count_match_brute_force(index, filters):
+    expected = brute_force(**filters)
+
+    assert index.filter(**filters).tolist() == expected
+    assert index.count(**filters) == len(expected)
+
+
+@pytest.mark.parametrize("filters", FILTERS[:8], ids=str)
+@pytest.mark.parametrize("facet", ["genre", "rating", "type"])
+def test_facet_counts_match_brute_force(index, facet, filters):
+    movies = MOVIES.set_index("movie_id").loc[brute_force(**filters)]
+    if facet == "genre":
+        values = [g for movie_id in movies.index for g in MOVIE_GENRES[movie_id]]
+    else:
+        values = movies[facet].dropna().tolist()
+
+    expected = pd.Series(values, dtype=object).value_counts().to_dict()
+    assert index.facet_counts(facet, **filters) == expected
+
+
+def test_genres_is_and_any_genres_is_or(index):
+    both = set(index.filter(genres=["Dramas", "Horror"]).tolist())
+    either = set(index.filter(any_genres=["Dramas", "Horror"]).tolist())
+
+    assert both == {17, 12}
+    assert either == {40, 17, 8, 12, 5, 21}
+    assert both < either
+
+
+def test_year_bounds_are_inclusive_and_skip_missing_years(index):
+    assert index.filter(year_min=2018, year_max=2018).tolist() == [21, 25]
+    # Title không có release_year chỉ khớp khi không lọc theo năm
+    assert 17 not in index.filter(year_min=0).tolist()
+    assert 17 in index.filter().tolist()
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(index, tmp_path, mmap):
+    path = index.save(str(tmp_path / "index" / "bitmap.idx"))
+    loaded = BitmapIndex.load(path, mmap=mmap)
+
+    assert isinstance(loaded.bitmaps, np.memmap) == mmap
+    assert loaded.keys == index.keys
+    np.testing.assert_array_equal(loaded.movie_ids, index.movie_ids)
+    np.testing.assert_array_equal(loaded.bitmaps, index.bitmaps)
+    for filters in FILTERS:
+        assert loaded.filter(**filters).tolist() == index.filter(**filters).tolist()
+    assert loaded.facet_counts("genre") == index.facet_counts("genre")
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not_an_index.bin"
+    path.write_bytes(b"PAR1" + bytes(60))
+
+    with pytest.raises(ValueError):
+        BitmapIndex.load(str(path))
@@ -0,0 +1,67 @@
+"""
+CheckpointStore: chỉ chạy tiếp lần chạy có cùng cấu hình
+"""
+
+import pytest
+
+from src.checkpoint import CheckpointStore
+
+CONFIG = {
+    "sink": "parquet",
+    "sample": {"size": 200, "fraction": 0, "seed": 42},
+    "key_registry": False,
+}
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    return str(tmp_path / "checkpoints")
+
+
+def _failed_run(base_dir, run_id, config):
+    """Lần chạy dừng sau bước Extract"""
+    checkpoint = CheckpointStore(run_id, base_dir, config)
+    checkpoint.mark_done("extract")
+    return checkpoint
+
+
+def test_resume_picks_latest_pending_run_with_same_config(base_dir):
+    _failed_run(base_dir, "20240101T000000-aaaaaa", CONFIG)
+    _failed_run(base_dir, "20240102T000000-bbbbbb", CONFIG)
+
+    checkpoint = CheckpointStore.resume(base_dir=base_dir, config=CONFIG)
+
+    assert checkpoint.run_id == "20240102T000000-bbbbbb"
+    assert checkpoint.is_done("extract")
+    assert checkpoint.state["config"] == CONFIG
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"sink": "duckdb"},
+        {"sample": None},
+        {"sample": {"size": 200, "fraction": 0, "seed": 7}},
+        {"key_registry": True},
+    ],
+)
+def test_resume_refuses_different_config(base_dir, change):
+    _failed_run(base_dir, "20240101T000000-aaaaaa", CONFIG)
+
+    with pytest.raises(ValueError, match="configuration differs"):
+        CheckpointStore.resume(base_dir=base_dir, config={**CONFIG, **change})
+    with pytest.raises(ValueError, match="configuration differs"):
+        CheckpointStore.resume(
+            "20240101T000000-aaaaaa", base_dir=base_dir, config={**CONFIG, **change}
+        )
+
+
+def test_resume_without_pending_run_starts_new_run(base_dir):
+    checkpoint = CheckpointStore(config=CONFIG, base_dir=base_dir)
+    for stage in ("extract", "transform", "load"):
+        checkpoint.mark_done(stage)
+
+    resumed = CheckpointStore.resume(base_dir=base_dir, config=CONFIG)
+
+    assert resumed.run_id != checkpoint.run_id
+    assert resumed.state["completed_stages"] == []
@@ -0,0 +1,72 @@
+"""
+Lấy mẫu phân tầng của NetflixExtractor
+"""
+
+import pandas as pd
+import pytest
+
+from src.extractor import NetflixExtractor
+
+
+@pytest.mark.parametrize(
+    "counts, size",
+    [
+        ({"a": 500, "b": 30, "c": 1, "d": 7}, 10),
+        ({"a": 500, "b": 30, "c": 1, "d": 7}, 3),
+        ({"a": 5, "b": 5, "c": 5}, 14),
+        ({"a": 100, "b": 1, "c": 1, "d": 1}, 50),
+    ],
+)
+def test_allocation_invariants(counts, size):
+    counts = pd.Series(counts)
+    allocation = NetflixExtractor._allocate_sample(counts, size)
+
+    assert allocation.sum() == size
+    assert (allocation <= counts).all()
+    if size >= len(counts):
+        assert (allocation >= 1).all()
+
+
+def test_allocation_takes_everything_when_size_exceeds_rows():
+    counts = pd.Series({"a": 3, "b": 2})
+    allocation = NetflixExtractor._allocate_sample(counts, 100)
+    assert allocation.to_dict() == {"a": 3, "b": 2}
+
+
+def test_sample_size_is_exact_and_covers_every_stratum(titles_csv):
+    extractor = NetflixExtractor(titles_csv)
+    sample = extractor.extract_sample(size=200, seed=1, chunksize=500)
+    full = pd.read_csv(titles_csv)
+
+    assert len(sample) == 200
+    assert list(sample.columns) == list(full.columns)
+    assert set(NetflixExtractor.sample_strata(sample)) == set(
+        NetflixExtractor.sample_strata(full)
+    )
+
+
+@pytest.mark.parametrize("kwargs", [{"size": 150}, {"fraction": 0.05}])
+def test_sample_does_not_depend_on_chunk_size(titles_csv, kwargs):
+    extractor = NetflixExtractor(titles_csv)
+    samples = [
+        extractor.extract_sample(seed=7, chunksize=chunksize, **kwargs)
+        for chunksize in (97, 500, 10_000)
+    ]
+
+    for sample in samples[1:]:
+        pd.testing.assert_frame_equal(sample, samples[0])
+
+
+def test_sample_depends_on_seed(titles_csv):
+    extractor = NetflixExtractor(titles_csv)
+    first = extractor.extract_sample(size=150, seed=1, chunksize=500)
+    second = extractor.extract_sample(size=150, seed=2, chunksize=500)
+    assert not first["show_id"].equals(second["show_id"])
+
+
+def test_sample_requires_exactly_one_of_size_or_fraction(titles_csv):
+    extractor = NetflixExtractor(titles_csv)
+    with pytest.raises(ValueError):
+        extractor.extract_sample(size=10, fraction=0.1)
+    with pytest.raises(ValueError):
+        extractor.extract_sample(size=0, fraction=0)
@@ -0,0 +1,80 @@
+"""
+KeyRegistry: ID ổn định giữa các lần chạy và không phụ thuộc thứ tự đầu vào
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src.key_registry import KeyRegistry
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    return str(tmp_path / "registry" / "keys.sqlite")
+
+
+def _ids(series, keys):
+    return dict(zip(keys, series.tolist()))
+
+
+def test_ids_are_stable_across_runs_and_input_order(registry_path):
+    genres = pd.Series(["Dramas", "Comedies", "Horror Movies"])
+    shows = pd.Series(["s1", "s2", "s3", "s2"])
+
+    with KeyRegistry(registry_path) as registry:
+        genre_ids = _ids(registry.assign_genre_ids(genres), genres)
+        movie_ids = _ids(registry.assign_movie_ids(shows), shows)
+
+    assert sorted(genre_ids.values()) == [1, 2, 3]
+    assert sorted(set(movie_ids.values())) == [1, 2, 3]
+
+    # Lần chạy sau: thứ tự khác, thêm khóa mới
+    shuffled = pd.Series(["Horror Movies", "Kids' TV", "Dramas", "Comedies"])
+    extended = pd.Series(["s4", "s3", "s1", "s2"])
+    with KeyRegistry(registry_path) as registry:
+        new_genre_ids = _ids(registry.assign_genre_ids(shuffled), shuffled)
+        new_movie_ids = _ids(registry.assign_movie_ids(extended), extended)
+
+    for genre, genre_id in genre_ids.items():
+        assert new_genre_ids[genre] == genre_id
+    for show_id, movie_id in movie_ids.items():
+        assert new_movie_ids[show_id] == movie_id
+    assert new_genre_ids["Kids' TV"] == 4
+    assert new_movie_ids["s4"] == 4
+
+
+def test_lookup_does_not_assign(registry_path):
+    with KeyRegistry(registry_path) as registry:
+        registry.assign_genre_ids(pd.Series(["Dramas"]))
+        ids = registry.lookup("genre", pd.Series(["Dramas", "Unknown"]))
+
+        assert ids.tolist()[0] == 1
+        assert pd.isna(ids.tolist()[1])
+        assert len(registry.lookup("genre", pd.Series(["Unknown"])).dropna()) == 0
+
+
+def test_seed_from_database_keeps_existing_keys(registry_path, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warehouse.db'}")
+    pd.DataFrame({"genre_id": [10, 20], "genre_name": ["Dramas", "Comedies"]}).to_sql(
+        "dim_genres", engine, index=False
+    )
+    pd.DataFrame({"movie_id": [7, 8, 9], "show_id": ["s1", "s2", None]}).to_sql(
+        "dim_movies", engine, index=False
+    )
+
+    with KeyRegistry(registry_path) as registry:
+        # Khóa đã có trong registry được giữ nguyên (INSERT OR IGNORE)
+        registry.assign_genre_ids(pd.Series(["Dramas"]))
+        counts = registry.seed_from_database(engine)
+
+        assert counts == {"genre": 2, "movie": 2}
+        genres = registry.lookup("genre", pd.Series(["Dramas", "Comedies"]))
+        assert genres.tolist() == [1, 20]
+        movies = registry.lookup("movie", pd.Series(["s1", "s2"]))
+        assert movies.tolist() == [7, 8]
+
+        # ID mới tiếp tục sau ID lớn nhất đã seed
+        assert registry.assign_movie_ids(pd.Series(["s5"])).tolist() == [9]
+
+    engine.dispose()
@@ -0,0 +1,76 @@
+"""
+OutOfCoreTransformer phải cho cùng Star Schema với NetflixTransformer
+"""
+
+import pandas as pd
+import pytest
+
+from src.out_of_core import OutOfCoreTransformer
+from src.transformer import NetflixTransformer
+
+
+def _movies_by_show_id(dim_movies):
+    """dim_movies bỏ movie_id, sắp xếp theo show_id, kiểu dữ liệu thống nhất"""
+    df = dim_movies.drop(columns="movie_id").sort_values("show_id")
+    return df.astype("string").reset_index(drop=True)
+
+
+def _genre_pairs(star_schema, dim_genres):
+    """movies_genres dưới dạng tập (show_id, genre_name)"""
+    pairs = (
+        star_schema["movies_genres"]
+        .merge(star_schema["dim_movies"][["movie_id", "show_id"]], on="movie_id")
+        .merge(dim_genres, on="genre_id")
+    )
+    return set(zip(pairs["show_id"], pairs["genre_name"]))
+
+
+@pytest.fixture
+def in_memory(titles_csv):
+    return NetflixTransformer(pd.read_csv(titles_csv)).transform()
+
+
+@pytest.fixture
+def out_of_core(titles_csv, tmp_path):
+    chunks = pd.read_csv(titles_csv, chunksize=500)
+    with OutOfCoreTransformer(
+        chunks, num_partitions=4, spill_dir=str(tmp_path / "spill")
+    ) as transformer:
+        dimensions, partitions = transformer.transform()
+        partitions = list(partitions)
+    return dimensions, partitions
+
+
+def test_dim_movies_matches_in_memory(in_memory, out_of_core):
+    _, partitions = out_of_core
+    dim_movies = pd.concat([p["dim_movies"] for p in partitions], ignore_index=True)
+
+    assert len(dim_movies) == len(in_memory["dim_movies"])
+    assert dim_movies["movie_id"].is_unique
+    pd.testing.assert_frame_equal(
+        _movies_by_show_id(dim_movies), _movies_by_show_id(in_memory["dim_movies"])
+    )
+
+
+def test_movies_genres_matches_in_memory(in_memory, out_of_core):
+    dimensions, partitions = out_of_core
+    pairs = set()
+    for star_schema in partitions:
+        pairs |= _genre_pairs(star_schema, dimensions["dim_genres"])
+
+    rows = sum(len(p["movies_genres"]) for p in partitions)
+    assert rows == len(in_memory["movies_genres"])
+    assert pairs == _genre_pairs(in_memory, in_memory["dim_genres"])
+
+
+def test_dimensions_match_in_memory(in_memory, out_of_core):
+    dimensions, _ = out_of_core
+
+    assert sorted(dimensions["dim_genres"]["genre_name"]) == sorted(
+        in_memory["dim_genres"]["genre_name"]
+    )
+    pd.testing.assert_frame_equal(
+        dimensions["dim_date"].reset_index(drop=True),
+        in_memory["dim_date"].reset_index(drop=True),
+        check_dtype=False,
+    )
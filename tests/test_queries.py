@@ -0,0 +1,92 @@
+"""
+QueryCache: loại bỏ LRU, hết hạn TTL và xóa cache sau khi tải dữ liệu
+"""
+
+import pandas as pd
+import pytest
+
+from src import queries
+from src.loader import NetflixLoader
+from src.queries import QueryCache
+
+
+class FakeClock:
+    """Đồng hồ giả, chỉ tiến khi gọi advance()"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = QueryCache(maxsize=2, ttl=60, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+
+    # "b" ít dùng nhất nên bị loại khi thêm "c"
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = QueryCache(maxsize=10, ttl=30, clock=clock)
+    cache.put("a", 1)
+
+    clock.advance(29.9)
+    assert cache.get("a") == (True, 1)
+
+    clock.advance(0.1)
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("maxsize, ttl", [(0, 60), (10, 0)])
+def test_zero_disables_cache(clock, maxsize, ttl):
+    cache = QueryCache(maxsize=maxsize, ttl=ttl, clock=clock)
+    cache.put("a", 1)
+
+    assert (cache.maxsize, cache.ttl) == (maxsize, ttl)
+    assert cache.get("a") == (False, None)
+
+
+def test_load_all_invalidates_cache(monkeypatch):
+    cache = QueryCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(queries, "_cache", cache)
+    cache.put("top_genres", [("Dramas", 3)])
+
+    loader = NetflixLoader("postgresql://user@localhost/netflix_db")
+    monkeypatch.setattr(loader, "ensure_schema", lambda: None)
+    for table in ("dim_genres", "dim_date", "dim_movies", "movies_genres"):
+        monkeypatch.setattr(loader, f"load_{table}", len)
+
+    star_schema = {
+        "dim_genres": pd.DataFrame({"genre_id": [1]}),
+        "dim_date": pd.DataFrame({"date_key": [20200101]}),
+        "dim_movies": pd.DataFrame({"movie_id": [1, 2]}),
+        "movies_genres": pd.DataFrame({"movie_id": [1, 2]}),
+    }
+    results = loader.load_all(star_schema)
+
+    assert results == {
+        "dim_genres": 1,
+        "dim_date": 1,
+        "dim_movies": 2,
+        "movies_genres": 2,
+    }
+    assert len(cache) == 0
@@ -0,0 +1,69 @@
+"""
+ParquetSink / DuckDBSink: load_all rồi validate_load trên thư mục tạm
+"""
+
+import pandas as pd
+import pytest
+
+from src.sinks import TABLES, DuckDBSink, ParquetSink
+from src.transformer import NetflixTransformer
+
+
+@pytest.fixture
+def star_schema(titles_csv):
+    return NetflixTransformer(pd.read_csv(titles_csv)).transform()
+
+
+def _parquet_sink(tmp_path):
+    return ParquetSink(output_dir=str(tmp_path / "warehouse"))
+
+
+def _duckdb_sink(tmp_path):
+    pytest.importorskip("duckdb")
+    return DuckDBSink(path=str(tmp_path / "warehouse" / "netflix.duckdb"))
+
+
+@pytest.fixture(params=[_parquet_sink, _duckdb_sink], ids=["parquet", "duckdb"])
+def sink(request, tmp_path):
+    sink = request.param(tmp_path)
+    sink.connect()
+    yield sink
+    sink.disconnect()
+
+
+def test_load_all_round_trip(sink, star_schema):
+    results = sink.load_all(star_schema)
+    validation = sink.validate_load()
+
+    expected = {table: len(star_schema[table]) for table in TABLES}
+    assert results == expected
+    assert validation == {f"{table}_count": rows for table, rows in expected.items()}
+
+
+def test_reload_replaces_previous_data(sink, star_schema):
+    sink.load_all(star_schema)
+    sink.load_all(star_schema)
+
+    assert sink.validate_load()["dim_movies_count"] == len(star_schema["dim_movies"])
+
+
+def test_parquet_round_trip_keeps_rows(tmp_path, star_schema):
+    sink = _parquet_sink(tmp_path)
+    sink.connect()
+    sink.load_all(star_schema)
+
+    table_dir = tmp_path / "warehouse" / "dim_movies"
+    dim_movies = pd.read_parquet(table_dir)
+    assert sorted(dim_movies["movie_id"]) == sorted(
+        star_schema["dim_movies"]["movie_id"]
+    )
+    assert all(path.name.startswith("release_year=") for path in table_dir.iterdir())
+
+
+def test_parquet_validate_missing_warehouse_fails(tmp_path):
+    sink = _parquet_sink(tmp_path)
+    sink.connect()
+
+    with pytest.raises(FileNotFoundError):
+        sink.validate_load()
+    assert not (tmp_path / "warehouse").exists()
@@ -0,0 +1,142 @@
+"""
+AdaptiveSizer: tăng theo throughput, dừng khi không cải thiện, giảm khi RSS
+vượt ngân sách (throughput và RSS được giả lập, không phụ thuộc máy chạy test)
+"""
+
+import pandas as pd
+import pytest
+
+from config.config import Config
+from src import sizing
+from src.sizing import MB, MIN_ROWS, AdaptiveSizer
+
+# Một cột int64: 8 byte/hàng, "chunk" dùng WORKING_SET_FACTOR = 4
+SAMPLE = pd.DataFrame({"value": range(100)})
+ROW_BYTES = 8 * sizing.WORKING_SET_FACTOR["chunk"]
+BASELINE_RSS = 500 * MB
+
+
+class FakeRSS:
+    """RSS giả: đặt phần bộ nhớ dùng thêm so với lúc calibrate"""
+
+    def __init__(self):
+        self.used = 0
+
+    def __call__(self):
+        return BASELINE_RSS + self.used
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    fake = FakeRSS()
+    monkeypatch.setattr(sizing, "current_rss", fake)
+    monkeypatch.setattr(Config, "CHUNK_SIZE", 1000)
+    return fake
+
+
+def _sizer(max_rows=10_000):
+    """Sizer có ngân sách bộ nhớ tương ứng max_rows hàng mỗi chunk"""
+    sizer = AdaptiveSizer(memory_budget=max_rows * ROW_BYTES)
+    sizer.calibrate("chunk", SAMPLE)
+    return sizer
+
+
+def _observe(sizer, throughput):
+    """Xử lý một chunk đầy đủ với throughput (hàng/giây) cho trước"""
+    size = sizer.size("chunk")
+    return sizer.observe("chunk", size, size / throughput)
+
+
+def test_grows_while_throughput_improves_up_to_max(rss):
+    sizer = _sizer(max_rows=10_000)
+    assert sizer.size("chunk") == 1000
+
+    sizes = [_observe(sizer, 1000 * 1.2**step) for step in range(8)]
+
+    assert sizes[:6] == [1500, 2250, 3375, 5062, 7593, 10_000]
+    # Đã chạm max_rows: không vượt ngân sách bộ nhớ
+    assert sizes[6:] == [10_000, 10_000]
+
+
+def test_settles_on_best_size_when_throughput_stops_improving(rss):
+    sizer = _sizer()
+    _observe(sizer, 1000)  # 1000 -> 1500
+    _observe(sizer, 1500)  # 1500 -> 2250, best_size = 1500
+
+    # Chưa đủ PATIENCE lần không cải thiện: giữ nguyên
+    assert _observe(sizer, 1550) == 2250
+    # Đủ PATIENCE: quay lại kích thước tốt nhất và dừng tăng
+    assert _observe(sizer, 1500) == 1500
+    assert _observe(sizer, 5000) == 1500
+
+
+def test_partial_chunks_are_ignored(rss):
+    sizer = _sizer()
+
+    assert sizer.observe("chunk", 10, 0.001) == 1000
+    assert sizer.observe("chunk", 1000, 0) == 1000
+
+
+def test_halves_above_high_water(rss):
+    budget_rows = 10_000
+    sizer = _sizer(max_rows=budget_rows)
+    _observe(sizer, 1000)  # 1000 -> 1500
+    _observe(sizer, 2000)  # 1500 -> 2250
+
+    # Dưới HIGH_WATER: không giảm
+    rss.used = int(budget_rows * ROW_BYTES * 0.89)
+    assert _observe(sizer, 3000) == 3375
+
+    rss.used = int(budget_rows * ROW_BYTES * 0.95)
+    assert _observe(sizer, 4000) == 1687
+    assert _observe(sizer, 4000) == 843
+
+    # Hết áp lực bộ nhớ: không tăng lại vượt mức đã giảm
+    rss.used = 0
+    assert _observe(sizer, 10_000) == 843
+
+
+def test_memory_pressure_clamps_to_min_rows(rss):
+    sizer = _sizer()
+    rss.used = 10_000 * ROW_BYTES
+
+    sizes = [_observe(sizer, 1000) for _ in range(6)]
+
+    assert sizes[:3] == [500, 250, 125]
+    assert sizes[3:] == [MIN_ROWS] * 3
+
+
+def test_rss_is_measured_from_calibration(rss):
+    # RSS của tiến trình trước khi luồng bắt đầu không tính vào ngân sách
+    rss.used = 50 * MB
+    sizer = _sizer()
+
+    assert _observe(sizer, 1000) == 1500
+
+
+@pytest.mark.parametrize(
+    "configured, max_rows, expected",
+    [
+        (1000, 400, 400),
+        (1000, 10, MIN_ROWS),
+        (20, 10_000, MIN_ROWS),
+    ],
+)
+def test_calibrate_clamps_to_budget_and_min_rows(
+    rss, monkeypatch, configured, max_rows, expected
+):
+    monkeypatch.setattr(Config, "CHUNK_SIZE", configured)
+
+    assert _sizer(max_rows=max_rows).size("chunk") == expected
+
+
+def test_unknown_budget_keeps_configured_size(rss, monkeypatch):
+    monkeypatch.setattr(Config, "MEMORY_BUDGET_MB", 0)
+    monkeypatch.setattr(sizing, "available_memory", lambda: None)
+    sizer = AdaptiveSizer()
+    sizer.calibrate("chunk", SAMPLE)
+
+    assert sizer.memory_budget is None
+    assert sizer.size("chunk") == 1000
+    # Không có ngân sách: max_rows là kích thước cấu hình
+    assert _observe(sizer, 1000) == 1000
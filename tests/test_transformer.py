@@ -0,0 +1,125 @@
+"""
+NetflixTransformer: tách duration thành cột số, khóa ngày và dim_date
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.transformer import DIM_DATE_COLUMNS, NetflixTransformer
+
+
+@pytest.mark.parametrize(
+    "duration, minutes, seasons",
+    [
+        ("90 min", 90, None),
+        ("1 Season", None, 1),
+        ("3 Seasons", None, 3),
+        ("125 MIN", 125, None),
+        ("2 seasons", None, 2),
+        ("  45 min", 45, None),
+        ("10min", 10, None),
+        (np.nan, None, None),
+        ("", None, None),
+        ("unknown", None, None),
+        ("Seasons 3", None, None),
+        ("1 hour", None, None),
+        (90, None, None),
+    ],
+)
+def test_parse_duration(duration, minutes, seasons):
+    df = pd.DataFrame({"duration": [duration]})
+    result = NetflixTransformer(df).parse_duration()
+
+    assert result["duration_minutes"].dtype == "Int64"
+    assert result["season_count"].dtype == "Int64"
+
+    parsed_minutes = result["duration_minutes"].iloc[0]
+    parsed_seasons = result["season_count"].iloc[0]
+    assert (None if pd.isna(parsed_minutes) else parsed_minutes) == minutes
+    assert (None if pd.isna(parsed_seasons) else parsed_seasons) == seasons
+
+
+def test_date_added_key_is_yyyymmdd():
+    df = pd.DataFrame(
+        {
+            "date_added": [
+                "September 20, 2021",
+                " March 3, 2016",
+                "February 29, 2020",
+                "not a date",
+                "February 30, 2020",
+                None,
+            ]
+        }
+    )
+    result = NetflixTransformer(df).normalize_dates()
+
+    assert result["date_added_key"].dtype == "Int64"
+    assert result["date_added_key"].tolist()[:3] == [20210920, 20160303, 20200229]
+    assert result["date_added_key"].iloc[3:].isna().all()
+    assert result["date_added"].tolist()[:3] == [
+        "2021-09-20",
+        "2016-03-03",
+        "2020-02-29",
+    ]
+    assert result["date_added"].iloc[3:].isna().all()
+
+
+def test_dim_date_calendar_is_continuous():
+    keys = pd.Series([20190615, None, 20210101, 20190102], dtype="Int64")
+    dim_date = NetflixTransformer.build_dim_date(keys)
+
+    assert list(dim_date.columns) == DIM_DATE_COLUMNS
+    # 2019, 2020 (năm nhuận) và 2021, kể cả các ngày không có title
+    assert len(dim_date) == 365 + 366 + 365
+    assert dim_date["date_key"].iloc[0] == 20190101
+    assert dim_date["date_key"].iloc[-1] == 20211231
+    assert dim_date["date_key"].is_unique
+    assert dim_date["date_key"].is_monotonic_increasing
+
+    full_date = pd.to_datetime(dim_date["full_date"])
+    assert (full_date.diff().dropna() == pd.Timedelta(days=1)).all()
+    assert (dim_date["date_key"] == full_date.dt.strftime("%Y%m%d").astype(int)).all()
+
+
+@pytest.mark.parametrize(
+    "date_key, day_of_week, day_name, is_weekend, week_of_year, quarter",
+    [
+        (20210104, 1, "Monday", False, 1, 1),
+        (20210101, 5, "Friday", False, 53, 1),
+        (20210102, 6, "Saturday", True, 53, 1),
+        (20210103, 7, "Sunday", True, 53, 1),
+        (20211231, 5, "Friday", False, 52, 4),
+        (20200701, 3, "Wednesday", False, 27, 3),
+    ],
+)
+def test_dim_date_iso_weekday_and_weekend(
+    date_key, day_of_week, day_name, is_weekend, week_of_year, quarter
+):
+    dim_date = NetflixTransformer.build_dim_date([20200101, 20211231])
+    row = dim_date.set_index("date_key").loc[date_key]
+
+    assert row["day_of_week"] == day_of_week
+    assert row["day_name"] == day_name
+    assert bool(row["is_weekend"]) is is_weekend
+    assert row["week_of_year"] == week_of_year
+    assert row["quarter"] == quarter
+
+
+def test_dim_date_without_dates_is_empty():
+    dim_date = NetflixTransformer.build_dim_date(pd.Series([None], dtype="Int64"))
+
+    assert dim_date.empty
+    assert list(dim_date.columns) == DIM_DATE_COLUMNS
+
+
+def test_star_schema_date_keys_exist_in_dim_date(titles_csv):
+    star_schema = NetflixTransformer(pd.read_csv(titles_csv)).transform()
+    keys = star_schema["dim_movies"]["date_added_key"]
+    dim_date = star_schema["dim_date"]
+
+    assert keys.dtype == "Int64"
+    assert keys.notna().all()
+    assert keys.isin(dim_date["date_key"]).all()
+    assert (dim_date["is_weekend"] == (dim_date["day_of_week"] >= 6)).all()